@@ -1,14 +1,23 @@
 import pandas as pd
-import vertexai
-from vertexai.generative_models import GenerativeModel
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from collections import Counter, deque
 import json
+import re
 import time
 import logging
+import threading
 from typing import Dict, List, Optional
 import os
-from datetime import datetime
+import hashlib
 from dotenv import load_dotenv
 
+import config
+import metrics
+from analysis_cache import AnalysisCache
+from checkpoint import CheckpointJournal
+from dedup import find_near_duplicate_clusters
+from storage import find_table, read_table, table_path, write_table
+
 # Load environment variables
 load_dotenv()
 
@@ -16,26 +25,417 @@ load_dotenv()
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+PROMPT_TEMPLATE = """
+
+        You're a senior data analyst with a strong background in data analysis and business intelligence. 
+        So you know how to communicate strong and complicated insights in a way any business man with no tech background can understand.
+
+        Task: Analyze the following article and provide a summary.
+
+        Taks details:
+        1. Create a concise one-sentence summary that captures the main point, it must be at least 15 words and no more than 25.
+        2. Identify 3-5 primary topics or keywords that best represent the content
+        3. Focus on the most important themes and concepts
+
+        Please respond in valid JSON format:
+        {{
+            "summary": "Your one-sentence summary here",
+            "topics": ["topic1", "topic2", "topic3", "topic4", "topic5"]
+        }}
+
+        Example: 
+
+        Article example: 
+        
+        The supermarket floral department continues to drive sales for supermarkets. While dollar and unit growth have stabilized from the spike during the pandemic, the department is experiencing dollar sales growth and unit growth, according to Circana. This signals that even though consumers are dealing with financial struggles, flowers remain an important part of life.
+
+        The floral department reduced its gross margin to 46% and is keeping shrink at 9%. The floral department is 1.3% of store sales, up from 1.2% in 2023.
+        
+        Summary example: 
+
+        {{
+            "Summary": Flowers remain essential for consumers, showing sales growth and store share increase despite economic challenges.
+            "Topics": ["Flowers", "Supermarkets", "Sales", "Growth", "Economic struggles"]
+        }}
+        
+        Readl Article text to analyze:
+        {article_text}
+        """
+
+BATCH_PROMPT_TEMPLATE = """
+
+        You're a senior data analyst with a strong background in data analysis and business intelligence. 
+        So you know how to communicate strong and complicated insights in a way any business man with no tech background can understand.
+
+        Task: Analyze each of the following articles and provide a summary for each one.
+
+        Taks details, for every article:
+        1. Create a concise one-sentence summary that captures the main point, it must be at least 15 words and no more than 25.
+        2. Identify 3-5 primary topics or keywords that best represent the content
+        3. Focus on the most important themes and concepts
+
+        Please respond with a valid JSON array holding one object per article, using the id of each <article> tag:
+        [
+            {{"id": "article id", "summary": "Your one-sentence summary here", "topics": ["topic1", "topic2", "topic3", "topic4", "topic5"]}}
+        ]
+
+        Example: 
+
+        Article example: 
+        
+        The supermarket floral department continues to drive sales for supermarkets. While dollar and unit growth have stabilized from the spike during the pandemic, the department is experiencing dollar sales growth and unit growth, according to Circana. This signals that even though consumers are dealing with financial struggles, flowers remain an important part of life.
+
+        The floral department reduced its gross margin to 46% and is keeping shrink at 9%. The floral department is 1.3% of store sales, up from 1.2% in 2023.
+        
+        Summary example: 
+
+        {{"id": "example", "summary": "Flowers remain essential for consumers, showing sales growth and store share increase despite economic challenges.", "topics": ["Flowers", "Supermarkets", "Sales", "Growth", "Economic struggles"]}}
+        
+        Real articles to analyze:
+        {articles}
+        """
+
+CHUNK_PROMPT_TEMPLATE = """
+
+        You're a senior data analyst with a strong background in data analysis and business intelligence.
+
+        Task: The text below is part {part} of {parts} of a long article. Summarize this part only.
+
+        Taks details:
+        1. Write a summary of at most three sentences covering the key facts, figures and claims of this part.
+        2. Identify 3-5 primary topics or keywords that best represent this part
+
+        Please respond in valid JSON format:
+        {{
+            "summary": "Your summary of this part here",
+            "topics": ["topic1", "topic2", "topic3"]
+        }}
+
+        Article part to summarize:
+        {chunk_text}
+        """
+
+REDUCE_PROMPT_TEMPLATE = """
+
+        You're a senior data analyst with a strong background in data analysis and business intelligence. 
+        So you know how to communicate strong and complicated insights in a way any business man with no tech background can understand.
+
+        Task: A long article was split into parts and each part was summarized. Combine the partial summaries into one analysis of the whole article.
+
+        Taks details:
+        1. Create a concise one-sentence summary that captures the main point of the whole article, it must be at least 15 words and no more than 25.
+        2. Identify 3-5 primary topics or keywords that best represent the whole article, using the partial topics as candidates
+        3. Focus on the most important themes and concepts
+
+        Please respond in valid JSON format:
+        {{
+            "summary": "Your one-sentence summary here",
+            "topics": ["topic1", "topic2", "topic3", "topic4", "topic5"]
+        }}
+
+        Partial summaries, in article order:
+        {partial_summaries}
+        """
+
+# Response schemas for schema-constrained (structured) output
+RESPONSE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "summary": {"type": "STRING"},
+        "topics": {"type": "ARRAY", "items": {"type": "STRING"}},
+    },
+    "required": ["summary", "topics"],
+}
+
+BATCH_RESPONSE_SCHEMA = {
+    "type": "ARRAY",
+    "items": {
+        "type": "OBJECT",
+        "properties": {
+            "id": {"type": "STRING"},
+            "summary": {"type": "STRING"},
+            "topics": {"type": "ARRAY", "items": {"type": "STRING"}},
+        },
+        "required": ["id", "summary", "topics"],
+    },
+}
+
+GENERATION_CONFIG = {
+    "temperature": 0.1,  # Lower temperature for more consistent output
+    "top_p": 0.8,
+    "max_output_tokens": config.ANALYSIS_MAX_OUTPUT_TOKENS,
+}
+
+BATCH_GENERATION_CONFIG = {
+    **GENERATION_CONFIG,
+    "max_output_tokens": config.ANALYSIS_MAX_OUTPUT_TOKENS * config.ANALYSIS_BATCH_MAX_ARTICLES,
+}
+
+if config.STRUCTURED_OUTPUT:
+    GENERATION_CONFIG.update(response_mime_type="application/json", response_schema=RESPONSE_SCHEMA)
+    BATCH_GENERATION_CONFIG.update(response_mime_type="application/json", response_schema=BATCH_RESPONSE_SCHEMA)
+
+# Summaries returned when an article could not be analyzed
+FAILURE_SUMMARIES = {
+    "Article text is too short or empty",
+    "Analysis failed due to API error",
+    "Analysis failed",
+    "Could not extract summary",
+    "Manual extraction failed",
+}
+
+def _strip_fences(response_text: str) -> str:
+    """
+    Remove Markdown code fences around a JSON answer
+    """
+    if response_text.startswith('```json'):
+        return response_text.replace('```json', '').replace('```', '').strip()
+    if response_text.startswith('```'):
+        return response_text.replace('```', '').strip()
+    return response_text
+
+def _loads(response_text: str):
+    """
+    json.loads that returns None instead of raising
+    """
+    try:
+        return json.loads(response_text)
+    except json.JSONDecodeError:
+        return None
+
+def _validate_analysis(result) -> Optional[Dict]:
+    """
+    Normalize a parsed {summary, topics} object, or return None if it does not fit
+    """
+    if not isinstance(result, dict):
+        return None
+    
+    # The prompt's example capitalizes the keys, so accept both spellings
+    result = {str(key).lower(): value for key, value in result.items()}
+    if 'summary' not in result or not isinstance(result.get('topics'), list):
+        return None
+    
+    return {
+        "summary": str(result['summary']).strip(),
+        "topics": [str(topic).strip() for topic in result['topics']]
+    }
+
+def estimate_tokens(text: str) -> int:
+    """
+    Rough token count for budgeting (about 4 characters per token)
+    """
+    return max(1, len(text) // 4)
+
+def chunk_text(text: str, max_tokens: int) -> List[str]:
+    """
+    Split a text into chunks of at most max_tokens estimated tokens
+    
+    Chunks end on paragraph or sentence boundaries where possible; a single
+    sentence longer than the limit is cut at word boundaries.
+    """
+    max_chars = max_tokens * 4
+    
+    # Paragraphs, then sentences (stored CSV text has no newlines left)
+    units = []
+    for paragraph in text.split("\n"):
+        for sentence in re.split(r"(?<=[.!?])\s+", paragraph.strip()):
+            if len(sentence) <= max_chars:
+                if sentence:
+                    units.append(sentence)
+                continue
+            piece = []
+            piece_length = 0
+            for word in sentence.split():
+                if piece and piece_length + len(word) + 1 > max_chars:
+                    units.append(" ".join(piece))
+                    piece = []
+                    piece_length = 0
+                piece.append(word)
+                piece_length += len(word) + 1
+            if piece:
+                units.append(" ".join(piece))
+    
+    chunks = []
+    current = []
+    current_length = 0
+    for unit in units:
+        if current and current_length + len(unit) + 1 > max_chars:
+            chunks.append(" ".join(current))
+            current = []
+            current_length = 0
+        current.append(unit)
+        current_length += len(unit) + 1
+    
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+def pack_batches(items: List, token_budget: int, max_articles: int) -> List[List]:
+    """
+    Greedily group (id, text) items into batches under a prompt token budget
+    
+    Items are kept in order; an item larger than the budget gets its own batch.
+    """
+    batches = []
+    current = []
+    current_tokens = 0
+    
+    for item in items:
+        tokens = estimate_tokens(item[1])
+        if current and (current_tokens + tokens > token_budget or len(current) >= max_articles):
+            batches.append(current)
+            current = []
+            current_tokens = 0
+        current.append(item)
+        current_tokens += tokens
+    
+    if current:
+        batches.append(current)
+    return batches
+
+class RateLimiter:
+    """
+    Thread-safe requests-per-minute and tokens-per-minute budget.
+    
+    Keeps a sliding one-minute window of recent calls and blocks callers
+    until both budgets have room for the next request.
+    """
+    
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window = deque()  # (timestamp, tokens)
+        self.window_tokens = 0
+        self.lock = threading.Lock()
+    
+    def acquire(self, tokens: int):
+        """
+        Block until a request of the given token size fits in the budget
+        """
+        # A single request larger than the whole budget would wait forever
+        tokens = min(tokens, self.tokens_per_minute)
+        
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                while self.window and now - self.window[0][0] >= 60:
+                    _, old_tokens = self.window.popleft()
+                    self.window_tokens -= old_tokens
+                
+                if (len(self.window) < self.requests_per_minute
+                        and self.window_tokens + tokens <= self.tokens_per_minute):
+                    self.window.append((now, tokens))
+                    self.window_tokens += tokens
+                    return
+                
+                # Sleep until the oldest call leaves the window
+                wait = 60 - (now - self.window[0][0])
+            
+            time.sleep(max(wait, 0.01))
+
+class ResultColumns:
+    """
+    Columnar buffer of per-row analysis results.
+    
+    Results are appended (and checkpointed) as they complete, then written
+    into the DataFrame with one assignment per column instead of three
+    `df.at` writes per row.
+    """
+    
+    def __init__(self, journal: CheckpointJournal = None, row_keys: pd.Series = None):
+        """
+        Args:
+            journal: Journal to record finished rows in; errors are left to be retried
+            row_keys: Checkpoint key of every row, by index
+        """
+        self.journal = journal
+        self.row_keys = row_keys
+        self.index = []
+        self.summaries = []
+        self.topics = []
+        self.statuses = []
+        self.positions = {}
+    
+    def add(self, index, summary: str, topics: str, status: str, checkpoint: bool = True):
+        self.positions[index] = len(self.index)
+        self.index.append(index)
+        self.summaries.append(summary)
+        self.topics.append(topics)
+        self.statuses.append(status)
+        
+        if checkpoint and self.journal is not None and status != "error":
+            self.journal.append(self.row_keys[index], {
+                'Summary': summary,
+                'Topics': topics,
+                'ProcessingStatus': status,
+            })
+    
+    def get(self, index):
+        """
+        The buffered (summary, topics, status) of a row, or None
+        """
+        position = self.positions.get(index)
+        if position is None:
+            return None
+        return self.summaries[position], self.topics[position], self.statuses[position]
+    
+    def __len__(self):
+        return len(self.index)
+    
+    def assign_to(self, df: pd.DataFrame):
+        """
+        Write all buffered results into the DataFrame
+        """
+        if not self.index:
+            return
+        df.loc[self.index, 'Summary'] = self.summaries
+        df.loc[self.index, 'Topics'] = self.topics
+        df.loc[self.index, 'ProcessingStatus'] = self.statuses
+
 class ArticleAnalyzer:
-    def __init__(self, project_id: str = None, location: str = None):
+    def __init__(self, project_id: str = None, location: str = None, model=None,
+                 cache: AnalysisCache = None):
         """
         Initialize the Article Analyzer with GCP Vertex AI
         
         Args:
             project_id: Your GCP project ID (will use env var if not provided)
             location: GCP region for Vertex AI (will use env var if not provided)
+            model: Optional model client with a `generate_content` method, e.g.
+                a FakeGenerativeModel for offline runs; skips Vertex AI setup
+            cache: Optional AnalysisCache for reusing results of unchanged articles
         """
         self.project_id = project_id or os.getenv('GCP_PROJECT_ID')
         self.location = location or os.getenv('GCP_LOCATION', 'us-central1')
         
+        self.cache = cache
+        
+        # How responses were parsed: "json" is the fast path, the rest are fallbacks
+        self.parse_stats = Counter()
+        self._stats_lock = threading.Lock()
+        
+        # Set by process_csv when running in concurrent mode
+        self.rate_limiter = None
+        
+        if model is not None:
+            self.model = model
+            self.model_name = type(model).__name__
+            logger.info(f"Initialized ArticleAnalyzer with {type(model).__name__}")
+            return
+        
         if not self.project_id:
             raise ValueError("GCP_PROJECT_ID must be provided either as parameter or environment variable")
         
+        # Imported here: the Vertex AI SDK takes seconds to load and offline runs never need it
+        import vertexai
+        from vertexai.generative_models import GenerativeModel
+        
         # Initialize Vertex AI
         vertexai.init(project=self.project_id, location=self.location)
         
         # Initialize Gemini model
-        self.model = GenerativeModel("gemini-2.5-pro")
+        self.model_name = "gemini-2.5-pro"
+        self.model = GenerativeModel(self.model_name)
         
         logger.info(f"Initialized ArticleAnalyzer for project {self.project_id}")
     
@@ -54,92 +454,249 @@ class ArticleAnalyzer:
         if not article_text or len(article_text.strip()) < 50:
             return {"summary": "Article text is too short or empty", "topics": []}
         
-        prompt = f"""
-
-        You're a senior data analyst with a strong background in data analysis and business intelligence. 
-        So you know how to communicate strong and complicated insights in a way any business man with no tech background can understand.
-
-        Task: Analyze the following article and provide a summary.
-
-        Taks details:
-        1. Create a concise one-sentence summary that captures the main point, it must be at least 15 words and no more than 25.
-        2. Identify 3-5 primary topics or keywords that best represent the content
-        3. Focus on the most important themes and concepts
-
-        Please respond in valid JSON format:
-        {{
-            "summary": "Your one-sentence summary here",
-            "topics": ["topic1", "topic2", "topic3", "topic4", "topic5"]
-        }}
-
-        Example: 
-
-        Article example: 
+        cached = self._cache_get(article_text)
+        if cached is not None:
+            return cached
         
-        The supermarket floral department continues to drive sales for supermarkets. While dollar and unit growth have stabilized from the spike during the pandemic, the department is experiencing dollar sales growth and unit growth, according to Circana. This signals that even though consumers are dealing with financial struggles, flowers remain an important part of life.
-
-        The floral department reduced its gross margin to 46% and is keeping shrink at 9%. The floral department is 1.3% of store sales, up from 1.2% in 2023.
+        # Very long articles are summarized in chunks, then merged
+        if estimate_tokens(article_text) > config.LONG_ARTICLE_TOKEN_THRESHOLD:
+            result = self._analyze_long_article(article_text, max_retries)
+            self._cache_put(article_text, REDUCE_PROMPT_TEMPLATE, result)
+            return result
         
-        Summary example: 
-
-        {{
-            "Summary": Flowers remain essential for consumers, showing sales growth and store share increase despite economic challenges.
-            "Topics": ["Flowers", "Supermarkets", "Sales", "Growth", "Economic struggles"]
-        }}
+        prompt = PROMPT_TEMPLATE.format(article_text=article_text)
+        result = self._generate(prompt, max_retries)
+        self._cache_put(article_text, PROMPT_TEMPLATE, result)
+        return result
+    
+    def _analyze_long_article(self, article_text: str, max_retries: int = 3) -> Dict:
+        """
+        Map-reduce analysis of an article too long for one prompt
         
-        Readl Article text to analyze:
-        {article_text}
+        The article is split into chunks that are summarized concurrently
+        (map); the partial summaries are then merged into the final summary
+        and topics with one more call (reduce). If any chunk fails, the
+        article fails as a whole: a merge of the remaining chunks would
+        miss part of the article and be cached as if it were complete.
+        
+        Args:
+            article_text: Full text of the article
+            max_retries: Maximum number of retry attempts per call
+            
+        Returns:
+            Dictionary containing summary and topics
+        """
+        chunks = chunk_text(article_text, config.CHUNK_TOKENS)
+        logger.debug(f"Long article (~{estimate_tokens(article_text)} tokens): summarizing {len(chunks)} chunks")
+        metrics.increment("analysis_long_articles_total")
+        
+        def summarize_chunk(part):
+            prompt = CHUNK_PROMPT_TEMPLATE.format(part=part + 1, parts=len(chunks), chunk_text=chunks[part])
+            return self._generate(prompt, max_retries)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(len(chunks), config.CHUNK_CONCURRENCY))) as executor:
+            partials = list(executor.map(summarize_chunk, range(len(chunks))))
+        
+        failed = sum(partial['summary'] in FAILURE_SUMMARIES for partial in partials)
+        if failed:
+            logger.warning(f"Long article: {failed} of {len(chunks)} chunks failed, not merging")
+            return {"summary": "Analysis failed due to API error", "topics": []}
+        
+        partial_summaries = "\n".join(
+            f"{number}. {partial['summary']} (topics: {', '.join(partial['topics'])})"
+            for number, partial in enumerate(partials, 1)
+        )
+        return self._generate(REDUCE_PROMPT_TEMPLATE.format(partial_summaries=partial_summaries), max_retries)
+    
+    def _cache_get(self, article_text: str) -> Optional[Dict]:
+        """
+        Look up a cached result from the single, batch or map-reduce prompt
+        """
+        if self.cache is None:
+            return None
+        
+        for template in (PROMPT_TEMPLATE, BATCH_PROMPT_TEMPLATE, REDUCE_PROMPT_TEMPLATE):
+            cached = self.cache.get(AnalysisCache.make_key(article_text, template, GENERATION_CONFIG, self.model_name))
+            if cached is not None:
+                logger.debug("Using cached analysis")
+                metrics.increment("analysis_cache_total", result="hit")
+                return cached
+        metrics.increment("analysis_cache_total", result="miss")
+        return None
+    
+    def _cache_put(self, article_text: str, template: str, result: Dict):
         """
+        Cache a result; only successful analyses are cached, failures are retried next run
+        """
+        if self.cache is not None and result['summary'] not in FAILURE_SUMMARIES:
+            self.cache.put(AnalysisCache.make_key(article_text, template, GENERATION_CONFIG, self.model_name), result)
+    
+    def analyze_batch(self, articles: List, max_retries: int = 3) -> Dict[str, Dict]:
+        """
+        Analyze several articles with one request
+        
+        The persona, instructions and example are sent once for the whole
+        batch and the model answers with a JSON array keyed by article id.
+        Articles missing from a response that cannot be parsed fall back to
+        single-article calls.
+        
+        Args:
+            articles: List of (article_id, article_text) tuples
+            max_retries: Maximum number of retry attempts for the batch request
+            
+        Returns:
+            Dictionary of article_id -> {summary, topics}
+        """
+        results = {}
+        to_send = []
+        
+        for article_id, article_text in articles:
+            if not article_text or len(article_text.strip()) < 50:
+                results[article_id] = {"summary": "Article text is too short or empty", "topics": []}
+                continue
+            
+            cached = self._cache_get(article_text)
+            if cached is not None:
+                results[article_id] = cached
+            elif estimate_tokens(article_text) > config.LONG_ARTICLE_TOKEN_THRESHOLD:
+                # Too long to share a prompt; goes through map-reduce instead
+                results[article_id] = self.analyze_article(article_text, max_retries)
+            else:
+                to_send.append((article_id, article_text))
+        
+        if len(to_send) == 1:
+            article_id, article_text = to_send[0]
+            results[article_id] = self.analyze_article(article_text, max_retries)
+            return results
+        
+        if not to_send:
+            return results
+        
+        articles_block = "\n\n".join(
+            f'<article id="{article_id}">\n{article_text}\n</article>' for article_id, article_text in to_send
+        )
+        prompt = BATCH_PROMPT_TEMPLATE.format(articles=articles_block)
+        response_text = self._call_model(
+            prompt, max_retries, output_tokens=len(to_send) * config.ANALYSIS_OUTPUT_TOKEN_ESTIMATE,
+            generation_config=BATCH_GENERATION_CONFIG
+        )
+        parsed = {}
+        if response_text is not None:
+            with metrics.span("analysis_response_parse", kind="batch"):
+                parsed = self._parse_batch_response(response_text)
+        
+        fallbacks = 0
+        for article_id, article_text in to_send:
+            result = parsed.get(article_id)
+            if result is None:
+                fallbacks += 1
+                metrics.increment("analysis_batch_fallbacks_total")
+                result = self.analyze_article(article_text, max_retries)
+            else:
+                self._cache_put(article_text, BATCH_PROMPT_TEMPLATE, result)
+            results[article_id] = result
+        
+        if fallbacks:
+            logger.warning(f"Batch of {len(to_send)}: {fallbacks} articles fell back to single-article calls")
+        return results
+    
+    def _parse_batch_response(self, response_text: str) -> Dict[str, Dict]:
+        """
+        Parse a batch answer into article_id -> {summary, topics}, skipping invalid entries
+        """
+        items = _loads(response_text)
+        if isinstance(items, list):
+            self._count_parse("batch_json")
+        else:
+            items = _loads(_strip_fences(response_text))
+            if not isinstance(items, list):
+                logger.warning("Batch response is not a JSON array")
+                self._count_parse("batch_invalid")
+                return {}
+            self._count_parse("batch_fenced_json")
+        
+        parsed = {}
+        for item in items:
+            result = _validate_analysis(item)
+            if result is not None and 'id' in item:
+                parsed[str(item['id'])] = result
+        return parsed
+    
+    def _count_parse(self, path: str):
+        with self._stats_lock:
+            self.parse_stats[path] += 1
+        metrics.increment("analysis_parse_total", path=path)
+    
+    def _call_model(self, prompt: str, max_retries: int = 3, output_tokens: int = None,
+                    generation_config: Dict = None) -> Optional[str]:
+        """
+        Send a prompt to the model with rate limiting and retries
+        
+        Returns:
+            Response text, or None if every attempt failed
+        """
+        output_tokens = output_tokens or config.ANALYSIS_OUTPUT_TOKEN_ESTIMATE
+        kind = "batch" if generation_config is BATCH_GENERATION_CONFIG else "single"
         
         for attempt in range(max_retries):
             try:
-                response = self.model.generate_content(
-                    prompt,
-                    generation_config={
-                        "temperature": 0.1,  # Lower temperature for more consistent output
-                        "top_p": 0.8,
-                        "max_output_tokens": 10000,
-                    }
-                )
-                
-                # Extract and clean response text
-                response_text = response.text.strip()
+                if self.rate_limiter is not None:
+                    with metrics.span("analysis_rate_limit_wait"):
+                        self.rate_limiter.acquire(estimate_tokens(prompt) + output_tokens)
                 
-                # Clean up markdown formatting
-                if response_text.startswith('```json'):
-                    response_text = response_text.replace('```json', '').replace('```', '').strip()
-                elif response_text.startswith('```'):
-                    response_text = response_text.replace('```', '').strip()
+                with metrics.span("analysis_model_call", kind=kind):
+                    response = self.model.generate_content(
+                        prompt,
+                        generation_config=generation_config or GENERATION_CONFIG
+                    )
                 
-                # Parse JSON
-                try:
-                    result = json.loads(response_text)
-                    
-                    # Validate the response structure
-                    if 'summary' in result and 'topics' in result:
-                        # Ensure topics is a list
-                        if isinstance(result['topics'], list):
-                            return {
-                                "summary": str(result['summary']).strip(),
-                                "topics": [str(topic).strip() for topic in result['topics']]
-                            }
-                    
-                    # If structure is invalid, try manual extraction
-                    return self._extract_manually(response_text)
-                    
-                except json.JSONDecodeError as e:
-                    logger.warning(f"JSON parsing failed: {e}. Attempting manual extraction.")
-                    return self._extract_manually(response_text)
+                return response.text.strip()
                     
             except Exception as e:
                 logger.warning(f"Attempt {attempt + 1} failed: {str(e)}")
                 if attempt < max_retries - 1:
+                    metrics.increment("analysis_model_retries_total", kind=kind)
                     time.sleep(2 ** attempt)  # Exponential backoff
                 else:
+                    metrics.increment("analysis_model_failures_total", kind=kind)
                     logger.error(f"All attempts failed for article analysis")
-                    return {"summary": "Analysis failed due to API error", "topics": []}
         
-        return {"summary": "Analysis failed", "topics": []}
+        return None
+    
+    def _generate(self, prompt: str, max_retries: int = 3) -> Dict:
+        """
+        Send a prompt to the model and parse the {summary, topics} answer
+        """
+        response_text = self._call_model(prompt, max_retries)
+        if response_text is None:
+            return {"summary": "Analysis failed due to API error", "topics": []}
+        
+        with metrics.span("analysis_response_parse"):
+            return self._parse_response(response_text)
+    
+    def _parse_response(self, response_text: str) -> Dict:
+        """
+        Parse a {summary, topics} answer
+        
+        Schema-constrained responses are bare JSON and take the fast path.
+        Fenced JSON and free text are still handled, but every fallback is
+        counted in parse_stats so it can be measured.
+        """
+        result = _validate_analysis(_loads(response_text))
+        if result is not None:
+            self._count_parse("json")
+            return result
+        
+        stripped = _strip_fences(response_text)
+        if stripped != response_text:
+            result = _validate_analysis(_loads(stripped))
+            if result is not None:
+                self._count_parse("fenced_json")
+                return result
+        
+        logger.warning("Response is not valid analysis JSON. Attempting manual extraction.")
+        self._count_parse("manual")
+        return self._extract_manually(stripped)
     
     def _extract_manually(self, response_text: str) -> Dict:
         """
@@ -201,20 +758,299 @@ class ArticleAnalyzer:
             logger.error(f"Manual extraction failed: {e}")
             return {"summary": "Manual extraction failed", "topics": ["error"]}
     
-    def process_csv(self, input_csv_path: str = None, output_csv_path: str = None):
+    def analyze_row(self, index: int, article_text: str):
+        """
+        Analyze one CSV row and return its (Summary, Topics, ProcessingStatus) values
+        """
+        # Skip if article text is empty or too short
+        if len(article_text.strip()) < 100:
+            logger.warning(f"Skipping article {index + 1}: Text too short or empty")
+            metrics.increment("analysis_articles_total", status="skipped_short_text")
+            return "Article text too short or empty", "[]", "skipped_short_text"
+        
+        # Analyze the article
+        try:
+            with metrics.span("analysis_article"):
+                analysis = self.analyze_article(article_text)
+            # A failure summary is an error too, so the row is retried on the next run
+            status = "error" if analysis['summary'] in FAILURE_SUMMARIES else "success"
+            metrics.increment("analysis_articles_total", status=status)
+            return analysis['summary'], json.dumps(analysis['topics']), status
+            
+        except Exception as e:
+            logger.error(f"Error processing article {index + 1}: {e}")
+            metrics.increment("analysis_articles_total", status="error")
+            return "Processing error occurred", "[]", "error"
+    
+    @staticmethod
+    def _row_keys(df: pd.DataFrame, text_column: str) -> pd.Series:
+        """
+        Checkpoint key of every row: its URL plus a hash of its text, so a
+        changed article is never resumed from a stale result
+        """
+        urls = df['URL'].astype(str) if 'URL' in df.columns else pd.Series(df.index, index=df.index).astype(str)
+        hashes = df[text_column].map(lambda text: hashlib.sha256(str(text).encode('utf-8')).hexdigest()[:16])
+        return urls + "#" + hashes
+    
+    def _resume_from_journal(self, results: ResultColumns, journal: CheckpointJournal,
+                             pending_index: pd.Index) -> pd.Index:
+        """
+        Buffer results recorded by an interrupted run; rows that failed are analyzed again
+        
+        Returns:
+            Index of the pending rows that are not in the journal
+        """
+        completed = journal.load()
+        if not completed:
+            return pending_index
+        
+        remaining = []
+        for index, key in results.row_keys.loc[pending_index].items():
+            record = completed.get(key)
+            if record is None or record['ProcessingStatus'] == "error":
+                remaining.append(index)
+                continue
+            results.add(index, record['Summary'], record['Topics'], record['ProcessingStatus'], checkpoint=False)
+        
+        logger.info(f"Resuming from {journal.path}: {len(pending_index) - len(remaining)} articles already done")
+        return pd.Index(remaining)
+    
+    def _process_rows_concurrently(self, df: pd.DataFrame, text_column: str, results: ResultColumns,
+                                   concurrency: int, requests_per_minute: int = None,
+                                   tokens_per_minute: int = None, pending_index: pd.Index = None) -> int:
+        """
+        Analyze all rows with a bounded thread pool under a shared RPM/TPM budget
+        
+        Workers only call the model; results are buffered from this thread
+        as they complete.
+        
+        Returns:
+            Number of successfully processed articles
+        """
+        self.rate_limiter = RateLimiter(
+            requests_per_minute or config.GEMINI_REQUESTS_PER_MINUTE,
+            tokens_per_minute or config.GEMINI_TOKENS_PER_MINUTE
+        )
+        texts = df[text_column] if pending_index is None else df.loc[pending_index, text_column]
+        total_articles = len(texts)
+        completed = 0
+        successful_count = 0
+        
+        logger.info(f"Analyzing {total_articles} articles with {concurrency} workers "
+                    f"({self.rate_limiter.requests_per_minute} RPM, {self.rate_limiter.tokens_per_minute} TPM)")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=concurrency) as executor:
+                futures = {
+                    executor.submit(self.analyze_row, index, str(text)): index
+                    for index, text in texts.items()
+                }
+                
+                for future in as_completed(futures):
+                    index = futures[future]
+                    summary, topics, status = future.result()
+                    
+                    # Buffered and saved to the journal after each article
+                    results.add(index, summary, topics, status)
+                    
+                    completed += 1
+                    if status == "success":
+                        successful_count += 1
+                    logger.debug(f"Processed article {index + 1} ({completed}/{total_articles}): {status}")
+        finally:
+            self.rate_limiter = None
+        
+        return successful_count
+    
+    def _process_rows_in_batches(self, df: pd.DataFrame, text_column: str, results: ResultColumns,
+                                 concurrency: int, pending_index: pd.Index, token_budget: int,
+                                 requests_per_minute: int = None, tokens_per_minute: int = None) -> int:
+        """
+        Analyze rows in multi-article requests packed up to a token budget
+        
+        Batches run on up to `concurrency` threads under the shared RPM/TPM
+        budget; results are buffered from this thread.
+        
+        Returns:
+            Number of successfully processed articles
+        """
+        self.rate_limiter = RateLimiter(
+            requests_per_minute or config.GEMINI_REQUESTS_PER_MINUTE,
+            tokens_per_minute or config.GEMINI_TOKENS_PER_MINUTE
+        )
+        successful_count = 0
+        rows_by_id = {}
+        items = []
+        
+        for index, article_text in df.loc[pending_index, text_column].items():
+            article_text = str(article_text)
+            
+            # Short texts never reach the model
+            if len(article_text.strip()) < 100:
+                results.add(index, *self.analyze_row(index, article_text))
+                continue
+            
+            article_id = f"a{len(items) + 1}"
+            rows_by_id[article_id] = index
+            items.append((article_id, article_text))
+        
+        batches = pack_batches(items, token_budget, config.ANALYSIS_BATCH_MAX_ARTICLES)
+        logger.info(f"Analyzing {len(items)} articles in {len(batches)} batches with {concurrency} workers")
+        
+        try:
+            with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+                futures = {executor.submit(self.analyze_batch, batch): batch for batch in batches}
+                
+                for completed, future in enumerate(as_completed(futures), 1):
+                    batch = futures[future]
+                    try:
+                        analyses = future.result()
+                    except Exception as e:
+                        logger.error(f"Error processing batch: {e}")
+                        analyses = {}
+                    
+                    for article_id, _ in batch:
+                        index = rows_by_id[article_id]
+                        analysis = analyses.get(article_id)
+                        if analysis is None:
+                            results.add(index, "Processing error occurred", "[]", "error")
+                            metrics.increment("analysis_articles_total", status="error")
+                        elif analysis['summary'] in FAILURE_SUMMARIES:
+                            results.add(index, analysis['summary'], json.dumps(analysis['topics']), "error")
+                            metrics.increment("analysis_articles_total", status="error")
+                        else:
+                            results.add(index, analysis['summary'], json.dumps(analysis['topics']), "success")
+                            metrics.increment("analysis_articles_total", status="success")
+                            successful_count += 1
+                    
+                    logger.info(f"Processed batch {completed}/{len(batches)} ({len(batch)} articles)")
+        finally:
+            self.rate_limiter = None
+        
+        return successful_count
+    
+    def _collapse_near_duplicates(self, df: pd.DataFrame, text_column: str, pending_index: pd.Index,
+                                  threshold: float):
+        """
+        Find near-duplicate articles and drop all but one per cluster from the pending rows
+        
+        Rows that already have a result (reused or resumed) are preferred as
+        the representative, so a repost of a known article costs no call.
+        
+        Returns:
+            Tuple of (remaining pending index, {duplicate index: representative index})
+        """
+        items = [
+            (index, str(text)) for index, text in df[text_column].items()
+            if isinstance(text, str) and len(text.strip()) >= 100
+        ]
+        clusters = find_near_duplicate_clusters(items, threshold)
+        
+        pending = set(pending_index)
+        duplicates = {}
+        for cluster in clusters:
+            done = [index for index in cluster if index not in pending]
+            representative = done[0] if done else cluster[0]
+            for index in cluster:
+                if index != representative and index in pending:
+                    duplicates[index] = representative
+        
+        if duplicates:
+            logger.info(f"Found {len(clusters)} near-duplicate clusters, skipping {len(duplicates)} articles")
+        return pd.Index([index for index in pending_index if index not in duplicates]), duplicates
+    
+    def _reuse_previous_results(self, df: pd.DataFrame, text_column: str, previous_csv_path: str) -> pd.Index:
+        """
+        Copy results from a previous analysis run for rows that need no new call
+        
+        A row is reused when its URL was in the previous output with the same
+        article text and a successful (or skipped-as-short) status, along with
+        its DuplicateOf value when near-duplicates are tracked. New rows,
+        rows whose text changed and rows that previously failed are left for
+        analysis.
+        
+        Returns:
+            Index of the rows that still need to be analyzed
+        """
+        if not os.path.exists(previous_csv_path):
+            logger.info(f"No previous results at {previous_csv_path}, analyzing all articles")
+            return df.index
+        
+        if 'URL' not in df.columns:
+            logger.warning("Input has no URL column, analyzing all articles")
+            return df.index
+        
+        previous = read_table(previous_csv_path, dtype=str, keep_default_na=False)
+        required = {'URL', text_column, 'Summary', 'Topics', 'ProcessingStatus'}
+        if not required.issubset(previous.columns):
+            logger.warning(f"Previous results in {previous_csv_path} lack {sorted(required - set(previous.columns))}, analyzing all articles")
+            return df.index
+        
+        previous = previous.drop_duplicates('URL', keep='last').set_index('URL')
+        previous['Topics'] = previous['Topics'].map(json.dumps)
+        
+        reusable = (
+            previous['ProcessingStatus'].isin(['success', 'skipped_short_text'])
+            & ~previous['Summary'].isin(FAILURE_SUMMARIES | {"Processing error occurred"})
+        )
+        previous = previous[reusable]
+        
+        matched = previous.reindex(df['URL'].astype(str))
+        matched.index = df.index
+        unchanged = matched[text_column].notna() & (matched[text_column] == df[text_column].fillna('').astype(str))
+        
+        df.loc[unchanged, 'Summary'] = matched.loc[unchanged, 'Summary']
+        df.loc[unchanged, 'Topics'] = matched.loc[unchanged, 'Topics']
+        df.loc[unchanged, 'ProcessingStatus'] = matched.loc[unchanged, 'ProcessingStatus']
+        # A reused duplicate keeps pointing at the article whose result it copied
+        if 'DuplicateOf' in df.columns and 'DuplicateOf' in matched.columns:
+            df.loc[unchanged, 'DuplicateOf'] = matched.loc[unchanged, 'DuplicateOf']
+        
+        logger.info(f"Reused {int(unchanged.sum())} results from {previous_csv_path}, "
+                    f"{int((~unchanged).sum())} articles need analysis")
+        return df.index[~unchanged]
+    
+    def process_csv(self, input_csv_path: str = None, output_csv_path: str = None,
+                    concurrency: int = None, requests_per_minute: int = None,
+                    tokens_per_minute: int = None, incremental: bool = None,
+                    previous_csv_path: str = None, batch_token_budget: int = None,
+                    dedup: bool = None, dedup_threshold: float = None):
         """
         Process the entire CSV file and generate enriched analysis
+        
+        Args:
+            input_csv_path: Scraped articles, .parquet or .csv (defaults to the
+                newest data/scraped_freshproduce_data table)
+            output_csv_path: Analysis output, .parquet or .csv (defaults to
+                data/analysis_summary in config.STORAGE_FORMAT)
+            concurrency: Parallel model calls; 1 runs serially (defaults to config.ANALYSIS_CONCURRENCY)
+            requests_per_minute: Model request budget in concurrent mode
+            tokens_per_minute: Model token budget in concurrent mode
+            incremental: Only analyze new, changed or previously failed rows
+                (defaults to config.INCREMENTAL_ANALYSIS)
+            previous_csv_path: Earlier results to reuse (defaults to the output
+                path, or the newest data/analysis_summary table)
+            batch_token_budget: Pack several articles per request up to this many
+                prompt tokens; 0 sends one article per request
+                (defaults to config.ANALYSIS_BATCH_TOKEN_BUDGET)
+            dedup: Analyze one representative per cluster of near-duplicate
+                articles and copy its result (defaults to config.NEAR_DUPLICATE_DEDUP)
+            dedup_threshold: Minimum estimated Jaccard similarity for near-duplicates
         """
-        # Use environment variables if paths not provided
-        # input_csv_path = input_csv_path or os.getenv('INPUT_CSV_PATH', os.path.join('data', 'scraped_freshproduce_data.csv'))
-        input_csv_path = 'data/scraped_freshproduce_data.csv'
-
-        # output_csv_path = output_csv_path or os.getenv('OUTPUT_CSV_PATH', 'analysis_summary.csv')
-        output_csv_path = 'data/analysis_summary.csv'
+        input_csv_path = input_csv_path or find_table(config.SCRAPED_DATA_PATH)
+        if output_csv_path is None:
+            output_csv_path = table_path(config.ANALYSIS_DATA_PATH)
+            previous_csv_path = previous_csv_path or find_table(config.ANALYSIS_DATA_PATH)
+        previous_csv_path = previous_csv_path or output_csv_path
+        incremental = config.INCREMENTAL_ANALYSIS if incremental is None else incremental
+        if batch_token_budget is None:
+            batch_token_budget = config.ANALYSIS_BATCH_TOKEN_BUDGET
+        dedup = config.NEAR_DUPLICATE_DEDUP if dedup is None else dedup
+        dedup_threshold = dedup_threshold or config.NEAR_DUPLICATE_THRESHOLD
         
         try:
-            # Read the CSV file
-            df = pd.read_csv(input_csv_path)
+            # Read the scraped articles
+            df = read_table(input_csv_path)
             logger.info(f"Loaded {len(df)} articles from {input_csv_path}")
             
             # Display column names to help with debugging
@@ -222,7 +1058,7 @@ class ArticleAnalyzer:
             
             # Try to find the text column (common names)
             text_column = None
-            possible_text_columns = ['FullArticleText', 'full_text', 'article_text', 'content', 'text']
+            possible_text_columns = ['CleanArticleText', 'FullArticleText', 'full_text', 'article_text', 'content', 'text']
             
             for col in possible_text_columns:
                 if col in df.columns:
@@ -240,57 +1076,94 @@ class ArticleAnalyzer:
             df['Summary'] = ""
             df['Topics'] = ""
             df['ProcessingStatus'] = ""
+            if dedup:
+                df['DuplicateOf'] = ""
+            
+            # Only rows without a reusable previous result are sent to the model
+            pending_index = df.index
+            if incremental:
+                pending_index = self._reuse_previous_results(df, text_column, previous_csv_path)
+            
+            # Rows finished by an interrupted run are not analyzed again
+            journal = CheckpointJournal(
+                os.path.join("csv_temp", f"{os.path.basename(output_csv_path)}.progress.jsonl")
+            )
+            results = ResultColumns(journal, self._row_keys(df, text_column))
+            pending_index = self._resume_from_journal(results, journal, pending_index)
+            
+            # Near-duplicates of another row are not sent to the model
+            duplicates = {}
+            if dedup:
+                pending_index, duplicates = self._collapse_near_duplicates(
+                    df, text_column, pending_index, dedup_threshold
+                )
             
             # Process each article
             total_articles = len(df)
-            successful_count = 0
+            concurrency = concurrency or config.ANALYSIS_CONCURRENCY
             
-            for index, row in df.iterrows():
-                logger.info(f"Processing article {index + 1}/{total_articles}")
-                
-                # Get article text
-                article_text = str(row.get(text_column, ''))
-                
-                # Skip if article text is empty or too short
-                if len(article_text.strip()) < 100:
-                    logger.warning(f"Skipping article {index + 1}: Text too short or empty")
-                    df.at[index, 'Summary'] = "Article text too short or empty"
-                    df.at[index, 'Topics'] = "[]"
-                    df.at[index, 'ProcessingStatus'] = "skipped_short_text"
-                    continue
-                
-                # Analyze the article
-                try:
-                    analysis = self.analyze_article(article_text)
-                    
-                    # Update DataFrame
-                    df.at[index, 'Summary'] = analysis['summary']
-                    df.at[index, 'Topics'] = json.dumps(analysis['topics'])
-                    df.at[index, 'ProcessingStatus'] = "success"
-                    successful_count += 1
+            try:
+                if batch_token_budget:
+                    successful_count = self._process_rows_in_batches(
+                        df, text_column, results, concurrency, pending_index,
+                        batch_token_budget, requests_per_minute, tokens_per_minute
+                    )
+                elif concurrency > 1:
+                    successful_count = self._process_rows_concurrently(
+                        df, text_column, results, concurrency,
+                        requests_per_minute, tokens_per_minute, pending_index
+                    )
+                else:
+                    successful_count = 0
+                    # The same RPM/TPM budget as the concurrent path paces the model calls
+                    self.rate_limiter = RateLimiter(
+                        requests_per_minute or config.GEMINI_REQUESTS_PER_MINUTE,
+                        tokens_per_minute or config.GEMINI_TOKENS_PER_MINUTE
+                    )
                     
-                except Exception as e:
-                    logger.error(f"Error processing article {index + 1}: {e}")
-                    df.at[index, 'Summary'] = "Processing error occurred"
-                    df.at[index, 'Topics'] = "[]"
-                    df.at[index, 'ProcessingStatus'] = "error"
+                    try:
+                        for index, article_text in df.loc[pending_index, text_column].items():
+                            logger.debug(f"Processing article {index + 1}/{total_articles}")
+                            
+                            summary, topics, status = self.analyze_row(index, str(article_text))
+                            
+                            # Buffered and saved to the journal after each article
+                            results.add(index, summary, topics, status)
+                            
+                            if status == "success":
+                                successful_count += 1
+                    finally:
+                        self.rate_limiter = None
                 
-                # Add delay to avoid rate limiting
-                time.sleep(1)
+                # Copy each representative's result to its near-duplicates
+                for index, representative in duplicates.items():
+                    result = results.get(representative) or tuple(
+                        df.loc[representative, ['Summary', 'Topics', 'ProcessingStatus']]
+                    )
+                    results.add(index, *result)
+                if duplicates:
+                    representatives = list(duplicates.values())
+                    df.loc[list(duplicates), 'DuplicateOf'] = (
+                        df.loc[representatives, 'URL'].to_numpy() if 'URL' in df.columns
+                        else [str(representative) for representative in representatives]
+                    )
+            finally:
+                journal.close()
                 
-                # Save progress every 5 articles
-                if (index + 1) % 5 == 0:
-                    os.makedirs("csv_temp", exist_ok=True)
-                    temp_filename = os.path.join("csv_temp", f"temp_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{os.path.basename(output_csv_path)}")
-                    df.to_csv(temp_filename, index=False)
-                    logger.info(f"Progress saved: {index + 1} articles processed to {temp_filename}")
+                # All results go into the DataFrame at once
+                results.assign_to(df)
             
-            # Ensure data directory exists and save final results
-            os.makedirs('data', exist_ok=True)
-            final_output_path = os.path.join('data', os.path.basename(output_csv_path))
-            df.to_csv(final_output_path, index=False)
+            # Ensure output directory exists and save final results
+            final_output_path = output_csv_path
+            write_table(df, final_output_path)
+            journal.clear()
             logger.info(f"Analysis complete! Results saved to {final_output_path}")
-            logger.info(f"Successfully processed {successful_count}/{total_articles} articles")
+            json_path, prom_path = metrics.REGISTRY.export("analysis")
+            logger.info(f"Metrics written to {json_path} and {prom_path}")
+            if self.parse_stats:
+                logger.info(f"Response parsing paths: {dict(self.parse_stats)}")
+            logger.info(f"Successfully processed {successful_count}/{len(pending_index)} analyzed articles "
+                        f"({total_articles} total)")
             
             # Display sample results
             if successful_count > 0:
@@ -313,10 +1186,14 @@ def main():
     """
     try:
         # Initialize analyzer (will use environment variables)
-        analyzer = ArticleAnalyzer()
+        cache = AnalysisCache(config.ANALYSIS_CACHE_PATH)
+        analyzer = ArticleAnalyzer(cache=cache)
         
         # Process the CSV
-        analyzer.process_csv()
+        try:
+            analyzer.process_csv()
+        finally:
+            cache.close()
         
     except Exception as e:
         logger.error(f"Application error: {e}")
@@ -0,0 +1,147 @@
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional
+
+import config
+
+logger = logging.getLogger(__name__)
+
+class AnalysisCache:
+    """
+    Persistent, content-addressed cache of LLM analysis results.
+
+    Entries are keyed on a hash of the article text, the prompt template,
+    the generation config and the model name, so any change to one of them
+    misses the cache. Results are stored in SQLite and evicted by age and by
+    total entry count (least recently used first).
+    """
+
+    def __init__(self, path: str, max_entries: int = None, max_age_days: float = None):
+        """
+        Args:
+            path: SQLite database file
+            max_entries: Entries kept after eviction (defaults to config.ANALYSIS_CACHE_MAX_ENTRIES)
+            max_age_days: Entries older than this are dropped (defaults to config.ANALYSIS_CACHE_MAX_AGE_DAYS)
+        """
+        self.path = path
+        self.max_entries = max_entries or config.ANALYSIS_CACHE_MAX_ENTRIES
+        self.max_age_days = max_age_days or config.ANALYSIS_CACHE_MAX_AGE_DAYS
+        self.hits = 0
+        self.misses = 0
+        self._puts = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS analysis_cache (
+                key TEXT PRIMARY KEY,
+                result TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS idx_accessed_at ON analysis_cache (accessed_at)")
+        self.conn.commit()
+        self.evict()
+
+    @staticmethod
+    def make_key(article_text: str, prompt_template: str, generation_config: Dict, model_name: str = "") -> str:
+        """
+        Hash everything that determines the model's answer
+        """
+        payload = json.dumps(
+            [model_name, prompt_template, generation_config, article_text],
+            sort_keys=True, ensure_ascii=False, default=str
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[Dict]:
+        """
+        Return the cached result for a key, or None if missing or expired
+        """
+        now = time.time()
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT result, created_at FROM analysis_cache WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None or now - row[1] > self.max_age_days * 86400:
+                self.misses += 1
+                return None
+
+            self.conn.execute("UPDATE analysis_cache SET accessed_at = ? WHERE key = ?", (now, key))
+            self.conn.commit()
+            self.hits += 1
+            return json.loads(row[0])
+
+    def put(self, key: str, result: Dict):
+        """
+        Store a result, evicting old entries every 100 writes
+        """
+        now = time.time()
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO analysis_cache (key, result, created_at, accessed_at) VALUES (?, ?, ?, ?)",
+                (key, json.dumps(result, ensure_ascii=False), now, now)
+            )
+            self.conn.commit()
+            self._puts += 1
+
+        if self._puts % 100 == 0:
+            self.evict()
+
+    def evict(self) -> int:
+        """
+        Drop expired entries and trim the cache to max_entries
+
+        Returns:
+            Number of entries removed
+        """
+        cutoff = time.time() - self.max_age_days * 86400
+        with self.lock:
+            removed = self.conn.execute("DELETE FROM analysis_cache WHERE created_at < ?", (cutoff,)).rowcount
+            removed += self.conn.execute(
+                """
+                DELETE FROM analysis_cache WHERE key IN (
+                    SELECT key FROM analysis_cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?
+                )
+                """,
+                (self.max_entries,)
+            ).rowcount
+            self.conn.commit()
+
+        if removed:
+            logger.info(f"Evicted {removed} entries from analysis cache")
+        return removed
+
+    def stats(self) -> Dict:
+        """
+        Entry count, size on disk and hit/miss counters for this session
+        """
+        with self.lock:
+            entries, oldest, newest = self.conn.execute(
+                "SELECT COUNT(*), MIN(created_at), MAX(created_at) FROM analysis_cache"
+            ).fetchone()
+
+        return {
+            "path": self.path,
+            "entries": entries,
+            "size_bytes": os.path.getsize(self.path) if os.path.exists(self.path) else 0,
+            "oldest": oldest,
+            "newest": newest,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,253 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+import httpx
+
+import config
+import listing_api
+import snapshots
+from parsing import extract_article_text, parse_listing_tiles, search_stats_text
+from waits import parse_search_stats
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter for asyncio tasks.
+
+    Tokens are refilled continuously at `rate` per second up to `capacity`;
+    each request takes one token and waits when the bucket is empty.
+    """
+
+    def __init__(self, rate: float, capacity: float = None):
+        self.rate = rate
+        self.capacity = capacity or max(1.0, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it"""
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+class HostLimiter:
+    """
+    Per-host politeness: a concurrency semaphore and a token bucket per host.
+    """
+
+    def __init__(self, max_concurrency: int, rate: float, burst: float = None):
+        self.max_concurrency = max_concurrency
+        self.rate = rate
+        self.burst = burst
+        self.semaphores = {}
+        self.buckets = {}
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Hold a concurrency slot and a rate token for the URL's host"""
+        host = urlparse(url).netloc
+        if host not in self.semaphores:
+            self.semaphores[host] = asyncio.Semaphore(self.max_concurrency)
+            self.buckets[host] = TokenBucket(self.rate, self.burst)
+
+        async with self.semaphores[host]:
+            await self.buckets[host].acquire()
+            yield
+
+class IncompleteListingError(RuntimeError):
+    """The listing reports more results than the crawler can reach over plain HTTP"""
+
+class AsyncCrawler:
+    """
+    asyncio crawl engine for freshproduce.com category listings and articles.
+
+    Listing pages and article pages are fetched concurrently over HTTP and
+    parsed with the same selectors as the Selenium scraper. Politeness is
+    controlled by a per-host concurrency limit and request rate instead of
+    fixed sleeps. When the listing's stats report more results than the
+    static HTML holds, the rest is paged through the category's saved search
+    endpoint (see listing_api); without one the crawl fails with
+    IncompleteListingError instead of silently missing articles.
+    """
+
+    def __init__(self, base_url: str = None, categories: list = None,
+                 max_concurrency_per_host: int = None, requests_per_second: float = None,
+                 burst: float = None, timeout: float = 15, max_retries: int = None):
+        """
+        Args:
+            base_url: Resources root, e.g. a local stand-in server (defaults to config.BASE_URL)
+            categories: Category slugs to crawl (defaults to config.CATEGORIES)
+            max_concurrency_per_host: Concurrent requests allowed per host
+            requests_per_second: Sustained request rate per host
+            burst: Requests allowed back to back before the rate applies
+            timeout: Per-request timeout in seconds
+            max_retries: Attempts per URL (defaults to config.MAX_RETRIES)
+        """
+        self.base_url = (base_url or config.BASE_URL).rstrip('/')
+        self.categories = categories or config.CATEGORIES
+        self.timeout = timeout
+        self.max_retries = max_retries or config.MAX_RETRIES
+        self.limiter = HostLimiter(
+            max_concurrency_per_host or config.ASYNC_MAX_CONCURRENCY_PER_HOST,
+            requests_per_second or config.ASYNC_REQUESTS_PER_SECOND,
+            burst or config.ASYNC_BURST
+        )
+
+        # Article links must stay on the crawled site
+        host = urlparse(self.base_url).hostname or ""
+        self.allowed_host = host[4:] if host.startswith("www.") else host
+
+    def listing_url(self, category: str) -> str:
+        return f"{self.base_url}/{category}/?filteredCategories=Article"
+
+    async def fetch(self, client: httpx.AsyncClient, url: str) -> str:
+        """
+        Fetch a page, retrying transient failures with exponential backoff
+
+        Returns:
+            Page HTML, or None if every attempt failed
+        """
+        for attempt in range(self.max_retries):
+            try:
+                async with self.limiter.slot(url):
+                    response = await client.get(url)
+                if response.status_code in (429, 500, 502, 503, 504):
+                    raise httpx.HTTPStatusError(
+                        f"Server returned {response.status_code}", request=response.request, response=response
+                    )
+                response.raise_for_status()
+                return response.text
+
+            except httpx.HTTPError as e:
+                print(f"Attempt {attempt + 1} failed for {url}: {e}")
+                if attempt < self.max_retries - 1:
+                    await asyncio.sleep(config.HTTP_RETRY_BACKOFF * 2 ** attempt)
+
+        return None
+
+    async def fetch_article(self, client: httpx.AsyncClient, article: dict) -> dict:
+        """Fill in 'FullArticleText' for one article"""
+        html = await self.fetch(client, article['URL'])
+        if html is None:
+            article['FullArticleText'] = ""
+            return article
+
+        snapshots.record(snapshots.ARTICLE, article['URL'], html)
+        content, selector = extract_article_text(html, body_fallback=True)
+        article['FullArticleText'] = content or "Could not extract article content"
+        print(f"Fetched {article['URL']} using {selector} ({len(content)} chars)")
+        return article
+
+    async def crawl_category(self, client: httpx.AsyncClient, category: str) -> list:
+        """
+        Crawl one category listing and all of its articles
+
+        Returns:
+            List of article dictionaries in listing order
+        """
+        url = self.listing_url(category)
+        print(f"Loading page: {url}")
+
+        html = await self.fetch(client, url)
+        if html is None:
+            print(f"Could not load listing for {category}")
+            return []
+
+        snapshots.record(snapshots.LISTING, url, html, category)
+        articles = parse_listing_tiles(html, category, url, allowed_host=self.allowed_host)
+        print(f"Found {len(articles)} unique articles in {category}")
+
+        # Tiles behind "Load More" are only reachable through the search endpoint
+        stats = parse_search_stats(search_stats_text(html))
+        if stats is not None and stats[1] > len(articles):
+            total = stats[1]
+            endpoint = listing_api.load_endpoints().get(category)
+            if endpoint is None:
+                raise IncompleteListingError(
+                    f"{category}: the listing reports {total} results but its HTML holds {len(articles)} and no "
+                    f"search endpoint is saved in {config.LISTING_ENDPOINTS_PATH}. Run the Selenium scraper once "
+                    f"with LISTING_MODE = \"api\" to discover it."
+                )
+            listed = {article['URL']: article for article in articles}
+            for article in await self.fetch_listing(client, endpoint, category, url):
+                listed.setdefault(article['URL'], article)
+            articles = list(listed.values())
+            print(f"Paged the search endpoint: {len(articles)} of {total} articles in {category}")
+
+        await asyncio.gather(*(self.fetch_article(client, article) for article in articles))
+        return articles
+
+    async def fetch_listing(self, client: httpx.AsyncClient, endpoint, category: str, page_url: str) -> list:
+        """
+        Page through a category's search endpoint
+
+        Returns:
+            Article dictionaries in listing order
+
+        Raises:
+            IncompleteListingError if a page cannot be fetched
+        """
+        pager = listing_api.ListingPager(endpoint, category, page_url, self.allowed_host)
+        while True:
+            request_url = pager.next_url()
+            if request_url is None:
+                break
+            text = await self.fetch(client, request_url)
+            if text is None:
+                raise IncompleteListingError(f"{category}: search endpoint request failed: {request_url}")
+            snapshots.record(snapshots.LISTING_API, request_url, text, category, position=pager.pages)
+            pager.add(json.loads(text))
+        return pager.articles()
+
+    async def crawl(self) -> list:
+        """
+        Crawl every configured category concurrently
+
+        Returns:
+            All article dictionaries, grouped by category in configured order
+        """
+        # Re-extraction reads only this crawl's listing snapshots, not older ones
+        snapshots.new_run()
+        limits = httpx.Limits(max_connections=self.limiter.max_concurrency * len(self.categories))
+        async with httpx.AsyncClient(headers=config.HEADERS, timeout=self.timeout,
+                                     follow_redirects=True, limits=limits) as client:
+            results = await asyncio.gather(*(self.crawl_category(client, c) for c in self.categories))
+
+        all_articles = []
+        for category, articles in zip(self.categories, results):
+            print(f"Completed {category}: {len(articles)} articles")
+            all_articles.extend(articles)
+        return all_articles
+
+def main_async_crawler(base_url: str = None, output_file: str = None):
+    """Alternative entry point to main_selenium_scraper using the asyncio engine"""
+    from scrapper import save_scraped_articles
+
+    crawler = AsyncCrawler(base_url=base_url)
+    start = time.monotonic()
+    all_articles = asyncio.run(crawler.crawl())
+
+    print(f"\nCRAWL COMPLETE in {time.monotonic() - start:.1f}s")
+    print(f"Total articles found: {len(all_articles)}")
+
+    if all_articles:
+        save_scraped_articles(all_articles, output_file)
+    else:
+        print("No articles found!")
+
+    return all_articles
+
+if __name__ == "__main__":
+    main_async_crawler()
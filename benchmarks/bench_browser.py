@@ -0,0 +1,111 @@
+"""
+Benchmark of the default and lean Chrome profiles on article pages.
+
+Loads the fixture site's article pages with scrape_full_article_with_selenium
+in both profiles. It reports browser startup time, p50/p95 time per
+article, HTTP requests per article and the resident memory (RSS) of the
+whole ChromeDriver process tree. RSS is read from /proc, so memory numbers
+need Linux. Run from the repository root:
+
+    python -m benchmarks.bench_browser
+    python -m benchmarks.bench_browser --articles 40 --site-latency 0.05
+
+Skipped when Chrome/ChromeDriver is not installed.
+"""
+import argparse
+import os
+import time
+
+import scrapper
+from benchmarks.fixture_site import FixtureSite
+from benchmarks.run import percentile
+
+def _children(pid: int) -> list:
+    """Direct child process ids, from /proc/<pid>/task/*/children"""
+    children = []
+    try:
+        for task in os.listdir(f"/proc/{pid}/task"):
+            with open(f"/proc/{pid}/task/{task}/children") as f:
+                children.extend(int(child) for child in f.read().split())
+    except OSError:
+        pass
+    return children
+
+def tree_rss_mb(pid: int) -> float:
+    """Summed VmRSS of a process and all its descendants, in MB (shared pages counted per process)"""
+    total_kb = 0
+    pending = [pid]
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/status") as f:
+                for line in f:
+                    if line.startswith("VmRSS:"):
+                        total_kb += int(line.split()[1])
+                        break
+        except OSError:
+            continue
+        pending.extend(_children(current))
+    return total_kb / 1024
+
+def run_profile(lean: bool, site: FixtureSite, urls: list) -> dict:
+    start = time.perf_counter()
+    driver = scrapper.setup_driver(lean=lean)
+    startup = time.perf_counter() - start
+    pid = driver.service.process.pid
+
+    durations = []
+    rss = []
+    requests_before = site.requests
+    try:
+        for url in urls:
+            start = time.perf_counter()
+            content = scrapper.scrape_full_article_with_selenium(driver, url)
+            durations.append(time.perf_counter() - start)
+            if not content or content.startswith(scrapper._FAILED_CONTENT_PREFIXES):
+                print(f"  no content for {url}")
+            rss.append(tree_rss_mb(pid))
+    finally:
+        driver.quit()
+
+    return {
+        "profile": "lean" if lean else "default",
+        "startup_s": startup,
+        "p50_ms": percentile(durations, 0.50) * 1000,
+        "p95_ms": percentile(durations, 0.95) * 1000,
+        "requests_per_article": (site.requests - requests_before) / len(urls),
+        "mean_rss_mb": sum(rss) / len(rss),
+        "peak_rss_mb": max(rss),
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--articles", type=int, default=20, help="Article pages loaded per profile")
+    parser.add_argument("--site-latency", type=float, default=0.02, help="Fixture response delay in seconds")
+    args = parser.parse_args()
+
+    try:
+        scrapper.setup_driver(lean=True).quit()
+    except Exception as e:
+        print(f"Skipped: Chrome/ChromeDriver unavailable ({type(e).__name__})")
+        return
+
+    with FixtureSite(articles_per_category=args.articles, latency=args.site_latency) as site:
+        category = site.categories[0]
+        urls = [f"{site.base_url}/{category}/article-{number}/" for number in range(1, args.articles + 1)]
+
+        print(f"{'profile':<8} {'startup s':>10} {'p50 ms':>8} {'p95 ms':>8} {'req/art':>8} "
+              f"{'mean RSS MB':>12} {'peak RSS MB':>12}")
+        for lean in (False, True):
+            try:
+                result = run_profile(lean, site, urls)
+            except Exception as e:
+                # The default profile is not headless and needs a display
+                print(f"{'lean' if lean else 'default':<8} failed to start: {type(e).__name__}: {str(e).splitlines()[0]}")
+                continue
+            print(f"{result['profile']:<8} {result['startup_s']:>10.2f} {result['p50_ms']:>8.1f} "
+                  f"{result['p95_ms']:>8.1f} {result['requests_per_article']:>8.1f} "
+                  f"{result['mean_rss_mb']:>12.1f} {result['peak_rss_mb']:>12.1f}")
+
+if __name__ == "__main__":
+    main()
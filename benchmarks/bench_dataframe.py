@@ -0,0 +1,108 @@
+"""
+Micro-benchmark of the DataFrame hot spots: CSV text cleaning in the
+scraper and result assembly in the analyzer.
+
+Compares the original per-column / per-row pandas code with the
+vectorized versions on synthetic data. Run from the repository root:
+
+    python -m benchmarks.bench_dataframe
+    python -m benchmarks.bench_dataframe --rows 10000 100000 --repeat 3
+"""
+import argparse
+import json
+import random
+import time
+
+import pandas as pd
+
+from analysis import ResultColumns
+from scrapper import clean_text_columns
+
+COLUMNS = ['Title', 'URL', 'Category', 'Description', 'ImageURL', 'ImageAlt', 'FullArticleText']
+
+def make_articles(rows: int, seed: int = 1) -> pd.DataFrame:
+    """Synthetic scraped articles with multi-line bodies of varying length"""
+    rng = random.Random(seed)
+    paragraph = "  Growers report steady demand for avocados.\nImports rose 4% this quarter.\r\n"
+    return pd.DataFrame({
+        'Title': [f" Article {i}\n" for i in range(rows)],
+        'URL': [f"https://www.freshproduce.com/resources/global-trade/article-{i}/" for i in range(rows)],
+        'Category': [rng.choice(["global-trade", "technology", "food-safety"]) for _ in range(rows)],
+        'Description': [f"Description of article {i}\nsecond line " for i in range(rows)],
+        'ImageURL': [f"https://www.freshproduce.com/img/{i}.jpg" for i in range(rows)],
+        'ImageAlt': ["" for _ in range(rows)],
+        'FullArticleText': [paragraph * rng.randint(5, 40) for _ in range(rows)],
+    }, columns=COLUMNS)
+
+def clean_loop(df: pd.DataFrame) -> pd.DataFrame:
+    """The scraper's original cleaning: four chained .str passes per column"""
+    for col in df.columns:
+        if pd.api.types.is_object_dtype(df[col]) or pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].astype(str)
+            df[col] = df[col].str.replace('\n', ' ')
+            df[col] = df[col].str.replace('\r', ' ')
+            df[col] = df[col].str.strip()
+    return df
+
+def make_results(index: pd.Index) -> list:
+    return [(i, f"Summary of article {i}", json.dumps(["trade", "avocados"]), "success") for i in index]
+
+def assemble_with_at(df: pd.DataFrame, results: list) -> pd.DataFrame:
+    """The analyzer's original result assembly: three df.at writes per row"""
+    for index, summary, topics, status in results:
+        df.at[index, 'Summary'] = summary
+        df.at[index, 'Topics'] = topics
+        df.at[index, 'ProcessingStatus'] = status
+    return df
+
+def assemble_with_buffer(df: pd.DataFrame, results: list) -> pd.DataFrame:
+    """Columnar buffer assigned once per column"""
+    buffer = ResultColumns()
+    for index, summary, topics, status in results:
+        buffer.add(index, summary, topics, status)
+    buffer.assign_to(df)
+    return df
+
+def timed(function, make_input, repeat: int) -> float:
+    """Best wall time of `repeat` runs, excluding input construction"""
+    best = float("inf")
+    for _ in range(repeat):
+        args = make_input()
+        start = time.perf_counter()
+        function(*args)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def empty_results_frame(rows: int) -> pd.DataFrame:
+    df = pd.DataFrame({'URL': [f"u{i}" for i in range(rows)]})
+    df['Summary'] = ""
+    df['Topics'] = ""
+    df['ProcessingStatus'] = ""
+    return df
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"pandas {pd.__version__}, best of {args.repeat}")
+    print(f"{'benchmark':<20} {'rows':>8} {'before (s)':>11} {'after (s)':>10} {'speedup':>8}")
+
+    for rows in args.rows:
+        articles = make_articles(rows)
+
+        # Both versions must produce the same frame
+        assert clean_loop(articles.copy()).equals(clean_text_columns(articles.copy()))
+
+        before = timed(clean_loop, lambda: (articles.copy(),), args.repeat)
+        after = timed(clean_text_columns, lambda: (articles.copy(),), args.repeat)
+        print(f"{'clean text columns':<20} {rows:>8} {before:>11.3f} {after:>10.3f} {before / after:>7.1f}x")
+
+        results = make_results(pd.RangeIndex(rows))
+        before = timed(assemble_with_at, lambda: (empty_results_frame(rows), results), args.repeat)
+        after = timed(assemble_with_buffer, lambda: (empty_results_frame(rows), results), args.repeat)
+        print(f"{'assemble results':<20} {rows:>8} {before:>11.3f} {after:>10.3f} {before / after:>7.1f}x")
+
+if __name__ == "__main__":
+    main()
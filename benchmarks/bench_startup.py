@@ -0,0 +1,82 @@
+"""
+Cold-start benchmark of the command-line entry points.
+
+Runs each command in a fresh interpreter and reports the best and median
+wall time over several runs. It also runs the command once with
+`python -X importtime` and lists the imports with the largest cumulative
+cost. Run from the repository root:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --repeat 10 --top 15
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+
+# (label, interpreter arguments)
+COMMANDS = [
+    ("python -c pass", ["-c", "pass"]),
+    ("main.py --help", ["main.py", "--help"]),
+    ("main.py status", ["main.py", "status"]),
+    ("main.py cache-stats", ["main.py", "cache-stats"]),
+    ("import analysis", ["-c", "import analysis"]),
+    ("import scrapper", ["-c", "import scrapper"]),
+]
+
+def wall_times(arguments: list, repeat: int) -> list:
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run([sys.executable] + arguments, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+                       check=False)
+        times.append(time.perf_counter() - start)
+    return times
+
+def import_times(arguments: list) -> list:
+    """
+    Parse `-X importtime` output
+
+    Returns:
+        List of (module, self microseconds, cumulative microseconds) tuples
+    """
+    result = subprocess.run([sys.executable, "-X", "importtime"] + arguments, stdout=subprocess.DEVNULL,
+                            stderr=subprocess.PIPE, text=True, check=False)
+    rows = []
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|", 2)
+        # Nested imports are indented after the single separating space
+        rows.append((module[1:].rstrip(), int(self_us), int(cumulative_us)))
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="Slowest imports to list per command")
+    args = parser.parse_args()
+
+    print(f"{'command':<22} {'best (s)':>9} {'median (s)':>11} {'imports (s)':>12} {'modules':>8}")
+    breakdowns = []
+    for label, arguments in COMMANDS:
+        times = wall_times(arguments, args.repeat)
+        imports = import_times(arguments)
+        # Cumulative times of top-level imports add up to the whole import cost
+        top_level = [row for row in imports if not row[0].startswith(" ")]
+        total_import = sum(cumulative for _, _, cumulative in top_level) / 1e6
+        print(f"{label:<22} {min(times):>9.3f} {statistics.median(times):>11.3f} "
+              f"{total_import:>12.3f} {len(imports):>8}")
+        # Top-level imports and what they import directly show where the time goes
+        shallow = [row for row in imports if not row[0].startswith("   ")]
+        breakdowns.append((label, sorted(shallow, key=lambda row: row[2], reverse=True)[:args.top]))
+
+    for label, rows in breakdowns:
+        print(f"\nSlowest imports for {label}:")
+        for module, _, cumulative in rows:
+            print(f"  {cumulative / 1e6:>7.3f} s  {module}")
+
+if __name__ == "__main__":
+    main()
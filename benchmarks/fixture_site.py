@@ -0,0 +1,298 @@
+"""
+Local stand-in for freshproduce.com used by the benchmarks.
+
+Serves synthetic category listings and article pages built with the same
+markup the scrapers look for: `div.search-stats p`, `div.result-panel`,
+`div.tile` with `p.eyebrow`, `p.title`, `p.description`,
+`div.image-wrapper img` and `div.cta-area a.score-button`, and a "Load More"
+button that appends the next page of tiles from a JSON endpoint, like the
+real site. Article pages carry a header, navigation and footer around
+`main article`, so boilerplate handling is exercised too, and reference a
+web font and a hero image (served as filler bytes) so browser resource
+blocking has something to save.
+
+Serve it by hand with:
+
+    python -m benchmarks.fixture_site --port 8765
+"""
+import argparse
+import html
+import json
+import os
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import config
+
+_WORDS = (
+    "avocado apple berry citrus lettuce tomato onion potato mango grape growers retailers "
+    "shippers importers exporters tariffs supply chain demand prices season harvest yields "
+    "traceability food safety cold chain packaging labor automation sensors data consumers "
+    "sales category produce fresh quarter growth market volume organic sustainability"
+).split()
+
+_HEADER = """<header><a href="#main">Skip to content</a>
+<nav><a href="/">Home</a> <a href="/resources/">Resources</a> <a href="/events/">Events</a>
+<a href="/membership/">Membership</a></nav>
+<p>Subscribe to our newsletter</p></header>"""
+
+_HEAD_ASSETS = """<link rel="preload" href="/static/fonts/body.woff2" as="font" type="font/woff2" crossorigin>
+<style>@font-face { font-family: Body; src: url("/static/fonts/body.woff2") format("woff2"); }
+body { font-family: Body, sans-serif; }</style>"""
+
+# Sizes of the filler assets, roughly a hero image and one web font
+_ASSET_BYTES = {".jpg": 150_000, ".woff2": 40_000}
+
+_FOOTER = """<footer><p>International Fresh Produce Association</p>
+<p>© 2025 IFPA. All rights reserved.</p><a href="/privacy/">Privacy Policy</a></footer>"""
+
+_LOAD_MORE_SCRIPT = """<script>
+(function () {
+  var button = document.querySelector("button.load-more");
+  var panel = document.querySelector("div.result-panel");
+  var stats = document.querySelector("div.search-stats p");
+  var shown = %(shown)d, total = %(total)d;
+  if (shown >= total) { button.remove(); return; }
+  button.addEventListener("click", function () {
+    fetch("/api/search?category=%(category)s&offset=" + shown + "&limit=%(page_size)d")
+      .then(function (response) { return response.json(); })
+      .then(function (data) {
+        panel.insertAdjacentHTML("beforeend", data.html);
+        shown += data.results.length;
+        stats.textContent = "Showing 1-" + shown + " of " + data.total + " results";
+        if (shown >= data.total) { button.remove(); }
+      });
+  });
+})();
+</script>"""
+
+class FixtureSite:
+    """
+    Threaded HTTP server with deterministic synthetic content.
+
+    Use as a context manager; `base_url` is the resources root to pass to
+    the scrapers, e.g. http://127.0.0.1:8765/resources.
+    """
+
+    def __init__(self, categories: list = None, articles_per_category: int = 30, page_size: int = 12,
+                 latency: float = 0.0, port: int = 0, seed: int = 1):
+        """
+        Args:
+            categories: Category slugs (defaults to config.CATEGORIES)
+            articles_per_category: Article tiles per category listing
+            page_size: Tiles in the initial listing and per "Load More" click
+            latency: Seconds added to every response
+            port: Port to bind on 127.0.0.1; 0 picks a free one
+            seed: Seed for the generated text
+        """
+        self.categories = categories or config.CATEGORIES
+        self.articles_per_category = articles_per_category
+        self.page_size = page_size
+        self.latency = latency
+        self.seed = seed
+        self.requests = 0
+        self.lock = threading.Lock()
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler_class())
+        self.server.daemon_threads = True
+        self.thread = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://127.0.0.1:{self.server.server_address[1]}/resources"
+
+    def start(self) -> "FixtureSite":
+        self.thread = threading.Thread(target=self.server.serve_forever, name="fixture-site", daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    # Content
+
+    @staticmethod
+    def _article_path(category: str, number: int) -> str:
+        return f"/resources/{category}/article-{number}/"
+
+    @staticmethod
+    def _label(category: str) -> str:
+        return category.replace("-", " ").title()
+
+    def _title(self, category: str, number: int) -> str:
+        rng = random.Random(f"{self.seed}-{category}-{number}-title")
+        words = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(4, 8)))
+        return f"{words.capitalize()} ({self._label(category)} {number})"
+
+    def _paragraphs(self, category: str, number: int) -> list:
+        rng = random.Random(f"{self.seed}-{category}-{number}-body")
+        # Mostly short pages with a long tail of very long ones
+        count = rng.randint(3, 12) if rng.random() > 0.05 else rng.randint(60, 120)
+        paragraphs = []
+        for _ in range(count):
+            sentences = []
+            for _ in range(rng.randint(2, 6)):
+                sentence = " ".join(rng.choice(_WORDS) for _ in range(rng.randint(8, 20)))
+                sentences.append(sentence.capitalize() + ".")
+            paragraphs.append(" ".join(sentences))
+        return paragraphs
+
+    def _tile(self, category: str, number: int) -> str:
+        path = self._article_path(category, number)
+        title = html.escape(self._title(category, number))
+        description = html.escape(self._paragraphs(category, number)[0][:160])
+        return f"""<div class="tile resourcedetailpage">
+  <div class="image-wrapper"><img src="/images/{category}-{number}.jpg" alt="{title}"></div>
+  <p class="eyebrow">{self._label(category)}</p>
+  <p class="title">{title}</p>
+  <p class="description">{description}</p>
+  <div class="cta-area"><a class="score-button" href="{path}">Read More</a></div>
+</div>"""
+
+    def _tiles(self, category: str, offset: int, limit: int) -> list:
+        last = min(offset + limit, self.articles_per_category)
+        tiles = [self._tile(category, number) for number in range(offset + 1, last + 1)]
+        if offset == 0:
+            # Non-article tiles the scraper has to skip
+            tiles.insert(1, """<div class="tile eventpage"><p class="title">Upcoming webinar</p>
+  <div class="cta-area"><a class="score-button" href="/events/webinar/">Register</a></div></div>""")
+        return tiles
+
+    def listing_page(self, category: str) -> str:
+        shown = min(self.page_size, self.articles_per_category)
+        script = _LOAD_MORE_SCRIPT % {
+            "shown": shown, "total": self.articles_per_category,
+            "category": category, "page_size": self.page_size,
+        }
+        return f"""<!DOCTYPE html>
+<html><head><title>{self._label(category)} | Resources</title></head>
+<body>{_HEADER}
+<main>
+<h1>{self._label(category)}</h1>
+<div class="search-stats"><p>Showing 1-{shown} of {self.articles_per_category} results</p></div>
+<div class="result-panel">
+{"".join(self._tiles(category, 0, shown))}
+</div>
+<button class="load-more" type="button">Load More</button>
+</main>
+{_FOOTER}
+{script}
+</body></html>"""
+
+    def search_results(self, category: str, offset: int, limit: int) -> dict:
+        numbers = range(offset + 1, min(offset + limit, self.articles_per_category) + 1)
+        return {
+            "total": self.articles_per_category,
+            "offset": offset,
+            "results": [
+                {"title": self._title(category, number), "url": self._article_path(category, number),
+                 "eyebrow": self._label(category)}
+                for number in numbers
+            ],
+            "html": "".join(self._tile(category, number) for number in numbers),
+        }
+
+    def article_page(self, category: str, number: int) -> str:
+        title = html.escape(self._title(category, number))
+        body = "\n".join(f"<p>{html.escape(paragraph)}</p>" for paragraph in self._paragraphs(category, number))
+        return f"""<!DOCTYPE html>
+<html><head><title>{title}</title>
+{_HEAD_ASSETS}</head>
+<body>{_HEADER}
+<main id="main"><article>
+<p class="eyebrow">{self._label(category)}</p>
+<h1>{title}</h1>
+<img src="/images/{category}-{number}-hero.jpg" alt="{title}">
+<div class="content">
+{body}
+</div>
+</article></main>
+{_FOOTER}
+</body></html>"""
+
+    # HTTP
+
+    def _handler_class(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                with site.lock:
+                    site.requests += 1
+                if site.latency:
+                    time.sleep(site.latency)
+
+                url = urlparse(self.path)
+                parts = [part for part in url.path.split("/") if part]
+                query = parse_qs(url.query)
+
+                if url.path == "/api/search":
+                    category = query.get("category", [""])[0]
+                    if category in site.categories:
+                        offset = int(query.get("offset", ["0"])[0])
+                        limit = int(query.get("limit", [str(site.page_size)])[0])
+                        return self._send(json.dumps(site.search_results(category, offset, limit)),
+                                          "application/json")
+
+                if len(parts) == 2 and parts[0] == "resources" and parts[1] in site.categories:
+                    return self._send(site.listing_page(parts[1]))
+
+                if (len(parts) == 3 and parts[0] == "resources" and parts[1] in site.categories
+                        and parts[2].startswith("article-")):
+                    try:
+                        number = int(parts[2][len("article-"):])
+                    except ValueError:
+                        number = 0
+                    if 1 <= number <= site.articles_per_category:
+                        return self._send(site.article_page(parts[1], number))
+
+                extension = os.path.splitext(url.path)[1]
+                if parts and parts[0] in ("images", "static") and extension in _ASSET_BYTES:
+                    content_type = "image/jpeg" if extension == ".jpg" else "font/woff2"
+                    return self._send(b"\0" * _ASSET_BYTES[extension], content_type)
+
+                self._send("<html><body><h1>Not found</h1></body></html>", status=404)
+
+            def _send(self, body, content_type: str = "text/html", status: int = 200):
+                data = body.encode("utf-8") if isinstance(body, str) else body
+                self.send_response(status)
+                if isinstance(body, str):
+                    content_type = f"{content_type}; charset=utf-8"
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the benchmark fixture site")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--articles", type=int, default=30, help="Articles per category")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds added to every response")
+    args = parser.parse_args()
+
+    site = FixtureSite(articles_per_category=args.articles, latency=args.latency, port=args.port)
+    print(f"Serving {site.base_url} (Ctrl+C to stop)")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server.server_close()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,335 @@
+"""
+Offline benchmark suite for the scraper and the analyzer.
+
+Every scenario runs against the local fixture site and FakeGenerativeModel,
+so nothing touches freshproduce.com or Vertex AI. Each one reports
+throughput (articles/sec), p50/p95 latency of its unit of work (one article
+fetch or one model request) and peak Python memory. tracemalloc slows
+Python code down a lot, so peak memory is taken from a second run of the
+scenario and the timings from a first run without it. Run from the
+repository root:
+
+    python -m benchmarks.run
+    python -m benchmarks.run --scenarios analyze --model-latency 0.2 --json bench.json
+
+Scenarios run in a scratch directory, so journals, caches and outputs
+never mix with real data.
+"""
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import logging
+import math
+import os
+import shutil
+import tempfile
+import threading
+import time
+import tracemalloc
+from unittest import mock
+
+import pandas as pd
+import requests
+
+import config
+import listing_api
+import scrapper
+from analysis import ArticleAnalyzer
+from async_crawler import AsyncCrawler
+from benchmarks.fixture_site import FixtureSite
+from fake_model import FakeGenerativeModel
+from parsing import extract_article_text
+from storage import write_table
+
+class LatencyRecorder:
+    """Collects wall-clock durations of wrapped calls from any thread"""
+
+    def __init__(self):
+        self.samples = []
+        self.lock = threading.Lock()
+
+    def _record(self, start: float):
+        with self.lock:
+            self.samples.append(time.perf_counter() - start)
+
+    def wrap(self, function):
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._record(start)
+        return timed
+
+    def wrap_async(self, function):
+        async def timed(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return await function(*args, **kwargs)
+            finally:
+                self._record(start)
+        return timed
+
+def percentile(samples: list, fraction: float) -> float:
+    """Nearest-rank percentile; NaN without samples"""
+    if not samples:
+        return float("nan")
+    ordered = sorted(samples)
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+def _run_in_scratch_dir(scenario, recorder, options, trace_memory: bool):
+    """
+    Run a scenario once in a fresh scratch directory
+
+    Returns:
+        Tuple of (scenario result, seconds, peak traced bytes or None)
+    """
+    workdir = tempfile.mkdtemp(prefix="bench-")
+    previous_cwd = os.getcwd()
+    os.chdir(workdir)
+
+    if trace_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+    try:
+        # The scrapers print every step; only the numbers matter here
+        with contextlib.redirect_stdout(io.StringIO()):
+            articles = scenario(recorder, options)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1] if trace_memory else None
+    finally:
+        if trace_memory:
+            tracemalloc.stop()
+        os.chdir(previous_cwd)
+        shutil.rmtree(workdir, ignore_errors=True)
+
+    return articles, elapsed, peak
+
+def measure(name: str, scenario, options) -> dict:
+    """
+    Run one scenario and collect its metrics
+
+    The scenario gets (recorder, options) and returns the number of
+    articles it processed, or a string explaining why it was skipped.
+    """
+    recorder = LatencyRecorder()
+    articles, elapsed, _ = _run_in_scratch_dir(scenario, recorder, options, trace_memory=False)
+    if isinstance(articles, str):
+        return {"scenario": name, "skipped": articles}
+
+    peak = None
+    if not options.skip_memory:
+        _, _, peak = _run_in_scratch_dir(scenario, LatencyRecorder(), options, trace_memory=True)
+
+    return {
+        "scenario": name,
+        "articles": articles,
+        "seconds": round(elapsed, 3),
+        "articles_per_sec": round(articles / elapsed, 2) if elapsed else None,
+        "p50_ms": round(percentile(recorder.samples, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(recorder.samples, 0.95) * 1000, 1),
+        "peak_mb": round(peak / 2 ** 20, 1) if peak is not None else None,
+    }
+
+# Scraping scenarios
+
+def _listed_articles(site: FixtureSite, category: str) -> list:
+    """Every article of a category as listing dictionaries, via the search endpoint"""
+    api_url = site.base_url.replace("/resources", "/api/search")
+    response = requests.get(api_url, params={
+        "category": category, "offset": 0, "limit": site.articles_per_category
+    })
+    response.raise_for_status()
+    root = site.base_url.replace("/resources", "")
+    return [
+        {"Title": item["title"], "URL": root + item["url"], "Category": item["eyebrow"],
+         "Description": "", "ImageURL": "", "ImageAlt": ""}
+        for item in response.json()["results"]
+    ]
+
+def _static_fetch(pool_size: int):
+    def scenario(recorder, options):
+        with FixtureSite(articles_per_category=options.articles, latency=options.site_latency) as site:
+            # The fixture is local, so no politeness delay
+            session = scrapper.setup_http_session(pool_size, delay=0)
+            timed_fetch = recorder.wrap(scrapper._fetch_article_body)
+            total = 0
+            try:
+                with mock.patch.object(scrapper, "_fetch_article_body", timed_fetch):
+                    for category in site.categories:
+                        articles = _listed_articles(site, category)
+                        scrapper.fetch_full_articles(None, articles, category, pool_size=pool_size, session=session)
+                        total += len(articles)
+            finally:
+                session.close()
+            return total
+    return scenario
+
+def scenario_listing_api(recorder, options):
+    """Category listings only, paged through the fixture's search endpoint"""
+    with FixtureSite(articles_per_category=options.articles, latency=options.site_latency) as site:
+        endpoint_url = site.base_url.replace("/resources", "/api/search")
+        timed_listing = recorder.wrap(listing_api.fetch_listing)
+        total = 0
+        with requests.Session() as session:
+            for category in site.categories:
+                endpoint = listing_api.ListingEndpoint.from_request_url(
+                    f"{endpoint_url}?category={category}&offset={site.page_size}&limit={site.page_size}"
+                )
+                total += len(timed_listing(session, endpoint, category, f"{site.base_url}/{category}/", "127.0.0.1"))
+        return total
+
+def scenario_async_crawl(recorder, options):
+    with FixtureSite(articles_per_category=options.articles, latency=options.site_latency) as site:
+        crawler = AsyncCrawler(base_url=site.base_url, requests_per_second=1000, burst=50)
+        crawler.fetch_article = recorder.wrap_async(crawler.fetch_article)
+        return len(asyncio.run(crawler.crawl()))
+
+def scenario_selenium(recorder, options):
+    try:
+        driver = scrapper.setup_driver()
+    except Exception as e:
+        return f"Chrome/ChromeDriver unavailable ({type(e).__name__})"
+
+    with FixtureSite(articles_per_category=options.articles, latency=options.site_latency) as site:
+        session = scrapper.setup_http_session(delay=0)
+        timed_fetch = recorder.wrap(scrapper._fetch_article_body)
+        total = 0
+        try:
+            with mock.patch.object(scrapper, "_fetch_article_body", timed_fetch):
+                for category in site.categories:
+                    total += len(scrapper.scrape_category_with_selenium(
+                        driver, category, pool_size=config.DRIVER_POOL_SIZE, session=session,
+                        base_url=site.base_url
+                    ))
+        finally:
+            driver.quit()
+            session.close()
+        return total
+
+def _selenium_extraction(mode: str):
+    """Listings by "Load More" and every article body through the browser, read in the given DOM extraction mode"""
+    def scenario(recorder, options):
+        try:
+            driver = scrapper.setup_driver()
+        except Exception as e:
+            return f"Chrome/ChromeDriver unavailable ({type(e).__name__})"
+
+        with FixtureSite(articles_per_category=options.articles, latency=options.site_latency) as site:
+            timed_fetch = recorder.wrap(scrapper._fetch_article_body)
+            total = 0
+            try:
+                with mock.patch.object(scrapper, "_fetch_article_body", timed_fetch), \
+                        mock.patch.object(config, "DOM_EXTRACTION_MODE", mode):
+                    for category in site.categories:
+                        total += len(scrapper.scrape_category_with_selenium(
+                            driver, category, base_url=site.base_url, listing_mode="selenium"
+                        ))
+            finally:
+                driver.quit()
+            return total
+    return scenario
+
+# Analysis scenarios
+
+def _write_corpus(options) -> str:
+    """Scraped-articles table built from the fixture's article pages"""
+    site = FixtureSite(articles_per_category=options.articles)
+    try:
+        rows = []
+        for category in site.categories:
+            for number in range(1, site.articles_per_category + 1):
+                text, _ = extract_article_text(site.article_page(category, number))
+                rows.append({
+                    "Title": site._title(category, number),
+                    "URL": f"https://fixture.local/resources/{category}/article-{number}/",
+                    "Category": category,
+                    "FullArticleText": text,
+                })
+    finally:
+        site.server.server_close()
+
+    path = os.path.join("data", "bench_input.parquet")
+    write_table(pd.DataFrame(rows), path, export_csv=False)
+    return path
+
+def _analysis(concurrency: int, batch_token_budget: int = 0, failure_rate: float = None):
+    def scenario(recorder, options):
+        input_path = _write_corpus(options)
+        model = FakeGenerativeModel(
+            latency=options.model_latency,
+            failure_rate=options.failure_rate if failure_rate is None else failure_rate,
+            seed=1
+        )
+        analyzer = ArticleAnalyzer(model=model)
+
+        # Latency of one unit of work: a row, or a whole batch request
+        if batch_token_budget:
+            analyzer.analyze_batch = recorder.wrap(analyzer.analyze_batch)
+        else:
+            analyzer.analyze_row = recorder.wrap(analyzer.analyze_row)
+
+        analyzer.process_csv(
+            input_path, os.path.join("data", "bench_output.parquet"),
+            concurrency=concurrency, requests_per_minute=10 ** 6, tokens_per_minute=10 ** 9,
+            incremental=False, batch_token_budget=batch_token_budget, dedup=False
+        )
+        return len(config.CATEGORIES) * options.articles
+    return scenario
+
+SCENARIOS = {
+    "scrape-static-serial": _static_fetch(pool_size=1),
+    "scrape-static-pool": _static_fetch(pool_size=config.DRIVER_POOL_SIZE),
+    "scrape-async": scenario_async_crawl,
+    "scrape-listing-api": scenario_listing_api,
+    "scrape-selenium": scenario_selenium,
+    "scrape-selenium-elements": _selenium_extraction("elements"),
+    "scrape-selenium-script": _selenium_extraction("script"),
+    "analyze-workers-4": _analysis(concurrency=4, failure_rate=0.0),
+    "analyze-workers-8": _analysis(concurrency=8, failure_rate=0.0),
+    "analyze-batched": _analysis(concurrency=4, batch_token_budget=6000, failure_rate=0.0),
+    "analyze-failures": _analysis(concurrency=4),
+}
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline scraper and analyzer benchmarks")
+    parser.add_argument("--scenarios", nargs="+", default=None,
+                        help="Scenario names or prefixes (default: all)")
+    parser.add_argument("--articles", type=int, default=30, help="Articles per category")
+    parser.add_argument("--site-latency", type=float, default=0.02, help="Fixture response delay in seconds")
+    parser.add_argument("--model-latency", type=float, default=0.05, help="Fake model delay in seconds")
+    parser.add_argument("--failure-rate", type=float, default=0.1,
+                        help="Fake model failure rate for the analyze-failures scenario")
+    parser.add_argument("--skip-memory", action="store_true", help="Skip the tracemalloc run of each scenario")
+    parser.add_argument("--json", help="Also write the results to this JSON file")
+    options = parser.parse_args()
+
+    selected = [
+        name for name in SCENARIOS
+        if not options.scenarios or any(name.startswith(prefix) for prefix in options.scenarios)
+    ]
+
+    # Per-article and per-request log lines would swamp the report
+    logging.getLogger().setLevel(logging.WARNING)
+    logging.getLogger("analysis").setLevel(logging.ERROR)
+
+    print(f"{'scenario':<24} {'articles':>8} {'seconds':>8} {'art/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'peak MB':>8}")
+    results = []
+    for name in selected:
+        result = measure(name, SCENARIOS[name], options)
+        results.append(result)
+        if "skipped" in result:
+            print(f"{name:<24} skipped: {result['skipped']}")
+            continue
+        print(f"{name:<24} {result['articles']:>8} {result['seconds']:>8.2f} {result['articles_per_sec']:>8.1f} "
+              f"{result['p50_ms']:>8.1f} {result['p95_ms']:>8.1f} {result['peak_mb'] or float('nan'):>8.1f}")
+
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as f:
+            json.dump({"options": vars(options), "results": results}, f, indent=2)
+        print(f"Results written to {options.json}")
+
+if __name__ == "__main__":
+    main()
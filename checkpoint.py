@@ -0,0 +1,80 @@
+import json
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+class CheckpointJournal:
+    """
+    Append-only JSONL journal of completed work items.
+
+    Each completed item is written as one `{"key": ..., "record": ...}` line
+    and flushed to disk immediately, so a crash loses at most the item in
+    flight. On restart, load() returns everything already done and the
+    caller skips those items. A truncated last line from a crash is ignored.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lock = threading.Lock()
+        self._file = None
+
+    def load(self) -> dict:
+        """
+        Read the journal
+
+        Returns:
+            Dictionary of key -> record; later entries win
+        """
+        completed = {}
+        if not os.path.exists(self.path):
+            return completed
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                    completed[entry["key"]] = entry["record"]
+                except (json.JSONDecodeError, KeyError, TypeError):
+                    logger.warning(f"Ignoring unreadable line {line_number} in {self.path}")
+
+        return completed
+
+    def append(self, key: str, record: dict):
+        """
+        Durably record one completed item
+        """
+        line = json.dumps({"key": key, "record": record}, ensure_ascii=False)
+        with self.lock:
+            if self._file is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._file = open(self.path, "a", encoding="utf-8")
+                # Start on a fresh line if a crash left a partial entry behind
+                if self._file.tell() > 0 and not self._ends_with_newline():
+                    self._file.write("\n")
+            self._file.write(line + "\n")
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def close(self):
+        with self.lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+    def clear(self):
+        """
+        Delete the journal once its stage has finished successfully
+        """
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
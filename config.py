@@ -4,5 +4,98 @@ CATEGORIES = ["global-trade", "technology", "food-safety"]
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
 }
-DELAY_BETWEEN_REQUESTS = 1  # seconds
-MAX_RETRIES = 3
\ No newline at end of file
+DELAY_BETWEEN_REQUESTS = 1  # seconds between the starts of two HTTP requests to the same host
+MAX_RETRIES = 3
+HTTP_RETRY_BACKOFF = 1  # seconds; failed requests are retried after 1x, 2x, 4x... this
+DRIVER_POOL_SIZE = 3  # WebDriver sessions used to fetch article bodies
+ARTICLE_FETCH_MODE = "http"  # "http" tries static HTML before Selenium, "selenium" always uses the browser
+
+# Chrome profile
+CHROME_LEAN_PROFILE = True  # headless, eager page loads, no extensions, blocked resources below
+CHROME_PAGE_LOAD_STRATEGY = "eager"  # return at DOMContentLoaded; the crawler waits for elements itself
+# Stylesheets stay enabled: without CSS, hidden elements would leak into the extracted text
+CHROME_BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.svg", "*.ico", "*.avif",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot",
+    "*.mp4", "*.webm", "*.mp3", "*.m3u8",
+    "*google-analytics.com*", "*googletagmanager.com*", "*doubleclick.net*", "*facebook.net*",
+    "*hotjar.com*", "*hubspot.com*", "*linkedin.com/px*", "*clarity.ms*", "*youtube.com/embed*",
+]
+
+# Listing page waits (upper bounds; the crawler moves on as soon as the page is ready)
+LISTING_WAIT_TIMEOUT = 15  # seconds for the first tiles to render
+LOAD_MORE_TIMEOUT = 10  # seconds for new tiles after a "Load More" click
+LOAD_MORE_MAX_CLICKS = 10
+NETWORK_IDLE_MS = 500  # no XHR/fetch for this long means a click loaded nothing
+DOM_QUIET_MS = 300  # no DOM mutation for this long means lazy loading has settled
+LISTING_MODE = "api"  # "api" pages through the site's search endpoint, "selenium" clicks "Load More"
+LISTING_ENDPOINTS_PATH = "data/listing_endpoints.json"  # search endpoints discovered per category
+LISTING_API_PAGE_SIZE = 50  # results per search request, if the endpoint takes a page size
+LISTING_API_MAX_PAGES = 200  # safety limit per category
+
+# DOM extraction
+DOM_EXTRACTION_MODE = "script"  # "script" reads a page in one execute_script call, "elements" queries element by element
+ARTICLE_CONTENT_TIMEOUT = 15  # seconds to wait for script-rendered article content (below the 30 s script timeout)
+
+# asyncio crawler politeness (per host)
+ASYNC_MAX_CONCURRENCY_PER_HOST = 4
+ASYNC_REQUESTS_PER_SECOND = 2.0
+ASYNC_BURST = 4
+
+# Gemini analysis
+ANALYSIS_CONCURRENCY = 4  # parallel model calls, 1 runs serially
+GEMINI_REQUESTS_PER_MINUTE = 60
+GEMINI_TOKENS_PER_MINUTE = 1000000
+ANALYSIS_OUTPUT_TOKEN_ESTIMATE = 500  # expected response size, counted against the token budget
+ANALYSIS_MAX_OUTPUT_TOKENS = 2048  # per article; on Gemini 2.5 this also covers thinking tokens
+STRUCTURED_OUTPUT = True  # ask for schema-constrained JSON instead of parsing free text
+INCREMENTAL_ANALYSIS = True  # only analyze new, changed or previously failed rows
+ANALYSIS_BATCH_TOKEN_BUDGET = 0  # pack articles into one request up to this many tokens, 0 disables batching
+ANALYSIS_BATCH_MAX_ARTICLES = 10
+LONG_ARTICLE_TOKEN_THRESHOLD = 8000  # longer articles are summarized chunk by chunk (map-reduce)
+CHUNK_TOKENS = 3000
+CHUNK_CONCURRENCY = 4  # chunk calls in flight per long article
+NEAR_DUPLICATE_DEDUP = True  # analyze one article per cluster of near-duplicates
+NEAR_DUPLICATE_THRESHOLD = 0.8  # estimated Jaccard similarity of 5-word shingles
+
+# Storage
+STORAGE_FORMAT = "parquet"  # "parquet" or "csv"
+EXPORT_CSV = True  # also write a CSV copy of Parquet tables
+SCRAPED_DATA_PATH = "data/scraped_freshproduce_data"  # without extension
+ANALYSIS_DATA_PATH = "data/analysis_summary"
+
+# Boilerplate stripping
+TEXT_CLEANING = True
+BOILERPLATE_MODEL_PATH = "data/boilerplate_lines.json"
+BOILERPLATE_MIN_FRACTION = 0.3  # share of pages a line must appear on to count as boilerplate
+BOILERPLATE_MIN_PAGES = 3
+
+# Analysis result cache
+ANALYSIS_CACHE_PATH = "data/analysis_cache.sqlite"
+ANALYSIS_CACHE_MAX_ENTRIES = 50000
+ANALYSIS_CACHE_MAX_AGE_DAYS = 90
+
+# Incremental crawl
+INCREMENTAL_CRAWL = True  # reuse unchanged article bodies from the crawl index
+CRAWL_INDEX_PATH = "data/crawl_index.sqlite"
+CRAWL_REFRESH_HOURS = 24  # reuse pages that need a browser for this long; HTTP pages are always rechecked
+
+# HTML snapshots
+SNAPSHOTS_ENABLED = True  # keep compressed copies of fetched listing and article pages for offline re-extraction
+SNAPSHOT_DIR = "data/snapshots"  # gzip blobs named by content hash, plus manifest.sqlite
+SNAPSHOT_COMPRESSION_LEVEL = 6
+REEXTRACT_WORKERS = 4  # parser processes for `main.py reextract`, 1 parses in-process
+
+# Metrics and logging
+METRICS_DIR = "metrics"  # JSON run reports and Prometheus text files
+SCRAPER_VERBOSE = False  # print per-tile and per-article progress lines
+
+# Streaming pipeline
+PIPELINE_QUEUE_SIZE = 20  # scraped articles buffered ahead of analysis
+
+# Warm worker daemon
+WORKER_HOST = "127.0.0.1"  # only local clients
+WORKER_PORT = 6010
+WORKER_BROWSERS = 3  # warm Chrome sessions kept by the daemon
+WORKER_RECYCLE_PAGES = 200  # restart a browser after this many page loads to cap its memory
+WORKER_KEY_PATH = "data/worker.key"  # shared secret for clients; WORKER_AUTHKEY overrides it
@@ -0,0 +1,111 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+
+import config
+
+class CrawlIndex:
+    """
+    Persistent index of fetched article pages for incremental crawls.
+
+    Stores, per URL, the extracted text, a hash of it, when it was last
+    fetched and the ETag/Last-Modified validators the server sent (if any).
+    The scraper uses it to send conditional requests and to carry unchanged
+    articles forward without downloading them again.
+    """
+
+    def __init__(self, path: str = None, refresh_hours: float = None):
+        """
+        Args:
+            path: SQLite database file (defaults to config.CRAWL_INDEX_PATH)
+            refresh_hours: Pages only a browser can fetch are reloaded after
+                this many hours (defaults to config.CRAWL_REFRESH_HOURS)
+        """
+        self.path = path or config.CRAWL_INDEX_PATH
+        self.refresh_hours = refresh_hours if refresh_hours is not None else config.CRAWL_REFRESH_HOURS
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS crawl_index (
+                url TEXT PRIMARY KEY,
+                content_hash TEXT NOT NULL,
+                text TEXT NOT NULL,
+                fetched_at REAL NOT NULL,
+                etag TEXT,
+                last_modified TEXT
+            )
+            """
+        )
+        self.conn.commit()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+    def get(self, url: str):
+        """
+        Return the index entry for a URL as a dict, or None if never fetched
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT url, content_hash, text, fetched_at, etag, last_modified FROM crawl_index WHERE url = ?",
+                (url,)
+            ).fetchone()
+
+        if row is None:
+            return None
+        return dict(zip(("url", "content_hash", "text", "fetched_at", "etag", "last_modified"), row))
+
+    def is_fresh(self, entry: dict, can_revalidate: bool = True) -> bool:
+        """
+        Whether an entry can be reused without contacting the server.
+
+        When an HTTP fetch is possible the page is always fetched again:
+        conditionally if the server sent validators, otherwise in full, with
+        record() telling from the content hash whether it changed. A time to
+        live only applies to pages that would need a browser, and is
+        refresh_hours.
+        """
+        if can_revalidate:
+            return False
+        return time.time() - entry["fetched_at"] < self.refresh_hours * 3600
+
+    def record(self, url: str, text: str, etag: str = None, last_modified: str = None) -> bool:
+        """
+        Store freshly fetched text for a URL
+
+        Returns:
+            True if the content is new or changed since the last fetch
+        """
+        new_hash = self.content_hash(text)
+        with self.lock:
+            row = self.conn.execute("SELECT content_hash FROM crawl_index WHERE url = ?", (url,)).fetchone()
+            self.conn.execute(
+                "INSERT OR REPLACE INTO crawl_index (url, content_hash, text, fetched_at, etag, last_modified) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (url, new_hash, text, time.time(), etag, last_modified)
+            )
+            self.conn.commit()
+        return row is None or row[0] != new_hash
+
+    def touch(self, url: str):
+        """
+        Mark an entry as revalidated (e.g. after a 304 Not Modified)
+        """
+        with self.lock:
+            self.conn.execute("UPDATE crawl_index SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    def __len__(self):
+        with self.lock:
+            return self.conn.execute("SELECT COUNT(*) FROM crawl_index").fetchone()[0]
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
@@ -0,0 +1,108 @@
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+# Mersenne prime for the MinHash permutations; keeps a * x + b within uint64
+_PRIME = (1 << 31) - 1
+
+def shingles(text: str, k: int = 5) -> set:
+    """
+    Hashed word k-grams of a text, after lowercasing and dropping punctuation
+    """
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < k:
+        return {zlib.crc32(" ".join(words).encode("utf-8")) % _PRIME} if words else set()
+    return {
+        zlib.crc32(" ".join(words[i:i + k]).encode("utf-8")) % _PRIME
+        for i in range(len(words) - k + 1)
+    }
+
+class MinHasher:
+    """
+    MinHash signatures over shingle sets using random linear permutations
+    """
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        rng = np.random.default_rng(seed)
+        self.num_perm = num_perm
+        self.a = rng.integers(1, _PRIME, size=num_perm, dtype=np.uint64)
+        self.b = rng.integers(0, _PRIME, size=num_perm, dtype=np.uint64)
+
+    def signature(self, shingle_set: set) -> np.ndarray:
+        if not shingle_set:
+            return np.full(self.num_perm, _PRIME, dtype=np.uint64)
+        values = np.fromiter(shingle_set, dtype=np.uint64, count=len(shingle_set))
+        hashed = (np.outer(self.a, values) + self.b[:, None]) % _PRIME
+        return hashed.min(axis=1)
+
+def estimated_similarity(sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+    """
+    Estimated Jaccard similarity of two MinHash signatures
+    """
+    return float(np.mean(sig_a == sig_b))
+
+def find_near_duplicate_clusters(items: list, threshold: float = 0.8, num_perm: int = 128,
+                                 bands: int = 16, shingle_size: int = 5) -> list:
+    """
+    Group near-duplicate texts with MinHash and locality-sensitive hashing.
+
+    Signatures are split into bands; texts sharing any band are candidates,
+    and candidates whose estimated Jaccard similarity reaches the threshold
+    are merged into one cluster.
+
+    Args:
+        items: List of (item_id, text) tuples
+        threshold: Minimum estimated Jaccard similarity of word shingles
+        num_perm: MinHash signature length (must be divisible by bands)
+        bands: Number of LSH bands
+        shingle_size: Words per shingle
+
+    Returns:
+        List of clusters with more than one member, each a list of item ids
+        in input order
+    """
+    if num_perm % bands:
+        raise ValueError("num_perm must be divisible by bands")
+    rows = num_perm // bands
+
+    hasher = MinHasher(num_perm)
+    ids = [item_id for item_id, _ in items]
+    signatures = [hasher.signature(shingles(text, shingle_size)) for _, text in items]
+
+    buckets = defaultdict(list)
+    for position, signature in enumerate(signatures):
+        for band in range(bands):
+            key = (band, signature[band * rows:(band + 1) * rows].tobytes())
+            buckets[key].append(position)
+
+    # Union-find over positions
+    parent = list(range(len(items)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    checked = set()
+    for members in buckets.values():
+        if len(members) < 2:
+            continue
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                pair = (first, second)
+                if pair in checked:
+                    continue
+                checked.add(pair)
+                if estimated_similarity(signatures[first], signatures[second]) >= threshold:
+                    root_first, root_second = find(first), find(second)
+                    if root_first != root_second:
+                        parent[max(root_first, root_second)] = min(root_first, root_second)
+
+    clusters = defaultdict(list)
+    for position in range(len(items)):
+        clusters[find(position)].append(ids[position])
+
+    return [members for members in clusters.values() if len(members) > 1]
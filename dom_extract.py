@@ -0,0 +1,113 @@
+"""
+Single-pass DOM extraction for the Selenium scraper.
+
+Reading a listing tile by tile costs a WebDriver round trip for every class
+attribute, title, link, eyebrow, description and image, and looking for an
+article body tries each content selector with its own wait. The scripts
+here run once in the page and return everything as JSON, so a listing or
+an article costs one call however many tiles or selectors there are.
+"""
+from selenium.common.exceptions import WebDriverException
+
+# Returns null without a result panel, otherwise one object per div.tile with
+# the same fields the element-by-element path reads (null when missing)
+TILE_DATA_SCRIPT = """
+var panel = document.querySelector("div.result-panel");
+if (!panel) { return null; }
+return Array.prototype.map.call(panel.querySelectorAll("div.tile"), function (tile) {
+  var text = function (selector) {
+    var element = tile.querySelector(selector);
+    return element ? element.innerText.trim() : null;
+  };
+  var link = tile.querySelector("div.cta-area a.score-button");
+  var image = tile.querySelector("div.image-wrapper img");
+  return {
+    className: tile.className,
+    title: text("p.title"),
+    url: link ? link.href : null,
+    eyebrow: text("p.eyebrow"),
+    description: text("p.description"),
+    imageUrl: image ? image.src : null,
+    imageAlt: image ? image.alt : null
+  };
+});
+"""
+
+# Resolves with {selector, text} for the first of arguments[0] whose text is
+# longer than arguments[1] characters. Script-rendered content is polled for.
+# The first selector is taken as soon as it matches; a later one only once
+# the page has loaded and the DOM has been quiet for arguments[2] ms, so a
+# generic container (e.g. main) never wins while the preferred one is still
+# rendering. With no match by then, or after arguments[3] ms, it falls back
+# to the best match so far or the body text ({selector: "body"}). Resolves
+# with null when there is no body.
+ARTICLE_CONTENT_SCRIPT = """
+var selectors = arguments[0], minLength = arguments[1];
+var quietMs = arguments[2], timeoutMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var start = performance.now(), lastMutation = start;
+var observer = new MutationObserver(function () { lastMutation = performance.now(); });
+observer.observe(document, {childList: true, subtree: true, characterData: true});
+function finish(result) {
+  observer.disconnect();
+  done(result);
+}
+function bestMatch() {
+  for (var i = 0; i < selectors.length; i++) {
+    var element = document.querySelector(selectors[i]);
+    if (element) {
+      var text = element.innerText.trim();
+      if (text.length > minLength) { return {rank: i, selector: selectors[i], text: text}; }
+    }
+  }
+  return null;
+}
+function check() {
+  var best = bestMatch();
+  if (best && best.rank === 0) { return finish({selector: best.selector, text: best.text}); }
+  var now = performance.now();
+  var settled = document.readyState === "complete" && now - lastMutation >= quietMs;
+  if (settled || now - start >= timeoutMs) {
+    if (best) { return finish({selector: best.selector, text: best.text}); }
+    return finish(document.body ? {selector: "body", text: document.body.innerText.trim()} : null);
+  }
+  setTimeout(check, 100);
+}
+check();
+"""
+
+def tile_data(driver):
+    """
+    Read every listing tile in one call
+
+    Returns:
+        List of dicts with className, title, url, eyebrow, description,
+        imageUrl and imageAlt, or None when the page has no result panel
+    """
+    return driver.execute_script(TILE_DATA_SCRIPT)
+
+def article_content(driver, selectors: list, min_length: int, quiet_ms: int, timeout: float):
+    """
+    Find the article body in one call
+
+    Args:
+        driver: Selenium WebDriver instance with the article loaded
+        selectors: Content selectors in order of preference
+        min_length: Characters a block needs to count as the article
+        quiet_ms: DOM quiet period after page load before a lower-priority
+            selector or the body is accepted
+        timeout: Upper bound in seconds
+
+    Returns:
+        Tuple of (text, selector), selector being "body" for the fallback,
+        or None if the script could not run or the page has no body
+    """
+    # WebDriver's default async script timeout (30 s) must outlast `timeout`
+    try:
+        result = driver.execute_async_script(ARTICLE_CONTENT_SCRIPT, selectors, min_length, quiet_ms,
+                                             int(timeout * 1000))
+    except WebDriverException:
+        return None
+    if not result:
+        return None
+    return result["text"], result["selector"]
@@ -0,0 +1,62 @@
+import json
+import random
+import re
+import threading
+import time
+
+class FakeResponse:
+    """Stand-in for a Vertex AI response; only `.text` is used by the analyzer"""
+
+    def __init__(self, text: str):
+        self.text = text
+
+class FakeGenerativeModel:
+    """
+    Offline stand-in for vertexai's GenerativeModel.
+
+    Returns a well-formed `{summary, topics}` JSON answer built from the
+    prompt (or a JSON array for batch prompts), after an optional delay,
+    and can be told to fail a share of calls. Pass it to
+    ArticleAnalyzer(model=...) to run the analysis pipeline without network
+    access.
+    """
+
+    def __init__(self, latency: float = 0.0, failure_rate: float = 0.0, seed: int = None):
+        """
+        Args:
+            latency: Seconds to sleep per call
+            failure_rate: Probability in [0, 1] that a call raises
+            seed: Seed for the failure draws, for reproducible runs
+        """
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.random = random.Random(seed)
+        self.calls = 0
+        self.lock = threading.Lock()
+
+    def generate_content(self, prompt, generation_config=None):
+        with self.lock:
+            self.calls += 1
+            fail = self.random.random() < self.failure_rate
+
+        if self.latency:
+            time.sleep(self.latency)
+
+        if fail:
+            raise RuntimeError("Simulated model failure")
+
+        articles = re.findall(r'<article id="([^"]+)">\n(.*?)\n</article>', str(prompt), re.DOTALL)
+        if articles:
+            return FakeResponse(json.dumps([
+                {"id": article_id, **self._analysis(text)} for article_id, text in articles
+            ]))
+
+        return FakeResponse(json.dumps(self._analysis(str(prompt))))
+
+    @staticmethod
+    def _analysis(text: str) -> dict:
+        words = [w.strip('.,;:"\'()') for w in text.split()[-200:]]
+        words = [w for w in words if len(w) > 3]
+        topics = list(dict.fromkeys(w.lower() for w in words))[:5] or ["general"]
+        summary = " ".join(words[:20]) or "No content"
+        return {"summary": summary, "topics": topics}
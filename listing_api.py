@@ -0,0 +1,430 @@
+"""
+Category listings straight from the site's search API.
+
+The listing page renders its first results and fetches the rest with an
+XHR/fetch request each time "Load More" is clicked. This module finds that
+request once, from Chrome's performance log (or the request tracker in
+waits.py when the log is not enabled), and then pages through the endpoint
+with plain HTTP requests. Each page is a small JSON document instead of an
+interactive browser session, and there is no cap on the number of pages.
+
+Discovered endpoints are saved per category, so later runs go straight to
+the API; when the API stops answering the scraper falls back to clicking
+"Load More".
+"""
+import json
+import os
+from urllib.parse import parse_qsl, urlencode, urljoin, urlparse, urlunparse
+
+import requests
+from selenium.webdriver.common.by import By
+
+import config
+import metrics
+import snapshots
+from parsing import parse_listing_tiles
+from waits import (install_network_tracker, tracked_request_urls, wait_for_count_change,
+                   wait_for_elements)
+
+# Query parameters that page through results
+OFFSET_PARAMS = ("offset", "start", "skip", "from", "startIndex", "startindex")
+PAGE_PARAMS = ("page", "pageNumber", "pagenumber", "pageIndex", "pageindex", "p")
+PAGE_SIZE_PARAMS = ("limit", "pageSize", "pagesize", "size", "take", "rows", "perPage", "per_page", "count")
+
+# Where the search responses keep their results and the total
+RESULT_LIST_KEYS = ("results", "items", "hits", "documents", "data")
+TOTAL_KEYS = ("total", "totalResults", "totalCount", "numFound", "resultCount")
+
+# Record fields and the JSON keys they are read from, in order of preference
+FIELD_KEYS = {
+    'Title': ("title", "name", "heading"),
+    'URL': ("url", "link", "href", "path"),
+    'Category': ("eyebrow", "category", "type"),
+    'Description': ("description", "summary", "excerpt", "teaser"),
+    'ImageURL': ("imageUrl", "imageURL", "image", "thumbnail"),
+    'ImageAlt': ("imageAlt", "alt"),
+}
+
+class ListingEndpoint:
+    """
+    A paginated search endpoint: the request URL minus its paging parameter.
+    """
+
+    def __init__(self, url: str, paging_param: str, paging: str = "offset", first_page: int = 0,
+                 size_param: str = None):
+        """
+        Args:
+            url: Request URL without the paging parameter
+            paging_param: Query parameter that selects the page
+            paging: "offset" (item offset) or "page" (page number)
+            first_page: Number of the first page for page-number paging
+            size_param: Query parameter with the page size, if any
+        """
+        self.url = url
+        self.paging_param = paging_param
+        self.paging = paging
+        self.first_page = first_page
+        self.size_param = size_param
+
+    @classmethod
+    def from_request_url(cls, request_url: str, first_request: bool = True):
+        """
+        Build an endpoint from one observed request URL
+
+        Args:
+            request_url: URL of a search request the page made
+            first_request: The URL came from the first "Load More" click, which
+                tells where page-number paging starts
+
+        Returns:
+            ListingEndpoint, or None if the URL has no recognizable paging parameter
+        """
+        parts = urlparse(request_url)
+        params = parse_qsl(parts.query, keep_blank_values=True)
+        names = [name for name, _ in params]
+
+        paging_param = next((name for name in OFFSET_PARAMS if name in names), None)
+        paging = "offset"
+        if paging_param is None:
+            paging_param = next((name for name in PAGE_PARAMS if name in names), None)
+            paging = "page"
+        if paging_param is None:
+            return None
+
+        first_page = 0
+        if paging == "page":
+            observed = dict(params)[paging_param]
+            # The first click asks for the second page
+            first_page = max(0, int(observed) - 1) if first_request and observed.isdigit() else 1
+
+        size_param = next((name for name in PAGE_SIZE_PARAMS if name in names), None)
+        query = urlencode([(name, value) for name, value in params if name != paging_param])
+        return cls(urlunparse(parts._replace(query=query)), paging_param, paging, first_page, size_param)
+
+    def page_url(self, position: int, page_size: int = None) -> str:
+        """
+        URL of the page starting at an item offset or with a page number
+
+        Args:
+            position: Item offset for offset paging, page index (from 0) for page paging
+            page_size: Results per page to ask for, if the endpoint takes a size
+        """
+        parts = urlparse(self.url)
+        params = [
+            (name, value) for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not (page_size and name == self.size_param)
+        ]
+        if self.paging == "page":
+            position += self.first_page
+        params.append((self.paging_param, str(position)))
+        if page_size and self.size_param:
+            params.append((self.size_param, str(page_size)))
+        return urlunparse(parts._replace(query=urlencode(params)))
+
+    def to_dict(self) -> dict:
+        return {
+            "url": self.url, "paging_param": self.paging_param, "paging": self.paging,
+            "first_page": self.first_page, "size_param": self.size_param,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(data["url"], data["paging_param"], data.get("paging", "offset"),
+                   data.get("first_page", 0), data.get("size_param"))
+
+def load_endpoints(path: str = None) -> dict:
+    """
+    Saved endpoints by category; empty if none were discovered yet
+    """
+    path = path or config.LISTING_ENDPOINTS_PATH
+    try:
+        with open(path, encoding="utf-8") as f:
+            return {category: ListingEndpoint.from_dict(data) for category, data in json.load(f).items()}
+    except (OSError, ValueError, KeyError):
+        return {}
+
+def save_endpoint(category: str, endpoint: ListingEndpoint, path: str = None):
+    path = path or config.LISTING_ENDPOINTS_PATH
+    endpoints = {name: saved.to_dict() for name, saved in load_endpoints(path).items()}
+    endpoints[category] = endpoint.to_dict()
+
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(endpoints, f, indent=2)
+    os.replace(path + ".tmp", path)
+
+def _performance_log_urls(driver) -> list:
+    """
+    URLs of XHR/fetch requests in Chrome's performance log, oldest first
+
+    Empty when the driver was not started with performance logging.
+    """
+    try:
+        entries = driver.get_log("performance")
+    except Exception:
+        return []
+
+    urls = []
+    for entry in entries:
+        try:
+            message = json.loads(entry["message"])["message"]
+        except (KeyError, ValueError):
+            continue
+        if message.get("method") != "Network.requestWillBeSent":
+            continue
+        params = message.get("params", {})
+        if params.get("type") in ("XHR", "Fetch"):
+            urls.append(params["request"]["url"])
+    return urls
+
+def discover_endpoint(driver, listing_url: str, tile_selector: str, load_more_xpath: str):
+    """
+    Find the search endpoint a listing page calls when "Load More" is clicked
+
+    Loads the page, clicks "Load More" once and looks at the XHR/fetch
+    requests made meanwhile; the first one with a paging parameter wins.
+
+    Args:
+        driver: Selenium WebDriver instance, ideally started with performance logging
+        listing_url: Category listing page
+        tile_selector: CSS selector of the listing tiles
+        load_more_xpath: XPath of the "Load More" button
+
+    Returns:
+        ListingEndpoint, or None if no paginated request was seen
+    """
+    _performance_log_urls(driver)  # drop entries from earlier pages
+
+    driver.get(listing_url)
+    tile_count = wait_for_elements(driver, tile_selector, config.LISTING_WAIT_TIMEOUT)
+    install_network_tracker(driver)
+
+    buttons = [button for button in driver.find_elements(By.XPATH, load_more_xpath) if button.is_displayed()]
+    if buttons:
+        driver.execute_script("arguments[0].scrollIntoView(true); arguments[0].click();", buttons[0])
+        wait_for_count_change(driver, tile_selector, tile_count, config.LOAD_MORE_TIMEOUT, config.NETWORK_IDLE_MS)
+
+    # Search requests may go to an API subdomain, but never to a third-party host
+    site = urlparse(listing_url).hostname or ""
+    site = site[4:] if site.startswith("www.") else site
+    candidates = _performance_log_urls(driver) + tracked_request_urls(driver)
+    for url in candidates:
+        if not (urlparse(url).hostname or "").endswith(site):
+            continue
+        endpoint = ListingEndpoint.from_request_url(url, first_request=bool(buttons))
+        if endpoint is not None:
+            print(f"Found listing API endpoint: {url}")
+            return endpoint
+    return None
+
+def _pick(item: dict, keys: tuple):
+    for key in keys:
+        value = item.get(key)
+        if isinstance(value, dict):
+            value = value.get("url") or value.get("src") or value.get("href")
+        if value:
+            return str(value).strip()
+    return ""
+
+def records_from_payload(payload, category: str, page_url: str, allowed_host: str):
+    """
+    Article records from one search response
+
+    Responses that carry rendered tile markup (an "html" field) are parsed
+    with the same tile rules as the listing page; otherwise the result
+    objects are mapped field by field.
+
+    Args:
+        payload: Decoded JSON response
+        category: Category slug, used when a result has no category
+        page_url: URL for resolving relative links
+        allowed_host: Text that must appear in article URLs
+
+    Returns:
+        Tuple of (article dictionaries, number of results in the response)
+    """
+    items = payload if isinstance(payload, list) else None
+    if isinstance(payload, dict):
+        items = next((payload[key] for key in RESULT_LIST_KEYS if isinstance(payload.get(key), list)), None)
+
+    if isinstance(payload, dict) and isinstance(payload.get("html"), str):
+        records = parse_listing_tiles(
+            f'<div class="result-panel">{payload["html"]}</div>', category, page_url, allowed_host=allowed_host
+        )
+        return records, len(items) if items is not None else len(records)
+
+    if items is None:
+        return [], 0
+
+    records = {}
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        record = {field: _pick(item, keys) for field, keys in FIELD_KEYS.items()}
+        record['URL'] = urljoin(page_url, record['URL']) if record['URL'] else ""
+        if record['ImageURL']:
+            record['ImageURL'] = urljoin(page_url, record['ImageURL'])
+        if not record['Title'] or not record['URL'] or allowed_host not in record['URL']:
+            continue
+        record['Category'] = record['Category'] or category.replace('-', ' ').title()
+        records.setdefault(record['URL'], record)
+    return list(records.values()), len(items)
+
+def _total(payload):
+    if isinstance(payload, dict):
+        for key in TOTAL_KEYS:
+            if isinstance(payload.get(key), int):
+                return payload[key]
+    return None
+
+class ListingPager:
+    """
+    Paging state of one listing crawl through a search endpoint
+
+    Shared by the requests client below and the async crawler: ask
+    next_url() for the request to make, hand each decoded response to add(),
+    and stop when next_url() returns None. Paging stops at the reported
+    total, at a short or empty page, when a page brings no new URLs, or
+    after max_pages requests.
+    """
+
+    def __init__(self, endpoint: ListingEndpoint, category: str, page_url: str, allowed_host: str,
+                 page_size: int = None, max_pages: int = None):
+        """
+        Args:
+            endpoint: Endpoint to page through
+            category: Category slug, used when a result has no category
+            page_url: Listing page URL, for resolving relative links
+            allowed_host: Text that must appear in article URLs
+            page_size: Results per request to ask for (defaults to config.LISTING_API_PAGE_SIZE)
+            max_pages: Safety limit on requests (defaults to config.LISTING_API_MAX_PAGES)
+        """
+        self.endpoint = endpoint
+        self.category = category
+        self.page_url = page_url
+        self.allowed_host = allowed_host
+        self.page_size = page_size or config.LISTING_API_PAGE_SIZE
+        self.max_pages = max_pages or config.LISTING_API_MAX_PAGES
+
+        self.records = {}
+        self.pages = 0
+        self.seen_items = 0
+        self.largest_page = 0
+        self.done = False
+
+    def next_url(self):
+        """URL of the next page to request, or None when the listing is complete"""
+        if self.done or self.pages >= self.max_pages:
+            return None
+        position = self.seen_items if self.endpoint.paging == "offset" else self.pages
+        return self.endpoint.page_url(position, self.page_size)
+
+    def add(self, payload):
+        """Take in the decoded response to the URL last returned by next_url()"""
+        self.pages += 1
+        records, item_count = records_from_payload(payload, self.category, self.page_url, self.allowed_host)
+        new_records = [record for record in records if record['URL'] not in self.records]
+        for record in new_records:
+            self.records[record['URL']] = record
+
+        self.seen_items += item_count
+        self.largest_page = max(self.largest_page, item_count)
+        total = _total(payload)
+
+        if not item_count or not new_records:
+            self.done = True
+        elif total is not None and self.seen_items >= total:
+            self.done = True
+        # Servers may cap the page size, so a page is short relative to the largest one seen
+        elif item_count < self.largest_page:
+            self.done = True
+
+    def articles(self) -> list:
+        """Article dictionaries collected so far, in listing order"""
+        return list(self.records.values())
+
+def fetch_listing(session, endpoint: ListingEndpoint, category: str, page_url: str, allowed_host: str,
+                  page_size: int = None, max_pages: int = None) -> list:
+    """
+    Page through a search endpoint and collect every article record
+
+    Args:
+        session: requests session
+        endpoint: Endpoint to page through
+        category: Category slug, used when a result has no category
+        page_url: Listing page URL, for resolving relative links
+        allowed_host: Text that must appear in article URLs
+        page_size: Results per request to ask for (defaults to config.LISTING_API_PAGE_SIZE)
+        max_pages: Safety limit on requests (defaults to config.LISTING_API_MAX_PAGES)
+
+    Returns:
+        list: Article dictionaries in listing order
+
+    Raises:
+        requests.RequestException or ValueError if the endpoint does not answer with JSON
+    """
+    pager = ListingPager(endpoint, category, page_url, allowed_host, page_size, max_pages)
+
+    while True:
+        request_url = pager.next_url()
+        if request_url is None:
+            break
+        with metrics.span("scraper_listing_api_request"):
+            response = session.get(request_url, timeout=15)
+            response.raise_for_status()
+            payload = response.json()
+        snapshots.record(snapshots.LISTING_API, request_url, response.text, category, position=pager.pages)
+        metrics.increment("scraper_listing_api_pages_total")
+        pager.add(payload)
+
+    return pager.articles()
+
+def scrape_listing(driver, category: str, listing_url: str, tile_selector: str, load_more_xpath: str,
+                   session=None, allowed_host: str = "freshproduce.com"):
+    """
+    Category listing via the search API, discovering the endpoint if needed
+
+    Args:
+        driver: Selenium WebDriver instance, used only when no endpoint is saved yet
+        category: Category slug
+        listing_url: Category listing page
+        tile_selector: CSS selector of the listing tiles
+        load_more_xpath: XPath of the "Load More" button
+        session: Optional requests session (a temporary one is used otherwise)
+        allowed_host: Text that must appear in article URLs
+
+    Returns:
+        list: Article dictionaries, or None if the API could not be used
+    """
+    own_session = session is None
+    if own_session:
+        session = requests.Session()
+        session.headers.update(config.HEADERS)
+
+    try:
+        endpoint = load_endpoints().get(category)
+        if endpoint is not None:
+            try:
+                articles = fetch_listing(session, endpoint, category, listing_url, allowed_host)
+                if articles:
+                    return articles
+            except (requests.RequestException, ValueError) as e:
+                print(f"Saved listing API endpoint failed for {category}: {e}")
+            print("Rediscovering the listing API endpoint")
+
+        endpoint = discover_endpoint(driver, listing_url, tile_selector, load_more_xpath)
+        if endpoint is None:
+            return None
+
+        try:
+            articles = fetch_listing(session, endpoint, category, listing_url, allowed_host)
+        except (requests.RequestException, ValueError) as e:
+            print(f"Listing API request failed for {category}: {e}")
+            return None
+        if articles:
+            save_endpoint(category, endpoint)
+        return articles or None
+
+    finally:
+        if own_session:
+            session.close()
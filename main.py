@@ -0,0 +1,288 @@
+"""
+Command-line entry point for the scraper, the analyzer and their helpers.
+
+    python main.py scrape [--engine async] [--full]
+    python main.py analyze [--input ...] [--fake-model]
+    python main.py pipeline
+    python main.py reextract [--output ...] [--workers N]
+    python main.py clean-text [--input ...] [--refit]
+    python main.py status [--json]
+    python main.py cache-stats [--evict]
+    python main.py bench [benchmark options]
+    python main.py worker {serve,health,stop} [worker options]
+
+Only the standard library and config are imported at startup. pandas,
+Selenium and the Vertex AI SDK load inside the subcommand that needs them,
+so `status`, `cache-stats` and `--help` answer in a fraction of a second
+for schedulers and health checks.
+"""
+import argparse
+import glob
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import config
+
+def _cmd_scrape(args) -> int:
+    if args.engine == "async":
+        from async_crawler import main_async_crawler
+        main_async_crawler(base_url=args.base_url, output_file=args.output)
+        return 0
+
+    from scrapper import main_selenium_scraper
+    main_selenium_scraper(
+        pool_size=args.pool_size, fetch_mode=args.fetch_mode,
+        incremental=False if args.full else None, base_url=args.base_url, output_file=args.output
+    )
+    return 0
+
+def _cmd_analyze(args) -> int:
+    from analysis import ArticleAnalyzer
+    from analysis_cache import AnalysisCache
+
+    model = None
+    if args.fake_model:
+        from fake_model import FakeGenerativeModel
+        model = FakeGenerativeModel()
+
+    cache = AnalysisCache(config.ANALYSIS_CACHE_PATH)
+    try:
+        analyzer = ArticleAnalyzer(model=model, cache=cache)
+        analyzer.process_csv(
+            args.input, args.output, concurrency=args.concurrency,
+            incremental=False if args.full else None,
+            batch_token_budget=args.batch_token_budget,
+            dedup=False if args.no_dedup else None
+        )
+    finally:
+        cache.close()
+    return 0
+
+def _cmd_pipeline(args) -> int:
+    from pipeline import run_pipeline
+    run_pipeline(queue_size=args.queue_size, analysis_workers=args.workers)
+    return 0
+
+def _cmd_reextract(args) -> int:
+    if not os.path.exists(os.path.join(config.SNAPSHOT_DIR, "manifest.sqlite")):
+        print(f"No snapshots in {config.SNAPSHOT_DIR}; run a scrape with SNAPSHOTS_ENABLED first")
+        return 1
+
+    from snapshots import SnapshotStore, reextract
+    store = SnapshotStore()
+    try:
+        print(json.dumps(store.stats(), indent=2))
+        articles = reextract(store, workers=args.workers)
+    finally:
+        store.close()
+
+    if not articles:
+        print("No listing snapshots to re-extract")
+        return 1
+
+    from scrapper import save_scraped_articles
+    save_scraped_articles(articles, args.output)
+    return 0
+
+def _cmd_clean_text(args) -> int:
+    from storage import find_table, read_table, write_table
+    from text_cleaning import add_clean_text
+
+    path = args.input or find_table(config.SCRAPED_DATA_PATH)
+    if not os.path.exists(path):
+        print(f"No scraped articles at {path}")
+        return 1
+
+    df = read_table(path, dtype=str, keep_default_na=False)
+    articles = df.to_dict("records")
+    try:
+        remover = add_clean_text(articles, refit=args.refit)
+    except ValueError as e:
+        print(f"{e}; rescrape with TEXT_CLEANING on to store them, the saved model is unchanged")
+        return 1
+    df['CleanArticleText'] = [article['CleanArticleText'] for article in articles]
+    write_table(df, path)
+    print(f"Cleaned {len(df)} articles in {path} with {len(remover.boilerplate)} boilerplate lines")
+    return 0
+
+def _file_info(path: str) -> dict:
+    stat = os.stat(path)
+    return {"path": path, "size_bytes": stat.st_size, "age_hours": round((time.time() - stat.st_mtime) / 3600, 2)}
+
+def _count_lines(path: str) -> int:
+    with open(path, "rb") as f:
+        return sum(1 for _ in f)
+
+def _sqlite_count(path: str, table: str):
+    """Row count of a table, opened read-only so a status check never creates the database"""
+    if not os.path.exists(path):
+        return None
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        return conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    except sqlite3.Error:
+        return None
+    finally:
+        conn.close()
+
+def collect_status() -> dict:
+    """
+    Newest output tables, unfinished checkpoint journals, index sizes and last run metrics
+
+    Reads only file metadata, journal line counts and SQLite counts, so it is
+    cheap enough for a health check.
+    """
+    tables = {}
+    for name, base in (("scraped", config.SCRAPED_DATA_PATH), ("analysis", config.ANALYSIS_DATA_PATH)):
+        candidates = [base + ext for ext in (".parquet", ".csv") if os.path.exists(base + ext)]
+        newest = max(candidates, key=os.path.getmtime) if candidates else None
+        tables[name] = _file_info(newest) if newest else None
+
+    journals = [
+        {**_file_info(path), "entries": _count_lines(path)}
+        for path in sorted(glob.glob(os.path.join("csv_temp", "*.jsonl")))
+    ]
+
+    runs = {}
+    for path in sorted(glob.glob(os.path.join(config.METRICS_DIR, "*_report.json"))):
+        try:
+            with open(path, encoding="utf-8") as f:
+                report = json.load(f)
+        except (OSError, ValueError):
+            continue
+        runs[report.get("stage", os.path.basename(path))] = {
+            "started_at": time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(report["started_at"])),
+            "duration_seconds": report.get("duration_seconds"),
+        }
+
+    return {
+        "tables": tables,
+        "unfinished_journals": journals,
+        "crawl_index_entries": _sqlite_count(config.CRAWL_INDEX_PATH, "crawl_index"),
+        "analysis_cache_entries": _sqlite_count(config.ANALYSIS_CACHE_PATH, "analysis_cache"),
+        "snapshots": _sqlite_count(os.path.join(config.SNAPSHOT_DIR, "manifest.sqlite"), "snapshots"),
+        "last_runs": runs,
+    }
+
+def _cmd_status(args) -> int:
+    status = collect_status()
+    if args.json:
+        print(json.dumps(status, indent=2))
+        return 0
+
+    for name, table in status["tables"].items():
+        if table is None:
+            print(f"{name:<10} no output yet")
+        else:
+            print(f"{name:<10} {table['path']} ({table['size_bytes'] / 2 ** 20:.1f} MB, {table['age_hours']} h old)")
+    for journal in status["unfinished_journals"]:
+        print(f"journal    {journal['path']}: {journal['entries']} items done, run not finished")
+    print(f"crawl index: {status['crawl_index_entries'] or 0} pages, "
+          f"analysis cache: {status['analysis_cache_entries'] or 0} results, "
+          f"snapshots: {status['snapshots'] or 0} pages")
+    for stage, run in status["last_runs"].items():
+        print(f"last {stage} run: {run['started_at']}, {run['duration_seconds']} s")
+    return 0
+
+def _cmd_cache_stats(args) -> int:
+    if not os.path.exists(config.ANALYSIS_CACHE_PATH):
+        print(f"No analysis cache at {config.ANALYSIS_CACHE_PATH}")
+        return 0
+
+    from analysis_cache import AnalysisCache
+    cache = AnalysisCache(config.ANALYSIS_CACHE_PATH)
+    try:
+        if args.evict:
+            print(f"Evicted {cache.evict()} entries")
+        stats = cache.stats()
+    finally:
+        cache.close()
+
+    stats.pop("hits", None)
+    stats.pop("misses", None)
+    stats["crawl_index_entries"] = _sqlite_count(config.CRAWL_INDEX_PATH, "crawl_index")
+    print(json.dumps(stats, indent=2))
+    return 0
+
+def _cmd_bench(args) -> int:
+    from benchmarks import run
+    sys.argv = ["benchmarks.run"] + args.passthrough
+    run.main()
+    return 0
+
+def _cmd_worker(args) -> int:
+    import worker
+    return worker.main(args.passthrough)
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="main.py", description="freshproduce.com scraper and article analyzer")
+    subcommands = parser.add_subparsers(dest="command", required=True)
+
+    scrape = subcommands.add_parser("scrape", help="Scrape every category into the scraped-articles table")
+    scrape.add_argument("--engine", choices=["selenium", "async"], default="selenium")
+    scrape.add_argument("--pool-size", type=int, help="WebDriver sessions for article bodies")
+    scrape.add_argument("--fetch-mode", choices=["http", "selenium"], help="How article bodies are fetched")
+    scrape.add_argument("--full", action="store_true", help="Ignore the crawl index and fetch every article")
+    scrape.add_argument("--base-url", help="Resources root to scrape (defaults to config.BASE_URL)")
+    scrape.add_argument("--output", help="Output table path")
+    scrape.set_defaults(handler=_cmd_scrape)
+
+    analyze = subcommands.add_parser("analyze", help="Summarize scraped articles with Gemini")
+    analyze.add_argument("--input", help="Scraped articles table (defaults to the newest one)")
+    analyze.add_argument("--output", help="Analysis table path")
+    analyze.add_argument("--concurrency", type=int, help="Parallel model calls")
+    analyze.add_argument("--batch-token-budget", type=int, help="Pack articles per request up to this many tokens")
+    analyze.add_argument("--full", action="store_true", help="Re-analyze articles with reusable results")
+    analyze.add_argument("--no-dedup", action="store_true", help="Analyze near-duplicate articles separately")
+    analyze.add_argument("--fake-model", action="store_true", help="Use the offline fake model (dry run)")
+    analyze.set_defaults(handler=_cmd_analyze)
+
+    pipeline = subcommands.add_parser("pipeline", help="Scrape and analyze in one streaming pass")
+    pipeline.add_argument("--queue-size", type=int, help="Articles buffered between the stages")
+    pipeline.add_argument("--workers", type=int, help="Analysis workers")
+    pipeline.set_defaults(handler=_cmd_pipeline)
+
+    reextract = subcommands.add_parser("reextract",
+                                       help="Rebuild the scraped-articles table from saved HTML snapshots, offline")
+    reextract.add_argument("--output", help="Output table path (defaults to the scraped-articles table)")
+    reextract.add_argument("--workers", type=int, help="Parser processes")
+    reextract.set_defaults(handler=_cmd_reextract)
+
+    clean_text = subcommands.add_parser("clean-text", help="Fill CleanArticleText with the saved boilerplate model")
+    clean_text.add_argument("--input", help="Scraped articles table (defaults to the newest one)")
+    clean_text.add_argument("--refit", action="store_true",
+                            help="Learn the boilerplate again from this table and reclean every article")
+    clean_text.set_defaults(handler=_cmd_clean_text)
+
+    status = subcommands.add_parser("status", help="Show outputs, unfinished runs and index sizes")
+    status.add_argument("--json", action="store_true", help="Print machine-readable JSON")
+    status.set_defaults(handler=_cmd_status)
+
+    cache_stats = subcommands.add_parser("cache-stats", help="Show analysis cache statistics")
+    cache_stats.add_argument("--evict", action="store_true", help="Drop expired and excess entries first")
+    cache_stats.set_defaults(handler=_cmd_cache_stats)
+
+    bench = subcommands.add_parser("bench", help="Run the offline benchmark suite (other options are passed through)",
+                                   add_help=False)
+    bench.set_defaults(handler=_cmd_bench)
+
+    worker = subcommands.add_parser("worker", help="Run or query the warm worker daemon (options are passed through)",
+                                    add_help=False)
+    worker.set_defaults(handler=_cmd_worker)
+
+    return parser
+
+def main(argv: list = None) -> int:
+    parser = build_parser()
+    args, extra = parser.parse_known_args(argv)
+    # Only the benchmark runner and the worker take options of their own
+    if extra and args.command not in ("bench", "worker"):
+        parser.error(f"unrecognized arguments: {' '.join(extra)}")
+    args.passthrough = extra
+    return args.handler(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,210 @@
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+import config
+
+# Histogram bucket upper bounds, in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+# Prefix of every exported Prometheus metric name
+PROMETHEUS_PREFIX = "freshproduce_"
+
+def _label_key(labels: dict) -> tuple:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+def _format_labels(label_key: tuple, extra: dict = None) -> str:
+    pairs = list(label_key) + sorted((extra or {}).items())
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+class Histogram:
+    """
+    Fixed-bucket histogram with count, sum and max; memory does not grow with observations
+    """
+
+    def __init__(self, buckets: tuple = DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float):
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+        for position, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[position] += 1
+                return
+        self.counts[-1] += 1
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile by linear interpolation within its bucket
+        """
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        lower = 0.0
+        for position, count in enumerate(self.counts):
+            upper = self.buckets[position] if position < len(self.buckets) else self.max
+            if count and seen + count >= rank:
+                return min(lower + (upper - lower) * (rank - seen) / count, self.max)
+            seen += count
+            lower = upper
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "mean": round(self.sum / self.count, 6) if self.count else 0.0,
+            "p50": round(self.quantile(0.50), 6),
+            "p95": round(self.quantile(0.95), 6),
+            "max": round(self.max, 6),
+        }
+
+class MetricsRegistry:
+    """
+    Thread-safe counters and timing histograms for one process.
+
+    A command-line run is one process, so its report covers that run. A
+    long-lived process such as the warm worker keeps counting across the
+    jobs it serves; library entry points never reset the shared registry.
+
+    Code on the hot path opens spans (`with registry.span("name"):`) and
+    bumps counters; nothing is written until export() produces a JSON run
+    report and a Prometheus text-format file.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Forget everything recorded so far (tests and benchmarks; runs do not call it)"""
+        with self.lock:
+            self.counters = {}
+            self.histograms = {}
+            self.started_at = time.time()
+
+    def increment(self, name: str, value: float = 1, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, value: float, **labels):
+        key = (name, _label_key(labels))
+        with self.lock:
+            histogram = self.histograms.get(key)
+            if histogram is None:
+                histogram = self.histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextmanager
+    def span(self, name: str, **labels):
+        """
+        Time a block into the `<name>_seconds` histogram
+
+        Blocks that raise are also counted in `<name>_errors_total`.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        except BaseException:
+            self.increment(f"{name}_errors_total", **labels)
+            raise
+        finally:
+            self.observe(f"{name}_seconds", time.perf_counter() - start, **labels)
+
+    def report(self) -> dict:
+        """
+        Snapshot of every counter and histogram as plain data
+        """
+        with self.lock:
+            counters = [
+                {"name": name, "labels": dict(label_key), "value": value}
+                for (name, label_key), value in sorted(self.counters.items())
+            ]
+            histograms = [
+                {"name": name, "labels": dict(label_key), **histogram.to_dict()}
+                for (name, label_key), histogram in sorted(self.histograms.items())
+            ]
+            started_at = self.started_at
+
+        return {
+            "started_at": started_at,
+            "duration_seconds": round(time.time() - started_at, 3),
+            "counters": counters,
+            "histograms": histograms,
+        }
+
+    def to_prometheus(self) -> str:
+        """
+        Render every metric in the Prometheus text exposition format
+        """
+        lines = []
+        with self.lock:
+            typed = set()
+            for (name, label_key), value in sorted(self.counters.items()):
+                metric = PROMETHEUS_PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{_format_labels(label_key)} {value}")
+
+            for (name, label_key), histogram in sorted(self.histograms.items()):
+                metric = PROMETHEUS_PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                cumulative = 0
+                for bound, count in zip(histogram.buckets, histogram.counts):
+                    cumulative += count
+                    lines.append(f"{metric}_bucket{_format_labels(label_key, {'le': str(bound)})} {cumulative}")
+                lines.append(f"{metric}_bucket{_format_labels(label_key, {'le': '+Inf'})} {histogram.count}")
+                lines.append(f"{metric}_sum{_format_labels(label_key)} {histogram.sum}")
+                lines.append(f"{metric}_count{_format_labels(label_key)} {histogram.count}")
+
+        return "\n".join(lines) + "\n"
+
+    def export(self, stage: str, directory: str = None) -> tuple:
+        """
+        Write `<stage>_report.json` and `<stage>.prom` to the metrics directory
+
+        Args:
+            stage: Run name, e.g. "scraper" or "analysis"
+            directory: Output directory (defaults to config.METRICS_DIR)
+
+        Returns:
+            Tuple of (JSON report path, Prometheus file path)
+        """
+        directory = directory or config.METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+
+        json_path = os.path.join(directory, f"{stage}_report.json")
+        with open(json_path, "w", encoding="utf-8") as f:
+            json.dump({"stage": stage, **self.report()}, f, indent=2)
+
+        prom_path = os.path.join(directory, f"{stage}.prom")
+        # Written aside and renamed, so a node_exporter textfile collector never reads half a file
+        with open(prom_path + ".tmp", "w", encoding="utf-8") as f:
+            f.write(self.to_prometheus())
+        os.replace(prom_path + ".tmp", prom_path)
+
+        return json_path, prom_path
+
+# Process-wide registry shared by the scraper, the analyzer and the pipeline
+REGISTRY = MetricsRegistry()
+span = REGISTRY.span
+increment = REGISTRY.increment
+observe = REGISTRY.observe
@@ -0,0 +1,179 @@
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+import re
+
+# Selectors for article content (in order of preference)
+CONTENT_SELECTORS = [
+    "main article",  # Most semantic
+    "article .content",
+    "main .content",
+    ".article-content",
+    ".post-content",
+    ".entry-content",
+    "main",
+    ".main-content",
+    "article"
+]
+
+# Minimum number of characters for a content block to count as the article
+MIN_CONTENT_LENGTH = 100
+
+# Tags whose contents are never visible text
+_INVISIBLE_TAGS = ["script", "style", "noscript", "template", "svg", "iframe"]
+
+# Tags rendered on their own line by the browser
+_BLOCK_TAGS = [
+    "p", "div", "section", "article", "main", "header", "footer", "nav", "aside",
+    "h1", "h2", "h3", "h4", "h5", "h6", "ul", "ol", "li", "table", "tr",
+    "blockquote", "figure", "figcaption", "form", "pre", "hr", "dl", "dt", "dd"
+]
+
+def make_soup(html):
+    """
+    Parse HTML into a BeautifulSoup tree prepared for text extraction.
+
+    Invisible elements are dropped and block elements are padded with newlines,
+    so get_text() on any node gives roughly what Selenium's `.text` returns.
+
+    Args:
+        html (str): Raw page HTML
+
+    Returns:
+        BeautifulSoup: Parsed document
+    """
+    soup = BeautifulSoup(html, "lxml")
+
+    for tag in soup.find_all(_INVISIBLE_TAGS):
+        tag.decompose()
+
+    for br in soup.find_all("br"):
+        br.replace_with("\n")
+
+    for tag in soup.find_all(_BLOCK_TAGS):
+        tag.insert_before("\n")
+        tag.insert_after("\n")
+
+    return soup
+
+def element_text(element):
+    """
+    Get the visible text of a parsed element, one line per block.
+
+    Args:
+        element: BeautifulSoup element from a tree built by make_soup()
+
+    Returns:
+        str: Text with collapsed whitespace and no empty lines
+    """
+    lines = (re.sub(r"\s+", " ", line).strip() for line in element.get_text().split("\n"))
+    return "\n".join(line for line in lines if line)
+
+def extract_article_text(html, body_fallback=False):
+    """
+    Extract the article body from static HTML.
+
+    Uses the same selector priority and length threshold as the Selenium
+    scraper. By default there is no body-text fallback: when no selector
+    yields substantial content an empty string is returned, so callers can
+    decide to render the page in a real browser instead.
+
+    Args:
+        html (str): Raw page HTML
+        body_fallback (bool): Return the whole body text as a last resort
+
+    Returns:
+        tuple: (content, selector) or ("", None) if nothing usable was found
+    """
+    soup = make_soup(html)
+
+    for selector in CONTENT_SELECTORS:
+        element = soup.select_one(selector)
+        if element is None:
+            continue
+
+        content = element_text(element)
+        if len(content) > MIN_CONTENT_LENGTH:
+            return content, selector
+
+    if body_fallback and soup.body is not None:
+        content = element_text(soup.body)
+        if content:
+            return content, "body"
+
+    return "", None
+
+def search_stats_text(html):
+    """
+    Text of a listing's "Showing 1-12 of 87 results" line, or "" if the page has none
+
+    Args:
+        html (str): Raw listing page HTML
+
+    Returns:
+        str: Text for waits.parse_search_stats()
+    """
+    element = BeautifulSoup(html, "lxml").select_one("div.search-stats p")
+    return _field_text(element) if element is not None else ""
+
+def _field_text(element):
+    """Single-line text of a small element such as a tile title"""
+    return re.sub(r"\s+", " ", element.get_text(" ")).strip()
+
+def parse_listing_tiles(html, category, page_url, allowed_host="freshproduce.com"):
+    """
+    Extract article records from a category listing page.
+
+    Mirrors the tile selectors used by scrape_category_with_selenium: only
+    `genericpage` and `resourcedetailpage` tiles inside `div.result-panel`
+    are kept, tiles without a title or a valid URL are skipped and
+    duplicate URLs keep their first occurrence.
+
+    Args:
+        html (str): Raw listing page HTML
+        category (str): Category slug, used when a tile has no eyebrow
+        page_url (str): URL the page was loaded from, for resolving links
+        allowed_host (str): Text that must appear in article URLs
+
+    Returns:
+        list: Article dictionaries in listing order
+    """
+    soup = BeautifulSoup(html, "lxml")
+    container = soup.select_one("div.result-panel")
+    if container is None:
+        return []
+
+    unique_articles = {}
+
+    for tile in container.select("div.tile"):
+        class_list = " ".join(tile.get("class", []))
+        if "genericpage" not in class_list and "resourcedetailpage" not in class_list:
+            continue
+
+        title_elem = tile.select_one("p.title")
+        title = _field_text(title_elem) if title_elem is not None else ""
+        if not title:
+            continue
+
+        link_elem = tile.select_one("div.cta-area a.score-button")
+        href = link_elem.get("href") if link_elem is not None else None
+        url = urljoin(page_url, href) if href else ""
+        if not url or allowed_host not in url:
+            continue
+
+        if url in unique_articles:
+            continue
+
+        category_elem = tile.select_one("p.eyebrow")
+        desc_elem = tile.select_one("p.description")
+        img_elem = tile.select_one("div.image-wrapper img")
+
+        unique_articles[url] = {
+            'Title': title,
+            'URL': url,
+            'Category': _field_text(category_elem) if category_elem is not None else category.replace('-', ' ').title(),
+            'Description': _field_text(desc_elem) if desc_elem is not None else "",
+            'ImageURL': urljoin(page_url, img_elem.get("src", "")) if img_elem is not None and img_elem.get("src") else "",
+            'ImageAlt': img_elem.get("alt", "") if img_elem is not None else "",
+        }
+
+    return list(unique_articles.values())
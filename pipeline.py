@@ -0,0 +1,224 @@
+import csv
+import logging
+import os
+import queue
+import threading
+import time
+
+import config
+import metrics
+import scrapper
+from analysis import ArticleAnalyzer, RateLimiter
+from analysis_cache import AnalysisCache
+from crawl_index import CrawlIndex
+from storage import table_path
+from text_cleaning import BoilerplateRemover
+
+logger = logging.getLogger(__name__)
+
+SCRAPED_COLUMNS = ['Title', 'URL', 'Category', 'Description', 'ImageURL', 'ImageAlt', 'FullArticleText',
+                   'CleanArticleText']
+ANALYSIS_COLUMNS = SCRAPED_COLUMNS + ['Summary', 'Topics', 'ProcessingStatus']
+
+# Marks the end of the article stream for analysis workers
+_DONE = object()
+
+class IncrementalCsvWriter:
+    """
+    Thread-safe CSV writer that appends and flushes one row at a time.
+
+    Rows go to `<path>.partial`, which replaces `path` only when the writer
+    is committed, so an interrupted run never clobbers the previous output.
+    """
+
+    def __init__(self, path: str, columns: list, **csv_options):
+        self.path = path
+        self.partial_path = path + ".partial"
+        self.lock = threading.Lock()
+        self.rows = 0
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self.file = open(self.partial_path, "w", newline="", encoding="utf-8")
+        self.writer = csv.DictWriter(self.file, fieldnames=columns, extrasaction="ignore", **csv_options)
+        self.writer.writeheader()
+
+    def write(self, row: dict):
+        with self.lock:
+            self.writer.writerow(row)
+            self.file.flush()
+            self.rows += 1
+
+    def commit(self):
+        """Close the file and move it into place"""
+        with self.lock:
+            self.file.close()
+            os.replace(self.partial_path, self.path)
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self.file.close()
+
+def clean_record(article: dict) -> dict:
+    """
+    Apply the scraper's CSV cleaning (no newlines outside line_columns(), trimmed) to one article
+    """
+    record = {}
+    multiline = scrapper.line_columns()
+    for col in SCRAPED_COLUMNS:
+        value = article.get(col)
+        value = "" if value is None else str(value)
+        if col in multiline:
+            record[col] = scrapper.keep_lines(value)
+        else:
+            record[col] = value.replace('\n', ' ').replace('\r', ' ').strip()
+    return record
+
+def run_pipeline(categories: list = None, queue_size: int = None, analysis_workers: int = None,
+                 scraped_output: str = None, analysis_output: str = None, analyzer=None):
+    """
+    Scrape and analyze in one streaming pass.
+
+    The scraper pushes each article into a bounded queue as soon as its body
+    is fetched; analysis workers consume the queue while scraping continues.
+    When the queue is full the scraper blocks, so memory is bounded by the
+    queue size rather than the corpus. Both CSVs are written row by row,
+    in completion order.
+
+    Args:
+        categories: Category slugs to scrape (defaults to config.CATEGORIES)
+        queue_size: Articles buffered between the stages (defaults to config.PIPELINE_QUEUE_SIZE)
+        analysis_workers: Concurrent analysis workers (defaults to config.ANALYSIS_CONCURRENCY)
+        scraped_output: Scraped articles CSV (defaults to data/scraped_freshproduce_data.csv;
+            rows are streamed, so the pipeline always writes CSV)
+        analysis_output: Analysis CSV (defaults to data/analysis_summary.csv)
+        analyzer: ArticleAnalyzer to use; one with the result cache is created if omitted
+
+    Returns:
+        Tuple of (articles scraped, articles analyzed)
+    """
+    categories = categories or config.CATEGORIES
+    queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+    analysis_workers = analysis_workers or config.ANALYSIS_CONCURRENCY
+    scraped_output = scraped_output or table_path(config.SCRAPED_DATA_PATH, "csv")
+    analysis_output = analysis_output or table_path(config.ANALYSIS_DATA_PATH, "csv")
+
+    cache = None
+    if analyzer is None:
+        cache = AnalysisCache(config.ANALYSIS_CACHE_PATH)
+        analyzer = ArticleAnalyzer(cache=cache)
+    analyzer.rate_limiter = RateLimiter(config.GEMINI_REQUESTS_PER_MINUTE, config.GEMINI_TOKENS_PER_MINUTE)
+
+    articles = queue.Queue(maxsize=queue_size)
+    scraped_writer = IncrementalCsvWriter(scraped_output, SCRAPED_COLUMNS, quoting=csv.QUOTE_ALL)
+    analysis_writer = IncrementalCsvWriter(analysis_output, ANALYSIS_COLUMNS)
+    seen_urls = set()
+    seen_lock = threading.Lock()
+    errors = []
+    
+    # Boilerplate learned by the last batch scrape; the stream never sees the whole corpus
+    remover = BoilerplateRemover.load() if config.TEXT_CLEANING else None
+
+    def on_article(article):
+        if remover is not None:
+            article['CleanArticleText'] = remover.clean(
+                article.get('FullArticleText'), article.get('Title'), article.get('Category')
+            )
+        record = clean_record(article)
+        with seen_lock:
+            if record['URL'] in seen_urls:
+                return
+            seen_urls.add(record['URL'])
+        scraped_writer.write(record)
+
+        # Blocks while the analysis workers are behind
+        with metrics.span("pipeline_queue_put"):
+            articles.put(record)
+
+        # The queued copy is all the pipeline needs; release the body
+        article['FullArticleText'] = None
+        article['CleanArticleText'] = None
+
+    def produce():
+        session = None
+        index = None
+        driver = None
+        try:
+            # Set up inside the try: a browser that fails to start must still release the workers
+            session = scrapper.setup_http_session() if config.ARTICLE_FETCH_MODE == "http" else None
+            index = CrawlIndex() if config.INCREMENTAL_CRAWL else None
+            driver = scrapper.setup_driver()
+            for category in categories:
+                logger.info(f"Scraping category {category}")
+                scrapper.scrape_category_with_selenium(
+                    driver, category, pool_size=config.DRIVER_POOL_SIZE,
+                    session=session, index=index, on_article=on_article
+                )
+        except Exception as e:
+            logger.error(f"Scraper failed: {e}")
+            errors.append(e)
+        finally:
+            if driver is not None:
+                driver.quit()
+            if session is not None:
+                session.close()
+            if index is not None:
+                index.close()
+            for _ in range(analysis_workers):
+                articles.put(_DONE)
+
+    analyzed = [0]
+    analyzed_lock = threading.Lock()
+
+    def consume():
+        while True:
+            record = articles.get()
+            if record is _DONE:
+                break
+            with analyzed_lock:
+                analyzed[0] += 1
+                number = analyzed[0]
+            try:
+                summary, topics, status = analyzer.analyze_row(
+                    number - 1, record['CleanArticleText'] or record['FullArticleText']
+                )
+                analysis_writer.write({**record, 'Summary': summary, 'Topics': topics, 'ProcessingStatus': status})
+                logger.debug(f"Analyzed article {number} ({articles.qsize()} queued): {status}")
+            except Exception as e:
+                # Keep draining the queue so the scraper never blocks forever
+                logger.error(f"Analysis worker failed on {record['URL']}: {e}")
+                errors.append(e)
+
+    start = time.monotonic()
+    threads = [threading.Thread(target=produce, name="scraper")]
+    threads += [threading.Thread(target=consume, name=f"analyzer-{n}") for n in range(analysis_workers)]
+
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        analyzer.rate_limiter = None
+        if cache is not None:
+            cache.close()
+        json_path, prom_path = metrics.REGISTRY.export("pipeline")
+        logger.info(f"Metrics written to {json_path} and {prom_path}")
+
+    if errors:
+        scraped_writer.close()
+        analysis_writer.close()
+        raise errors[0]
+
+    scraped_writer.commit()
+    analysis_writer.commit()
+    for category in categories:
+        scrapper.progress_journal(category).clear()
+
+    logger.info(f"Pipeline complete in {time.monotonic() - start:.1f}s: "
+                f"{scraped_writer.rows} scraped -> {scraped_output}, "
+                f"{analysis_writer.rows} analyzed -> {analysis_output}")
+    return scraped_writer.rows, analysis_writer.rows
+
+if __name__ == "__main__":
+    run_pipeline()
@@ -4,14 +4,55 @@ from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.common.exceptions import TimeoutException
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from urllib.parse import urlparse
+import numpy as np
 import pandas as pd
+import requests
+import queue
+import threading
 import time
 import os
 
-def setup_driver():
-    """Setup Chrome driver with appropriate options"""
+import config
+import listing_api
+import metrics
+import snapshots
+from checkpoint import CheckpointJournal
+from crawl_index import CrawlIndex
+from dom_extract import article_content, tile_data
+from parsing import CONTENT_SELECTORS, MIN_CONTENT_LENGTH, extract_article_text
+from text_cleaning import add_clean_text
+from storage import find_table, read_table, table_path, write_table
+from waits import (install_network_tracker, parse_search_stats, wait_for_count_change, wait_for_dom_quiet,
+                   wait_for_elements)
+
+LOAD_MORE_XPATH = "//button[contains(., 'Load More') or contains(., 'Load more') or contains(., 'LOAD MORE')]"
+TILE_SELECTOR = "div.result-panel div.tile"
+
+def _debug(message):
+    """Per-tile and per-article progress; printed only with config.SCRAPER_VERBOSE"""
+    if config.SCRAPER_VERBOSE:
+        print(message)
+
+def setup_driver(lean=None):
+    """
+    Setup Chrome driver with appropriate options
+    
+    Args:
+        lean (bool): Headless profile with an eager page-load strategy, no
+            extensions and images, fonts, media and analytics blocked
+            (defaults to config.CHROME_LEAN_PROFILE)
+    """
+    lean = config.CHROME_LEAN_PROFILE if lean is None else lean
     chrome_options = Options()
     
+    # The listing API mode finds the search endpoint in the performance log
+    if config.LISTING_MODE == "api":
+        chrome_options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+    
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
     chrome_options.add_argument("--disable-gpu")
@@ -20,10 +61,84 @@ def setup_driver():
     # Add user agent
     chrome_options.add_argument("--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36")
     
+    if lean:
+        # Only text and attributes are read, so nothing needs to be painted or decoded
+        chrome_options.add_argument("--headless=new")
+        chrome_options.add_argument("--disable-extensions")
+        chrome_options.add_argument("--disable-background-networking")
+        chrome_options.add_argument("--disable-component-update")
+        chrome_options.add_argument("--mute-audio")
+        chrome_options.add_argument("--blink-settings=imagesEnabled=false")
+        chrome_options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+        chrome_options.page_load_strategy = config.CHROME_PAGE_LOAD_STRATEGY
+    
     driver = webdriver.Chrome(options=chrome_options)
+    
+    if lean and config.CHROME_BLOCKED_URLS:
+        # Image src attributes are still in the DOM; only the downloads are skipped
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": config.CHROME_BLOCKED_URLS})
+        except Exception as e:
+            print(f"Could not block resources: {e}")
+    
     return driver
 
-def scrape_category_with_selenium(driver, category):
+class PoliteSession(requests.Session):
+    """
+    requests session that starts requests to the same host at least `delay` seconds apart.
+    
+    The spacing is shared by every thread using the session, so a pool of
+    workers is as polite to the site as a single one.
+    """
+    
+    def __init__(self, delay=0):
+        super().__init__()
+        self.delay = delay
+        self._slot_lock = threading.Lock()
+        self._next_slot = {}
+    
+    def request(self, method, url, *args, **kwargs):
+        if self.delay > 0:
+            host = urlparse(url).netloc
+            with self._slot_lock:
+                now = time.monotonic()
+                slot = max(now, self._next_slot.get(host, 0.0))
+                self._next_slot[host] = slot + self.delay
+            if slot > now:
+                time.sleep(slot - now)
+        return super().request(method, url, *args, **kwargs)
+
+def setup_http_session(pool_size=None, delay=None):
+    """
+    Setup a pooled HTTP session for fetching static article pages
+    
+    Args:
+        pool_size (int): Connections kept per host (defaults to config.DRIVER_POOL_SIZE)
+        delay (float): Politeness delay between requests to a host (defaults to config.DELAY_BETWEEN_REQUESTS)
+    
+    Returns:
+        PoliteSession: Session with retries on transient errors
+    """
+    pool_size = pool_size or config.DRIVER_POOL_SIZE
+    delay = config.DELAY_BETWEEN_REQUESTS if delay is None else delay
+    
+    retry = Retry(
+        total=config.MAX_RETRIES,
+        backoff_factor=config.HTTP_RETRY_BACKOFF,
+        status_forcelist=[429, 500, 502, 503, 504],
+        allowed_methods=["GET", "HEAD"]
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    
+    session = PoliteSession(delay)
+    session.headers.update(config.HEADERS)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def scrape_category_with_selenium(driver, category, pool_size=1, session=None, index=None, on_article=None,
+                                  base_url=None, listing_mode=None, driver_factory=None):
     """
     Scrape articles from a category page using Selenium.
     Optimized for freshproduce.com HTML structure.
@@ -31,107 +146,121 @@ def scrape_category_with_selenium(driver, category):
     Args:
         driver: Selenium WebDriver instance
         category (str): Category name
+        pool_size (int): Number of WebDriver sessions used to fetch article bodies
+        session: Optional requests session for the HTTP-only fast path
+        index: Optional CrawlIndex; unchanged articles are not downloaded again
+        on_article: Optional callback called with each article once its body is ready
+        base_url (str): Resources root, e.g. a local stand-in server (defaults to config.BASE_URL)
+        listing_mode (str): "api" to page through the site's search endpoint, "selenium"
+            to click "Load More" (defaults to config.LISTING_MODE)
+        driver_factory: Optional callable returning a driver for each pool worker
+            (defaults to setup_driver)
     
     Returns:
         list: List of article data dictionaries
     """
-    url = f"https://www.freshproduce.com/resources/{category}/?filteredCategories=Article"
+    base_url = (base_url or config.BASE_URL).rstrip('/')
+    url = f"{base_url}/{category}/?filteredCategories=Article"
+    
+    # Article links must stay on the scraped site
+    host = urlparse(base_url).hostname or ""
+    allowed_host = host[4:] if host.startswith("www.") else host
+    
+    # Re-extraction reads only this crawl's listing snapshots, not older ones
+    snapshots.new_run()
+    
+    if (listing_mode or config.LISTING_MODE) == "api":
+        articles_list = listing_api.scrape_listing(
+            driver, category, url, TILE_SELECTOR, LOAD_MORE_XPATH, session=session, allowed_host=allowed_host
+        )
+        if articles_list:
+            print(f"\nSuccessfully extracted {len(articles_list)} unique articles from {category} via the listing API")
+            fetch_full_articles(driver, articles_list, category, pool_size=pool_size, session=session, index=index,
+                                on_article=on_article, driver_factory=driver_factory)
+            return articles_list
+        print("Listing API unavailable, falling back to 'Load More'")
+    
     print(f"Loading page: {url}")
     
-    driver.get(url)
-    time.sleep(3)
+    with metrics.span("scraper_page_load", page="listing"):
+        driver.get(url)
+    
+    # Tiles may be rendered by script after the document has loaded
+    with metrics.span("scraper_selector_wait", selector="tiles"):
+        tile_count = wait_for_elements(driver, TILE_SELECTOR, config.LISTING_WAIT_TIMEOUT)
+    install_network_tracker(driver)
     
     # Check page stats to understand pagination
+    total_results = None
     try:
         stats_elem = driver.find_element(By.CSS_SELECTOR, "div.search-stats p")
         stats_text = stats_elem.text
         print(f"Page stats: {stats_text}")
         
-        # Parse results info
-        if "of" in stats_text and "results" in stats_text:
-            parts = stats_text.replace("Showing", "").replace("results", "").strip()
-            if "-" in parts and "of" in parts:
-                range_part = parts.split("of")[0].strip()
-                total_part = parts.split("of")[1].strip()
-                
-                if "-" in range_part:
-                    shown_end = int(range_part.split("-")[1].strip())
-                else:
-                    shown_end = int(range_part.strip())
-                    
-                total_results = int(total_part.strip())
-                
-                print(f"Showing up to {shown_end} of {total_results} total results")
-                
-                # Only try Load More if there are more results to load
-                if total_results > shown_end:
-                    print("More results available, will try Load More button")
-                    load_more_needed = True
-                else:
-                    print("All results already visible, no Load More needed")
-                    load_more_needed = False
-            else:
-                load_more_needed = True  # Default to trying if we can't parse
-        else:
-            load_more_needed = True  # Default to trying if no stats found
+        stats = parse_search_stats(stats_text)
+        if stats is not None:
+            shown_end, total_results = stats
+            print(f"Showing up to {shown_end} of {total_results} total results")
             
     except Exception as e:
         print(f"Could not parse page stats: {e}")
-        load_more_needed = True  # Default to trying
     
-    # Try to click Load More buttons if needed
-    if load_more_needed:
+    # Click Load More until every result is on the page; without stats, until the button disappears
+    if total_results is None or tile_count < total_results:
+        print("More results available, will try Load More button")
         load_more_attempts = 0
-        max_load_more_attempts = 10  # Reduced from 30
         
-        while load_more_attempts < max_load_more_attempts:
-            try:
-                # Try to find the "Load More" button
-                load_more_button = WebDriverWait(driver, 5).until(
-                    EC.element_to_be_clickable((By.XPATH, 
-                        "//button[contains(., 'Load More') or contains(., 'Load more') or contains(., 'LOAD MORE')]"
-                    ))
+        while load_more_attempts < config.LOAD_MORE_MAX_CLICKS:
+            if total_results is not None and tile_count >= total_results:
+                print(f"All {total_results} results loaded")
+                break
+            
+            # find_elements does not wait, so a missing button costs nothing
+            buttons = [button for button in driver.find_elements(By.XPATH, LOAD_MORE_XPATH) if button.is_displayed()]
+            if not buttons:
+                print("No more 'Load More' buttons found")
+                break
+            
+            with metrics.span("scraper_load_more_click"):
+                driver.execute_script("arguments[0].scrollIntoView(true); arguments[0].click();", buttons[0])
+                new_count = wait_for_count_change(
+                    driver, TILE_SELECTOR, tile_count, config.LOAD_MORE_TIMEOUT, config.NETWORK_IDLE_MS
                 )
-                
-                # Scroll to the button and click it
-                driver.execute_script("arguments[0].scrollIntoView(true);", load_more_button)
-                time.sleep(1)
-                driver.execute_script("arguments[0].click();", load_more_button)
-                print(f"Clicked 'Load More' button (attempt {load_more_attempts + 1})")
-                time.sleep(3)  # Wait for content to load
-                load_more_attempts += 1
-                
-            except Exception as e:
-                print(f"No more 'Load More' buttons found: {e}")
+            metrics.increment("scraper_load_more_clicks_total")
+            load_more_attempts += 1
+            print(f"Clicked 'Load More' button (attempt {load_more_attempts}): {tile_count} -> {new_count} tiles")
+            
+            if new_count == tile_count:
+                print("'Load More' added no tiles, stopping")
                 break
+            tile_count = new_count
+            
+            # Let the panel finish rendering (e.g. the button being re-added) before looking again
+            wait_for_dom_quiet(driver, "div.result-panel", config.DOM_QUIET_MS, config.LOAD_MORE_TIMEOUT)
+    else:
+        print("All results already visible, no Load More needed")
     
-    # Scroll through page for any lazy loading
+    # Scroll to the bottom until lazy loading stops changing the page
     print("Scrolling through page...")
-    last_height = driver.execute_script("return document.body.scrollHeight")
-    scroll_attempts = 0
-    max_scroll_attempts = 3  # Reduced scrolling
-    
-    while scroll_attempts < max_scroll_attempts:
-        driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(2)
-        
-        new_height = driver.execute_script("return document.body.scrollHeight")
-        if new_height == last_height:
-            scroll_attempts += 1
-        else:
-            scroll_attempts = 0
-        
-        last_height = new_height
-        
-        if scroll_attempts >= 2:
-            break
+    with metrics.span("scraper_scroll"):
+        last_height = driver.execute_script("return document.body.scrollHeight")
+        for _ in range(3):
+            driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
+            mutations = wait_for_dom_quiet(driver, "body", config.DOM_QUIET_MS, config.LOAD_MORE_TIMEOUT)
+            
+            new_height = driver.execute_script("return document.body.scrollHeight")
+            if not mutations and new_height == last_height:
+                break
+            last_height = new_height
     
-    # Save page source for debugging
+    # Save page source for debugging and offline re-extraction
     try:
+        page_source = driver.page_source
+        snapshots.record(snapshots.LISTING, url, page_source, category)
         os.makedirs("html_temp", exist_ok=True)
         debug_file = os.path.join("html_temp", f"{category}_page_debug.html")
         with open(debug_file, "w", encoding="utf-8") as f:
-            f.write(driver.page_source)
+            f.write(page_source)
         print(f"Saved debug HTML to {debug_file}")
     except Exception as e:
         print(f"Could not save debug HTML: {e}")
@@ -139,176 +268,520 @@ def scrape_category_with_selenium(driver, category):
     # Now extract articles using the optimized selectors
     try:
         # Wait for and find the main results container
-        container = WebDriverWait(driver, 15).until(
-            EC.presence_of_element_located((By.CSS_SELECTOR, "div.result-panel"))
-        )
+        with metrics.span("scraper_selector_wait", selector="result_panel"):
+            container = WebDriverWait(driver, 15).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, "div.result-panel"))
+            )
         print("Found main results container")
         
-        # FIXED: Use a more inclusive selector that catches both genericpage and resourcedetailpage
-        article_elements = container.find_elements(By.CSS_SELECTOR, "div.tile")
+        if config.DOM_EXTRACTION_MODE == "script":
+            articles_list = _extract_tiles_with_script(driver, category, allowed_host)
+        else:
+            with metrics.span("scraper_content_extraction", method="elements_listing"):
+                articles_list = _extract_tiles_with_elements(container, category, allowed_host)
+        print(f"\nSuccessfully extracted {len(articles_list)} unique articles from {category}")
+        
+        # Get full content for each article
+        fetch_full_articles(driver, articles_list, category, pool_size=pool_size, session=session, index=index,
+                            on_article=on_article, driver_factory=driver_factory)
         
-        # Filter to only include tiles that have the structure we want
-        valid_articles = []
-        for element in article_elements:
-            class_list = element.get_attribute("class")
-            print(f"Found tile with classes: {class_list}")
-            
-            # Check if it's either genericpage or resourcedetailpage
-            if "genericpage" in class_list or "resourcedetailpage" in class_list:
-                valid_articles.append(element)
-                print("Valid article tile")
-            else:
-                print("Skipping tile (not an article)")
+        return articles_list
+        
+    except TimeoutException:
+        print("Timed out waiting for page to load")
+        return []
+    except Exception as e:
+        print(f"Error in scrape_category_with_selenium: {e}")
+        import traceback
+        traceback.print_exc()
+        return []
+
+def _extract_tiles_with_script(driver, category, allowed_host):
+    """
+    Build article records from the listing in a single execute_script call.
+    
+    Applies the same rules as _extract_tiles_with_elements(): article tiles
+    only, a title and an on-site URL required, the first tile of each URL kept.
+    
+    Args:
+        driver: Selenium WebDriver instance with the listing loaded
+        category (str): Category name, used when a tile has no eyebrow
+        allowed_host (str): Text that must appear in article URLs
+    
+    Returns:
+        list: Article data dictionaries in listing order
+    """
+    with metrics.span("scraper_content_extraction", method="script_listing"):
+        tiles = tile_data(driver) or []
+    print(f"Read {len(tiles)} tiles in one script call")
+    
+    unique_articles = {}
+    
+    for i, tile in enumerate(tiles, 1):
+        class_list = tile.get('className') or ""
+        if "genericpage" not in class_list and "resourcedetailpage" not in class_list:
+            metrics.increment("scraper_tiles_total", outcome="not_article")
+            _debug(f"Skipping tile {i} (not an article): {class_list}")
+            continue
         
-        article_elements = valid_articles
-        print(f"Found {len(article_elements)} valid article elements")
+        title = tile.get('title')
+        if not title:
+            metrics.increment("scraper_tiles_total", outcome="missing_title")
+            _debug(f"Could not find title for article {i}")
+            continue
         
-        unique_articles = {}
+        url = tile.get('url')
+        if not url or allowed_host not in url:
+            metrics.increment("scraper_tiles_total", outcome="missing_url")
+            _debug(f"Could not find URL for article {i}")
+            continue
         
-        for i, article in enumerate(article_elements, 1):
+        if url in unique_articles:
+            metrics.increment("scraper_tiles_total", outcome="duplicate")
+            _debug(f"Skipping duplicate: {url}")
+            continue
+        
+        eyebrow = tile.get('eyebrow')
+        unique_articles[url] = {
+            'Title': title,
+            'URL': url,
+            'Category': eyebrow if eyebrow is not None else category.replace('-', ' ').title(),
+            'Description': tile.get('description') or "",
+            'ImageURL': tile.get('imageUrl') or "",
+            'ImageAlt': tile.get('imageAlt') or "",
+        }
+        metrics.increment("scraper_tiles_total", outcome="article")
+        _debug(f"Successfully extracted article {i}: {title}")
+    
+    return list(unique_articles.values())
+
+def _extract_tiles_with_elements(container, category, allowed_host):
+    """
+    Build article records by querying each tile's elements through WebDriver.
+    
+    Args:
+        container: The `div.result-panel` WebElement
+        category (str): Category name, used when a tile has no eyebrow
+        allowed_host (str): Text that must appear in article URLs
+    
+    Returns:
+        list: Article data dictionaries in listing order
+    """
+    # FIXED: Use a more inclusive selector that catches both genericpage and resourcedetailpage
+    article_elements = container.find_elements(By.CSS_SELECTOR, "div.tile")
+    
+    # Filter to only include tiles that have the structure we want
+    valid_articles = []
+    for element in article_elements:
+        class_list = element.get_attribute("class")
+        _debug(f"Found tile with classes: {class_list}")
+        
+        # Check if it's either genericpage or resourcedetailpage
+        if "genericpage" in class_list or "resourcedetailpage" in class_list:
+            valid_articles.append(element)
+            _debug("Valid article tile")
+        else:
+            metrics.increment("scraper_tiles_total", outcome="not_article")
+            _debug("Skipping tile (not an article)")
+    
+    article_elements = valid_articles
+    print(f"Found {len(article_elements)} valid article elements")
+    
+    unique_articles = {}
+    
+    for i, article in enumerate(article_elements, 1):
+        try:
+            article_data = {}
+            
+            # Extract title using specific selector
             try:
-                article_data = {}
-                
-                # Extract title using specific selector
-                try:
-                    title_elem = article.find_element(By.CSS_SELECTOR, "p.title")
-                    title = title_elem.text.strip()
-                    if not title:
-                        raise Exception("Empty title")
-                    article_data['Title'] = title
-                    print(f"Title {i}: {title}")
-                except Exception as e:
-                    print(f"Could not find title for article {i}: {e}")
+                title_elem = article.find_element(By.CSS_SELECTOR, "p.title")
+                title = title_elem.text.strip()
+                if not title:
+                    raise Exception("Empty title")
+                article_data['Title'] = title
+                _debug(f"Title {i}: {title}")
+            except Exception as e:
+                metrics.increment("scraper_tiles_total", outcome="missing_title")
+                _debug(f"Could not find title for article {i}: {e}")
+                continue
+            
+            # Extract URL using specific selector
+            try:
+                link_elem = article.find_element(By.CSS_SELECTOR, "div.cta-area a.score-button")
+                url = link_elem.get_attribute('href')
+                if not url or allowed_host not in url:
+                    raise Exception("Invalid URL")
+                article_data['URL'] = url
+                _debug(f"URL {i}: {url}")
+            except Exception as e:
+                metrics.increment("scraper_tiles_total", outcome="missing_url")
+                _debug(f"Could not find URL for article {i}: {e}")
+                continue
+            
+            # Extract category from eyebrow
+            try:
+                category_elem = article.find_element(By.CSS_SELECTOR, "p.eyebrow")
+                article_data['Category'] = category_elem.text.strip()
+                _debug(f"Category {i}: {article_data['Category']}")
+            except Exception as e:
+                # Fallback to the category parameter
+                article_data['Category'] = category.replace('-', ' ').title()
+                _debug(f"Using fallback category for article {i}: {article_data['Category']}")
+            
+            # Extract description
+            try:
+                desc_elem = article.find_element(By.CSS_SELECTOR, "p.description")
+                article_data['Description'] = desc_elem.text.strip()
+            except Exception as e:
+                article_data['Description'] = ""
+                _debug(f"No description found for article {i}")
+            
+            # Extract image info (bonus)
+            try:
+                img_elem = article.find_element(By.CSS_SELECTOR, "div.image-wrapper img")
+                article_data['ImageURL'] = img_elem.get_attribute('src')
+                article_data['ImageAlt'] = img_elem.get_attribute('alt')
+            except Exception as e:
+                article_data['ImageURL'] = ""
+                article_data['ImageAlt'] = ""
+            
+            # Only add article if we have essential data (title and URL)
+            if article_data.get('Title') and article_data.get('URL'):
+                # Skip duplicates
+                if url in unique_articles:
+                    metrics.increment("scraper_tiles_total", outcome="duplicate")
+                    _debug(f"Skipping duplicate: {url}")
                     continue
                 
-                # Extract URL using specific selector
+                unique_articles[url] = article_data
+                metrics.increment("scraper_tiles_total", outcome="article")
+                _debug(f"Successfully extracted article {i}: {article_data['Title']}")
+            else:
+                _debug(f"Skipping article {i} - missing essential data")
+            
+        except Exception as e:
+            print(f"Error processing article {i}: {e}")
+            continue
+    
+    return list(unique_articles.values())
+
+def progress_journal(category):
+    """Checkpoint journal of article bodies fetched for a category"""
+    return CheckpointJournal(os.path.join("csv_temp", f"{category}_progress.jsonl"))
+
+# Placeholder texts returned by scrape_full_article_with_selenium on failure
+_FAILED_CONTENT_PREFIXES = ("Could not extract article content", "Error extracting content")
+
+def _fetch_article_body(url, get_driver, session=None, index=None):
+    """
+    Get the text of one article, preferring the cheapest source available.
+    
+    Order: a (conditional) static HTTP fetch, an unexpired crawl index entry
+    for pages whose static HTML has no usable content, then the browser.
+    Without a session, unexpired index entries are used first. Freshly
+    fetched text is written back to the index, which compares content
+    hashes, so changed pages are detected even without ETag/Last-Modified.
+    
+    Args:
+        url (str): Article URL
+        get_driver: Callable returning the WebDriver to fall back to
+        session: Optional requests session for the HTTP-only fast path
+        index: Optional CrawlIndex for incremental crawls
+    
+    Returns:
+        str: Full article text
+    """
+    with metrics.span("scraper_article_fetch"):
+        entry = index.get(url) if index is not None else None
+        
+        if entry is not None and index.is_fresh(entry, can_revalidate=session is not None):
+            _debug(f"Unchanged since last crawl, reusing stored content: {url}")
+            metrics.increment("scraper_articles_total", source="index")
+            return entry['text']
+        
+        if session is not None:
+            status, content, etag, last_modified = fetch_static_article(session, url, entry)
+            if status == 304:
+                _debug(f"Not modified since last crawl: {url}")
+                metrics.increment("scraper_articles_total", source="not_modified")
+                index.touch(url)
+                return entry['text']
+            if content:
+                if index is not None:
+                    changed = index.record(url, content, etag, last_modified)
+                    metrics.increment("scraper_index_records_total", changed=str(changed).lower())
+                metrics.increment("scraper_articles_total", source="http")
+                return content
+            # Browser-only pages are reused from the index until they expire
+            if entry is not None and index.is_fresh(entry, can_revalidate=False):
+                _debug(f"No usable static content, reusing stored content: {url}")
+                metrics.increment("scraper_articles_total", source="index")
+                return entry['text']
+            _debug(f"Falling back to Selenium for {url}")
+            metrics.increment("scraper_selenium_fallbacks_total")
+        
+        content = scrape_full_article_with_selenium(get_driver(), url)
+        metrics.increment("scraper_articles_total", source="selenium")
+        if index is not None and content and not content.startswith(_FAILED_CONTENT_PREFIXES):
+            index.record(url, content)
+        return content
+
+def fetch_full_articles(driver, articles_list, category, pool_size=1, session=None, index=None, on_article=None,
+                        driver_factory=None):
+    """
+    Fill in 'FullArticleText' for every article in the list.
+    
+    With a pool size of 1 the articles are fetched one by one on the given
+    driver. Otherwise the URLs are spread across `pool_size` workers. The
+    first one reuses the given driver (left open for the caller) and the
+    others own a driver from `driver_factory` (setup_driver() by default),
+    calling quit() on it when done, so at most `pool_size` browsers run.
+    The list is updated in place, so the listing order is preserved either way.
+    
+    When a session is given, every article is first fetched over plain HTTP
+    and a browser is only used for pages whose static HTML has no usable
+    content. Pool workers start their driver lazily for that reason. When a
+    crawl index is given, unchanged articles are carried forward from it.
+    
+    Every fetched body is appended to the category's checkpoint journal, and
+    articles already in the journal are not fetched again, so an interrupted
+    run resumes where it stopped.
+    
+    `on_article` is called with each article as soon as its body is ready,
+    from worker threads in pool mode; it may block to apply backpressure.
+    
+    Args:
+        driver: Selenium WebDriver instance used for the serial path
+        articles_list (list): Article dictionaries with at least 'Title' and 'URL'
+        category (str): Category name, used for the progress file
+        pool_size (int): Number of WebDriver sessions to use, counting the given driver
+        session: Optional requests session for the HTTP-only fast path
+        index: Optional CrawlIndex for incremental crawls
+        on_article: Optional callback receiving each finished article
+        driver_factory: Optional callable returning a driver for each additional pool worker
+    
+    Returns:
+        list: The same list of article dictionaries
+    """
+    journal = progress_journal(category)
+    completed = journal.load()
+    
+    # Resume: bodies fetched before an interruption come from the journal
+    todo = []
+    for i, article in enumerate(articles_list, 1):
+        if article['URL'] in completed:
+            article['FullArticleText'] = completed[article['URL']]['FullArticleText']
+            if on_article is not None:
+                on_article(article)
+        else:
+            todo.append((i, article))
+    if completed:
+        print(f"Resuming {category}: {len(articles_list) - len(todo)} articles already fetched")
+    
+    total = len(articles_list)
+    pool_size = max(1, min(pool_size, len(todo)))
+    
+    def checkpoint(article):
+        content = article['FullArticleText']
+        if content and not content.startswith(_FAILED_CONTENT_PREFIXES):
+            journal.append(article['URL'], {'FullArticleText': content})
+        if on_article is not None:
+            on_article(article)
+    
+    if pool_size == 1:
+        try:
+            for i, article in todo:
                 try:
-                    link_elem = article.find_element(By.CSS_SELECTOR, "div.cta-area a.score-button")
-                    url = link_elem.get_attribute('href')
-                    if not url or "freshproduce.com" not in url:
-                        raise Exception("Invalid URL")
-                    article_data['URL'] = url
-                    print(f"URL {i}: {url}")
+                    _debug(f"Getting full content {i}/{total}: {article['Title']}")
+                    article['FullArticleText'] = _fetch_article_body(article['URL'], lambda: driver, session, index)
                 except Exception as e:
-                    print(f"Could not find URL for article {i}: {e}")
-                    continue
+                    print(f"Error getting full content for {article.get('URL', 'unknown')}: {e}")
+                    article['FullArticleText'] = ""
                 
-                # Extract category from eyebrow
+                # Save progress after each article
+                checkpoint(article)
+        finally:
+            journal.close()
+        
+        return articles_list
+    
+    print(f"Fetching {len(todo)} articles with a pool of {pool_size} drivers")
+    driver_factory = driver_factory or setup_driver
+    pending = queue.Queue()
+    for item in todo:
+        pending.put(item)
+    
+    def worker(worker_id):
+        worker_driver = []
+        # The caller's driver serves as the first worker's browser instead of idling
+        shared = worker_id == 1 and driver is not None
+        
+        def get_driver():
+            if shared:
+                return driver
+            if not worker_driver:
+                worker_driver.append(driver_factory())
+            return worker_driver[0]
+        
+        try:
+            while True:
                 try:
-                    category_elem = article.find_element(By.CSS_SELECTOR, "p.eyebrow")
-                    article_data['Category'] = category_elem.text.strip()
-                    print(f"Category {i}: {article_data['Category']}")
-                except Exception as e:
-                    # Fallback to the category parameter
-                    article_data['Category'] = category.replace('-', ' ').title()
-                    print(f"Using fallback category for article {i}: {article_data['Category']}")
+                    i, article = pending.get_nowait()
+                except queue.Empty:
+                    break
                 
-                # Extract description
                 try:
-                    desc_elem = article.find_element(By.CSS_SELECTOR, "p.description")
-                    article_data['Description'] = desc_elem.text.strip()
+                    _debug(f"[driver {worker_id}] Getting full content {i}/{total}: {article['Title']}")
+                    article['FullArticleText'] = _fetch_article_body(article['URL'], get_driver, session, index)
                 except Exception as e:
-                    article_data['Description'] = ""
-                    print(f"No description found for article {i}")
+                    print(f"Error getting full content for {article.get('URL', 'unknown')}: {e}")
+                    article['FullArticleText'] = ""
                 
-                # Extract image info (bonus)
+                # Save progress after each article
+                checkpoint(article)
+        finally:
+            if worker_driver:
+                worker_driver[0].quit()
+    
+    try:
+        with ThreadPoolExecutor(max_workers=pool_size) as executor:
+            futures = [executor.submit(worker, n) for n in range(1, pool_size + 1)]
+            for future in futures:
                 try:
-                    img_elem = article.find_element(By.CSS_SELECTOR, "div.image-wrapper img")
-                    article_data['ImageURL'] = img_elem.get_attribute('src')
-                    article_data['ImageAlt'] = img_elem.get_attribute('alt')
+                    future.result()
                 except Exception as e:
-                    article_data['ImageURL'] = ""
-                    article_data['ImageAlt'] = ""
-                
-                # Only add article if we have essential data (title and URL)
-                if article_data.get('Title') and article_data.get('URL'):
-                    # Skip duplicates
-                    if url in unique_articles:
-                        print(f"Skipping duplicate: {url}")
-                        continue
-                    
-                    unique_articles[url] = article_data
-                    print(f"Successfully extracted article {i}: {article_data['Title']}")
-                else:
-                    print(f"Skipping article {i} - missing essential data")
-                
-            except Exception as e:
-                print(f"Error processing article {i}: {e}")
-                continue
-        
-        articles_list = list(unique_articles.values())
-        print(f"\nSuccessfully extracted {len(articles_list)} unique articles from {category}")
-        
-        # Get full content for each article
-        for i, article in enumerate(articles_list, 1):
-            try:
-                print(f"Getting full content {i}/{len(articles_list)}: {article['Title']}")
-                article['FullArticleText'] = scrape_full_article_with_selenium(driver, article['URL'])
-                
-                # Save progress after each article
-                df_temp = pd.DataFrame(articles_list[:i])
-                if not df_temp.empty:
-                    os.makedirs("csv_temp", exist_ok=True)
-                    temp_file = os.path.join("csv_temp", f"{category}_temp_progress.csv")
-                    df_temp.to_csv(temp_file, index=False)
-                
-            except Exception as e:
-                print(f"Error getting full content for {article.get('URL', 'unknown')}: {e}")
-                article['FullArticleText'] = ""
+                    print(f"Driver worker failed: {e}")
+    finally:
+        journal.close()
+    
+    # Articles left behind by a worker that failed to start get an empty body
+    for article in articles_list:
+        article.setdefault('FullArticleText', "")
+    
+    return articles_list
+
+def fetch_static_article(session, article_url, entry=None):
+    """
+    Fetch an article page over HTTP and extract its content.
+    
+    Args:
+        session: requests session from setup_http_session()
+        article_url (str): URL of the article
+        entry (dict): Optional crawl index entry; its ETag/Last-Modified are
+            sent as conditional request headers
+    
+    Returns:
+        tuple: (status_code, content, etag, last_modified). status_code is
+        None if the request failed and content is "" when the static HTML
+        has no usable content or the page was not modified.
+    """
+    headers = {}
+    if entry is not None:
+        if entry.get('etag'):
+            headers['If-None-Match'] = entry['etag']
+        if entry.get('last_modified'):
+            headers['If-Modified-Since'] = entry['last_modified']
+    
+    try:
+        with metrics.span("scraper_page_load", page="article_http"):
+            response = session.get(article_url, headers=headers, timeout=15)
+        if response.status_code == 304:
+            return 304, "", None, None
+        response.raise_for_status()
+        snapshots.record(snapshots.ARTICLE, article_url, response.text)
         
-        return articles_list
+        with metrics.span("scraper_content_extraction", method="http"):
+            content, selector = extract_article_text(response.text)
+        if content:
+            _debug(f"Found static content using selector: {selector} ({len(content)} chars)")
+        else:
+            _debug(f"No usable static content for {article_url}")
+        return response.status_code, content, response.headers.get('ETag'), response.headers.get('Last-Modified')
         
-    except TimeoutException:
-        print("Timed out waiting for page to load")
-        return []
     except Exception as e:
-        print(f"Error in scrape_category_with_selenium: {e}")
-        import traceback
-        traceback.print_exc()
-        return []
+        metrics.increment("scraper_http_fetch_errors_total")
+        print(f"HTTP fetch failed for {article_url}: {e}")
+        return None, "", None, None
 
-def scrape_full_article_with_selenium(driver, article_url):
+def scrape_full_article_with_requests(session, article_url):
+    """
+    Extract full article content from the static HTML, without a browser.
+    
+    Args:
+        session: requests session from setup_http_session()
+        article_url (str): URL of the article
+    
+    Returns:
+        str: Full article text, or "" if the static HTML has no usable content
+    """
+    return fetch_static_article(session, article_url)[1]
+
+def _snapshot_article(driver, article_url):
+    """Archive the rendered article; page_source is a large transfer, so only when snapshots are on"""
+    if not config.SNAPSHOTS_ENABLED:
+        return
+    try:
+        snapshots.record(snapshots.ARTICLE, article_url, driver.page_source)
+    except Exception as e:
+        print(f"Could not snapshot {article_url}: {e}")
+
+def scrape_full_article_with_selenium(driver, article_url, session=None):
     """
     Extract full article content using Selenium.
     
     Args:
         driver: Selenium WebDriver instance
         article_url (str): URL of the article
+        session: Optional requests session; when given the static HTML is
+            tried first and the browser is only used as a fallback
     
     Returns:
         str: Full article text
     """
+    if session is not None:
+        content = scrape_full_article_with_requests(session, article_url)
+        if content:
+            return content
+        _debug(f"Falling back to Selenium for {article_url}")
+    
     try:
-        print(f"Loading article: {article_url}")
-        driver.get(article_url)
+        _debug(f"Loading article: {article_url}")
+        with metrics.span("scraper_page_load", page="article_selenium"):
+            driver.get(article_url)
+        
+        if config.DOM_EXTRACTION_MODE == "script":
+            with metrics.span("scraper_content_extraction", method="script"):
+                found = article_content(driver, CONTENT_SELECTORS, MIN_CONTENT_LENGTH, config.DOM_QUIET_MS,
+                                        config.ARTICLE_CONTENT_TIMEOUT)
+            if found is not None:
+                _snapshot_article(driver, article_url)
+                content, selector = found
+                if selector == "body":
+                    metrics.increment("scraper_body_text_fallbacks_total")
+                    _debug(f"Using fallback body text ({len(content)} chars)")
+                else:
+                    _debug(f"Found content using selector: {selector} ({len(content)} chars)")
+                return content
+            _debug(f"Extraction script failed, querying elements for {article_url}")
         
         # Wait for article content to load
         wait = WebDriverWait(driver, 15)
         
         # Try different selectors for article content (in order of preference)
-        content_selectors = [
-            "main article",  # Most semantic
-            "article .content",
-            "main .content",
-            ".article-content",
-            ".post-content", 
-            ".entry-content",
-            "main",
-            ".main-content",
-            "article"
-        ]
-        
         content = ""
         
-        for selector in content_selectors:
+        for selector in CONTENT_SELECTORS:
             try:
                 # Wait for element to be present
-                content_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
-                content = content_element.text.strip()
+                with metrics.span("scraper_selector_wait", selector="article_content"):
+                    content_element = wait.until(EC.presence_of_element_located((By.CSS_SELECTOR, selector)))
+                with metrics.span("scraper_content_extraction", method="selenium"):
+                    content = content_element.text.strip()
                 
                 # Only use if we got substantial content
-                if len(content) > 100:  # Arbitrary threshold
-                    print(f"Found content using selector: {selector} ({len(content)} chars)")
+                if len(content) > MIN_CONTENT_LENGTH:
+                    _debug(f"Found content using selector: {selector} ({len(content)} chars)")
                     break
                 else:
                     content = ""  # Reset if content too short
@@ -321,22 +794,157 @@ def scrape_full_article_with_selenium(driver, article_url):
             try:
                 body = driver.find_element(By.TAG_NAME, "body")
                 content = body.text.strip()
-                print(f"Using fallback body text ({len(content)} chars)")
+                metrics.increment("scraper_body_text_fallbacks_total")
+                _debug(f"Using fallback body text ({len(content)} chars)")
             except:
                 content = "Could not extract article content"
+                metrics.increment("scraper_extraction_failures_total")
                 print(f"Could not extract any content")
         
+        _snapshot_article(driver, article_url)
         return content
         
     except Exception as e:
+        metrics.increment("scraper_extraction_failures_total")
         print(f"Error getting article content from {article_url}: {e}")
         return f"Error extracting content: {str(e)}"
 
-def main_selenium_scraper():
+# Newlines break naive CSV readers, so text values are kept on one line (except line_columns())
+_flatten_values = np.frompyfunc(lambda value: str(value).replace('\n', ' ').replace('\r', ' ').strip(), 1, 1)
+
+def keep_lines(value):
+    """Trim a text and normalize its line breaks to \\n, keeping one line per block"""
+    return str(value).replace('\r\n', '\n').replace('\r', '\n').strip()
+
+def line_columns():
+    """Text columns stored with their line breaks: the boilerplate model works line by line"""
+    return ['FullArticleText'] if config.TEXT_CLEANING else []
+
+def clean_text_columns(df, keep_lines_in=None):
+    """
+    Flatten newlines and trim whitespace in every text column, in one pass.
+    
+    Python object columns get all three edits per value in a single loop
+    over the whole block, instead of one pandas `.str` pass per edit and
+    per column. Columns that already use pandas' native string dtype keep
+    its compiled `.str` kernels, which beat any Python-level loop.
+    
+    Args:
+        df (DataFrame): Data to clean in place
+        keep_lines_in (list): Columns that are only trimmed, keeping their line breaks
+    
+    Returns:
+        DataFrame: The same DataFrame
+    """
+    keep_lines_in = [col for col in keep_lines_in or [] if col in df.columns]
+    for col in keep_lines_in:
+        df[col] = df[col].map(keep_lines)
+    
+    object_columns = []
+    for col in df.columns:
+        if col in keep_lines_in:
+            continue
+        if pd.api.types.is_object_dtype(df[col]):
+            object_columns.append(col)
+        elif pd.api.types.is_string_dtype(df[col]):
+            df[col] = df[col].str.replace('\n', ' ', regex=False).str.replace('\r', ' ', regex=False).str.strip()
+    
+    if object_columns and len(df):
+        df[object_columns] = _flatten_values(df[object_columns].to_numpy(dtype=object))
+    return df
+
+def save_scraped_articles(all_articles, output_file=None):
+    """
+    Clean the scraped articles and save them to the output CSV.
+    
+    Args:
+        all_articles (list): Article data dictionaries
+        output_file (str): Destination .parquet or .csv file, defaults to
+            data/scraped_freshproduce_data in config.STORAGE_FORMAT
+    
+    Returns:
+        DataFrame: The cleaned data that was written
+    """
+    # Strip site boilerplate while the text still has one line per block
+    if config.TEXT_CLEANING:
+        add_clean_text(all_articles)
+    
+    # Create DataFrame with proper column order
+    df = pd.DataFrame(all_articles)
+    
+    # Ensure we have all expected columns
+    expected_columns = ['Title', 'URL', 'Category', 'Description', 'ImageURL', 'ImageAlt', 'FullArticleText']
+    if config.TEXT_CLEANING:
+        expected_columns.append('CleanArticleText')
+    for col in expected_columns:
+        if col not in df.columns:
+            df[col] = ""
+    
+    # Reorder columns
+    df = df[expected_columns]
+    
+    # Clean data before saving
+    print("Cleaning data...")
+    clean_text_columns(df, keep_lines_in=line_columns())
+    
+    # Save the combined data in the data directory (plus a CSV export for Parquet)
+    output_file = output_file or table_path(config.SCRAPED_DATA_PATH)
+    write_table(df, output_file)
+    
+    print(f"\nScraping complete! Data saved to {output_file}")
+    
+    # Print summary
+    print(f"\nSUMMARY:")
+    print(f"   • Total articles: {len(df)}")
+    print(f"   • Categories: {', '.join(df['Category'].unique())}")
+    print(f"   • File: {output_file}")
+    
+    # Show category breakdown
+    category_counts = df['Category'].value_counts()
+    print(f"\nBREAKDOWN BY CATEGORY:")
+    for cat, count in category_counts.items():
+        print(f"   • {cat}: {count} articles")
+    
+    return df
+
+def merge_previous_articles(all_articles, output_file=None):
+    """
+    Carry forward articles from the previous output that this run did not list.
+    
+    Args:
+        all_articles (list): Article dictionaries scraped in this run
+        output_file (str): Previous output, defaults to the newest data/scraped_freshproduce_data table
+    
+    Returns:
+        list: This run's articles followed by the carried-forward ones
+    """
+    output_file = output_file or find_table(config.SCRAPED_DATA_PATH)
+    if not os.path.exists(output_file):
+        return all_articles
+    
+    previous = read_table(output_file, dtype=str, keep_default_na=False)
+    seen = {article['URL'] for article in all_articles}
+    carried = [row for row in previous.to_dict('records') if row.get('URL') not in seen]
+    
+    print(f"Carrying forward {len(carried)} articles from {output_file}")
+    return all_articles + carried
+
+def main_selenium_scraper(pool_size=None, fetch_mode=None, incremental=None, base_url=None, output_file=None):
     """Main function using optimized Selenium scraper"""
     categories = ['global-trade', 'technology', 'food-safety']
+    pool_size = pool_size or config.DRIVER_POOL_SIZE
+    fetch_mode = fetch_mode or config.ARTICLE_FETCH_MODE
+    incremental = config.INCREMENTAL_CRAWL if incremental is None else incremental
     all_articles = []
     
+    # Article pages are fetched over plain HTTP first in "http" mode
+    session = setup_http_session(pool_size) if fetch_mode == "http" else None
+    
+    # Incremental runs only download new or changed articles
+    index = CrawlIndex() if incremental else None
+    if index is not None:
+        print(f"Incremental crawl using {index.path} ({len(index)} known articles)")
+    
     # Setup driver
     print("Setting up Chrome driver...")
     driver = setup_driver()
@@ -348,7 +956,8 @@ def main_selenium_scraper():
             print(f"SCRAPING CATEGORY: {category.upper()}")
             print(f"{'='*60}")
             
-            articles = scrape_category_with_selenium(driver, category)
+            articles = scrape_category_with_selenium(driver, category, pool_size=pool_size, session=session, index=index,
+                                                     base_url=base_url)
             all_articles.extend(articles)
             
             print(f"Completed {category}: {len(articles)} articles")
@@ -357,50 +966,15 @@ def main_selenium_scraper():
         print(f"\nSCRAPING COMPLETE!")
         print(f"Total articles found: {len(all_articles)}")
         
+        if all_articles and index is not None:
+            all_articles = merge_previous_articles(all_articles, output_file)
+        
         if all_articles:
-            # Create DataFrame with proper column order
-            df = pd.DataFrame(all_articles)
-            
-            # Ensure we have all expected columns
-            expected_columns = ['Title', 'URL', 'Category', 'Description', 'ImageURL', 'ImageAlt', 'FullArticleText']
-            for col in expected_columns:
-                if col not in df.columns:
-                    df[col] = ""
+            save_scraped_articles(all_articles, output_file)
             
-            # Reorder columns
-            df = df[expected_columns]
-            
-            # Clean data before saving
-            print("Cleaning data...")
-            for col in df.columns:
-                if df[col].dtype == 'object':
-                    df[col] = df[col].astype(str)  # Convert to string
-                    df[col] = df[col].str.replace('"', '""')  # Escape quotes
-                    df[col] = df[col].str.replace('\n', ' ')  # Replace newlines
-                    df[col] = df[col].str.replace('\r', ' ')  # Replace carriage returns
-                    df[col] = df[col].str.strip()  # Remove leading/trailing whitespace
-            
-            # Ensure data directory exists
-            os.makedirs('data', exist_ok=True)
-            
-            # Save the combined data to a CSV file in the data directory
-            output_file = os.path.join('data', 'scraped_freshproduce_data.csv')
-            df.to_csv(output_file, index=False, encoding='utf-8', quoting=1, quotechar='"', escapechar='\\')
-            
-            print(f"\nScraping complete! Data saved to {output_file}")
-            
-            # Print summary
-            print(f"\nSUMMARY:")
-            print(f"   • Total articles: {len(df)}")
-            print(f"   • Categories: {', '.join(df['Category'].unique())}")
-            print(f"   • File: {output_file}")
-            
-            # Show category breakdown
-            category_counts = df['Category'].value_counts()
-            print(f"\nBREAKDOWN BY CATEGORY:")
-            for cat, count in category_counts.items():
-                print(f"   • {cat}: {count} articles")
-                
+            # The run completed, so the next one starts from scratch
+            for category in categories:
+                progress_journal(category).clear()
         else:
             print("No articles found!")
         
@@ -413,6 +987,13 @@ def main_selenium_scraper():
         # Always close the driver
         print("Closing browser...")
         driver.quit()
+        if session is not None:
+            session.close()
+        if index is not None:
+            index.close()
+        
+        json_path, prom_path = metrics.REGISTRY.export("scraper")
+        print(f"Metrics written to {json_path} and {prom_path}")
         print("Done!")
 
 if __name__ == "__main__":
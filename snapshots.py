@@ -0,0 +1,306 @@
+"""
+Content-addressed archive of the HTML the scrapers fetched, and offline re-extraction from it.
+
+Each listing page, listing search response and article page is stored
+gzip-compressed under the SHA-256 of its text, so an unchanged page costs
+no extra space however often it is crawled. A SQLite manifest records
+which URL had which content when, in which crawl run and at which page
+of its listing. `reextract()` rebuilds the scraped-articles table from
+the newest run of every category and the newest snapshot of every
+article page with the parsing module, without a browser or the network. After a selector or
+cleaning rule changes, the whole archive is re-parsed in seconds instead
+of crawled again.
+"""
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlparse
+
+import config
+from parsing import extract_article_text, parse_listing_tiles
+
+# Kinds of snapshot
+LISTING = "listing"  # rendered category listing page
+LISTING_API = "listing_api"  # JSON response of the listing search endpoint
+ARTICLE = "article"  # article page
+
+def blob_path(root: str, content_hash: str) -> str:
+    return os.path.join(root, content_hash[:2], content_hash + ".html.gz")
+
+def read_blob(root: str, content_hash: str) -> str:
+    with gzip.open(blob_path(root, content_hash), "rb") as f:
+        return f.read().decode('utf-8')
+
+class SnapshotStore:
+    """
+    Compressed HTML blobs named by content hash, plus a manifest of captures
+    """
+
+    def __init__(self, root: str = None, compression_level: int = None):
+        """
+        Args:
+            root: Directory of the store (defaults to config.SNAPSHOT_DIR)
+            compression_level: gzip level for new blobs (defaults to config.SNAPSHOT_COMPRESSION_LEVEL)
+        """
+        self.root = root or config.SNAPSHOT_DIR
+        self.compression_level = (compression_level if compression_level is not None
+                                  else config.SNAPSHOT_COMPRESSION_LEVEL)
+        self.lock = threading.Lock()
+
+        os.makedirs(self.root, exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(self.root, "manifest.sqlite"), check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS snapshots (
+                kind TEXT NOT NULL,
+                url TEXT NOT NULL,
+                category TEXT,
+                content_hash TEXT NOT NULL,
+                captured_at REAL NOT NULL,
+                run_id TEXT,
+                position INTEGER,
+                PRIMARY KEY (kind, url, content_hash)
+            )
+            """
+        )
+        # Manifests written before runs were recorded lack the last two columns
+        columns = {row[1] for row in self.conn.execute("PRAGMA table_info(snapshots)")}
+        for column, column_type in (("run_id", "TEXT"), ("position", "INTEGER")):
+            if column not in columns:
+                self.conn.execute(f"ALTER TABLE snapshots ADD COLUMN {column} {column_type}")
+        self.conn.commit()
+
+    @staticmethod
+    def content_hash(html: str) -> str:
+        return hashlib.sha256(html.encode('utf-8')).hexdigest()
+
+    def save(self, kind: str, url: str, html: str, category: str = None, run_id: str = None,
+             position: int = 0) -> str:
+        """
+        Store a fetched page; identical content is written only once
+
+        Args:
+            kind: LISTING, LISTING_API or ARTICLE
+            url: Page or request URL
+            html: Page text
+            category: Category slug of a listing
+            run_id: Crawl run the capture belongs to
+            position: Page number of a listing capture within its run, from 0
+
+        Returns:
+            Content hash of the page
+        """
+        content_hash = self.content_hash(html)
+        path = blob_path(self.root, content_hash)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            # Written under a unique name first, so readers never see a partial blob
+            temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with gzip.open(temp_path, "wb", compresslevel=self.compression_level) as f:
+                f.write(html.encode('utf-8'))
+            os.replace(temp_path, path)
+
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO snapshots (kind, url, category, content_hash, captured_at, run_id, position) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (kind, url, category, content_hash, time.time(), run_id, position)
+            )
+            self.conn.commit()
+        return content_hash
+
+    def load(self, content_hash: str) -> str:
+        return read_blob(self.root, content_hash)
+
+    def latest(self, kind: str) -> list:
+        """
+        Newest capture of every URL of one kind
+
+        Returns:
+            List of dicts with kind, url, category, content_hash and
+            captured_at, newest first
+        """
+        # SQLite takes the bare columns from the row holding MAX(captured_at)
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT kind, url, category, content_hash, MAX(captured_at) AS captured_at FROM snapshots "
+                "WHERE kind = ? GROUP BY url ORDER BY captured_at DESC",
+                (kind,)
+            ).fetchall()
+        return [dict(zip(("kind", "url", "category", "content_hash", "captured_at"), row)) for row in rows]
+
+    def newest_run(self, category: str) -> list:
+        """
+        Listing captures of a category's newest crawl run, in page order
+
+        The rendered listing page comes first, then the search responses by
+        position. Captures left from older runs are not included.
+
+        Returns:
+            List of dicts with kind, url, category, content_hash and captured_at
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT run_id FROM snapshots WHERE kind IN (?, ?) AND category = ? "
+                "ORDER BY captured_at DESC LIMIT 1",
+                (LISTING, LISTING_API, category)
+            ).fetchone()
+            if row is None:
+                return []
+            rows = self.conn.execute(
+                "SELECT kind, url, category, content_hash, captured_at FROM snapshots "
+                "WHERE kind IN (?, ?) AND category = ? AND run_id IS ? "
+                "ORDER BY kind = ?, COALESCE(position, 0), captured_at",
+                (LISTING, LISTING_API, category, row[0], LISTING_API)
+            ).fetchall()
+        return [dict(zip(("kind", "url", "category", "content_hash", "captured_at"), row)) for row in rows]
+
+    def stats(self) -> dict:
+        with self.lock:
+            captures = dict(self.conn.execute("SELECT kind, COUNT(*) FROM snapshots GROUP BY kind").fetchall())
+            urls = self.conn.execute("SELECT COUNT(DISTINCT kind || ' ' || url) FROM snapshots").fetchone()[0]
+
+        blobs = 0
+        size = 0
+        for directory, _, files in os.walk(self.root):
+            for name in files:
+                if name.endswith(".html.gz"):
+                    blobs += 1
+                    size += os.path.getsize(os.path.join(directory, name))
+        return {"captures": captures, "urls": urls, "blobs": blobs, "compressed_bytes": size}
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+_default_store = None
+_default_store_lock = threading.Lock()
+_run_id = uuid.uuid4().hex
+
+def new_run() -> str:
+    """
+    Start a new crawl run; later captures are grouped under it
+
+    Called when a scrape starts, so re-extraction can tell this crawl's
+    listing pages from those of earlier ones.
+    """
+    global _run_id
+    _run_id = uuid.uuid4().hex
+    return _run_id
+
+def record(kind: str, url: str, html: str, category: str = None, position: int = 0):
+    """
+    Snapshot a fetched page into the default store when config.SNAPSHOTS_ENABLED
+
+    Called from the scrapers' hot paths, so a failure is reported and never raised.
+
+    Args:
+        position: Page number of a listing capture within the crawl, from 0
+    """
+    global _default_store
+    if not config.SNAPSHOTS_ENABLED or not html:
+        return
+    try:
+        with _default_store_lock:
+            if _default_store is None:
+                _default_store = SnapshotStore()
+        _default_store.save(kind, url, html, category, _run_id, position)
+    except Exception as e:
+        print(f"Could not snapshot {url}: {e}")
+
+def _allowed_host(url: str) -> str:
+    host = urlparse(url).hostname or ""
+    return host[4:] if host.startswith("www.") else host
+
+def _parse_listing(root: str, snapshot: dict) -> list:
+    """Article records of one listing snapshot (runs in a worker process)"""
+    text = read_blob(root, snapshot["content_hash"])
+    category, url = snapshot["category"], snapshot["url"]
+
+    if snapshot["kind"] == LISTING_API:
+        # Imported here: listing_api pulls in Selenium, which the page parser does not need
+        from listing_api import records_from_payload
+        return records_from_payload(json.loads(text), category, url, _allowed_host(url))[0]
+    return parse_listing_tiles(text, category, url, allowed_host=_allowed_host(url))
+
+def _parse_article(root: str, content_hash: str) -> str:
+    """Body text of one article snapshot (runs in a worker process)"""
+    content, _ = extract_article_text(read_blob(root, content_hash), body_fallback=True)
+    return content or "Could not extract article content"
+
+def reextract(store: SnapshotStore = None, categories: list = None, workers: int = None) -> list:
+    """
+    Rebuild article records from the newest snapshots, without a browser or the network
+
+    Each category's listing is re-parsed from the captures of its newest
+    crawl run only, page by page, so the articles come out in listing
+    order. When an article appears on several pages its place is the
+    first, and its fields come from the newest capture.
+    Each article body is re-extracted from the newest capture of its page.
+    Articles that were never captured keep an empty 'FullArticleText'.
+
+    Args:
+        store: Snapshot store (defaults to one at config.SNAPSHOT_DIR)
+        categories: Category slugs to rebuild, in output order (defaults to config.CATEGORIES)
+        workers: Parser processes (defaults to config.REEXTRACT_WORKERS; 1 parses in this process)
+
+    Returns:
+        List of article dictionaries, grouped by category
+    """
+    own_store = store is None
+    store = store or SnapshotStore()
+    categories = categories or config.CATEGORIES
+    workers = workers or config.REEXTRACT_WORKERS
+
+    try:
+        listings = [snapshot for category in categories for snapshot in store.newest_run(category)]
+        pages = {snapshot["url"]: snapshot["content_hash"] for snapshot in store.latest(ARTICLE)}
+    finally:
+        if own_store:
+            store.close()
+
+    def parse_all(executor_map):
+        listing_records = list(executor_map(_parse_listing, [store.root] * len(listings), listings))
+
+        by_category = {category: {} for category in categories}
+        for snapshot, records in zip(listings, listing_records):
+            found = by_category[snapshot["category"]]
+            for record in records:
+                record['_captured_at'] = snapshot["captured_at"]
+                previous = found.get(record['URL'])
+                if previous is None:
+                    found[record['URL']] = record
+                elif record['_captured_at'] > previous['_captured_at']:
+                    # Keeps the first place in the dict, takes the newer fields
+                    found[record['URL']] = record
+        for found in by_category.values():
+            for record in found.values():
+                del record['_captured_at']
+        articles = [article for category in categories for article in by_category[category].values()]
+
+        captured = [article for article in articles if article['URL'] in pages]
+        hashes = [pages[article['URL']] for article in captured]
+        for article, content in zip(captured, executor_map(_parse_article, [store.root] * len(hashes), hashes)):
+            article['FullArticleText'] = content
+        for article in articles:
+            article.setdefault('FullArticleText', "")
+
+        print(f"Re-extracted {len(articles)} articles from {len(listings)} listing snapshots, "
+              f"{len(captured)} with a saved article page")
+        return articles
+
+    start = time.monotonic()
+    if workers <= 1:
+        articles = parse_all(map)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            articles = parse_all(lambda function, *iterables: executor.map(function, *iterables, chunksize=16))
+    print(f"Parsed snapshots in {time.monotonic() - start:.1f}s")
+    return articles
@@ -0,0 +1,174 @@
+import json
+import os
+
+import pandas as pd
+
+import config
+
+# Columns holding lists: native list<string> in Parquet, JSON strings in CSV
+LIST_COLUMNS = ['Topics']
+
+_EXTENSIONS = {"parquet": ".parquet", "csv": ".csv"}
+
+def _to_list(value) -> list:
+    """Turn a stored Topics value (JSON string, array or list) into a list of strings"""
+    if isinstance(value, str):
+        try:
+            value = json.loads(value) if value else []
+        except json.JSONDecodeError:
+            return [value]
+    if value is None or (isinstance(value, float) and pd.isna(value)):
+        return []
+    if isinstance(value, (list, tuple)) or hasattr(value, "tolist"):
+        return [str(item) for item in list(value)]
+    return [str(value)]
+
+def _to_json(value) -> str:
+    """Turn a list (or an already encoded value) into the JSON string stored in CSV"""
+    if isinstance(value, str):
+        return value
+    return json.dumps(_to_list(value), ensure_ascii=False)
+
+def _apply_filters(df: pd.DataFrame, filters) -> pd.DataFrame:
+    """
+    Apply pyarrow-style [(column, op, value), ...] filters to a DataFrame
+    """
+    mask = pd.Series(True, index=df.index)
+    for column, op, value in filters:
+        if op in ("=", "=="):
+            mask &= df[column] == value
+        elif op == "!=":
+            mask &= df[column] != value
+        elif op == "in":
+            mask &= df[column].isin(value)
+        elif op == "not in":
+            mask &= ~df[column].isin(value)
+        else:
+            raise ValueError(f"Unsupported filter operator: {op}")
+    return df[mask]
+
+class CsvStorage:
+    """
+    Quoted CSV tables; list columns are stored as JSON strings
+    """
+
+    format = "csv"
+
+    def read(self, path: str, columns: list = None, filters: list = None, **csv_options) -> pd.DataFrame:
+        df = pd.read_csv(path, usecols=columns, **csv_options)
+        if filters:
+            df = _apply_filters(df, filters)
+        for column in LIST_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].map(_to_list)
+        return df
+
+    def write(self, df: pd.DataFrame, path: str):
+        df = df.copy()
+        for column in LIST_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].map(_to_json)
+        # Quotes are doubled, not escaped, so pandas and the csv module read the text back unchanged
+        df.to_csv(path, index=False, encoding='utf-8', quoting=1, quotechar='"')
+
+class ParquetStorage:
+    """
+    Columnar Parquet tables (via pyarrow); list columns are native lists.
+
+    Only the requested columns are read, and filters are pushed down to
+    the row groups, so loading a slice of a large corpus stays cheap.
+    """
+
+    format = "parquet"
+
+    def read(self, path: str, columns: list = None, filters: list = None, dtype=None,
+             keep_default_na: bool = True, **_) -> pd.DataFrame:
+        df = pd.read_parquet(path, engine="pyarrow", columns=columns, filters=filters)
+        # The read_csv options that change values are applied here, so both backends agree
+        scalar_columns = [column for column in df.columns if column not in LIST_COLUMNS]
+        if dtype is str:
+            # Missing cells stay missing, as read_csv leaves them
+            df[scalar_columns] = df[scalar_columns].astype(object).where(
+                df[scalar_columns].isna(), df[scalar_columns].astype(str)
+            )
+        if not keep_default_na:
+            df[scalar_columns] = df[scalar_columns].astype(object).fillna("")
+        for column in LIST_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].map(_to_list)
+        return df
+
+    def write(self, df: pd.DataFrame, path: str):
+        df = df.copy()
+        for column in LIST_COLUMNS:
+            if column in df.columns:
+                df[column] = df[column].map(_to_list)
+        df.to_parquet(path, engine="pyarrow", index=False, compression="zstd")
+
+_BACKENDS = {"csv": CsvStorage(), "parquet": ParquetStorage()}
+
+def get_backend(path: str):
+    """
+    Pick the storage backend from a file extension (config.STORAGE_FORMAT if there is none)
+    """
+    extension = os.path.splitext(path)[1].lower().lstrip(".")
+    return _BACKENDS.get(extension) or _BACKENDS[config.STORAGE_FORMAT]
+
+def table_path(base: str, storage_format: str = None) -> str:
+    """
+    Path of a table in the given format, e.g. data/analysis_summary.parquet
+
+    Args:
+        base: Path without extension
+        storage_format: "parquet" or "csv" (defaults to config.STORAGE_FORMAT)
+    """
+    return base + _EXTENSIONS[storage_format or config.STORAGE_FORMAT]
+
+def find_table(base: str) -> str:
+    """
+    The most recently written table for a base path, in any format.
+
+    Falls back to the configured format's path when none exists yet, so
+    the caller's "file not found" handling applies.
+    """
+    existing = [base + extension for extension in _EXTENSIONS.values() if os.path.exists(base + extension)]
+    if not existing:
+        return table_path(base)
+    return max(existing, key=os.path.getmtime)
+
+def read_table(path: str, columns: list = None, filters: list = None, **csv_options) -> pd.DataFrame:
+    """
+    Load a table with its format's backend
+
+    Args:
+        path: .parquet or .csv file
+        columns: Only load these columns
+        filters: [(column, op, value), ...] with op in ==, !=, in, not in
+        csv_options: Extra pandas.read_csv arguments; Parquet honours
+            dtype=str and keep_default_na=False and ignores the rest
+
+    Returns:
+        DataFrame with list columns (Topics) as Python lists
+    """
+    return get_backend(path).read(path, columns=columns, filters=filters, **csv_options)
+
+def write_table(df: pd.DataFrame, path: str, export_csv: bool = None):
+    """
+    Save a table with its format's backend
+
+    Parquet tables also get a CSV copy next to them when export_csv is set,
+    for spreadsheets and other tools that expect CSV.
+
+    Args:
+        df: Data to save
+        path: .parquet or .csv file
+        export_csv: Also write <path>.csv for Parquet tables (defaults to config.EXPORT_CSV)
+    """
+    export_csv = config.EXPORT_CSV if export_csv is None else export_csv
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    backend = get_backend(path)
+    # The export goes first so the primary table stays the newest (see find_table)
+    if export_csv and backend.format != "csv":
+        _BACKENDS["csv"].write(df, os.path.splitext(path)[0] + ".csv")
+    backend.write(df, path)
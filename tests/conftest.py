@@ -0,0 +1,17 @@
+import os
+import sys
+
+import pytest
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import config
+
+@pytest.fixture(autouse=True)
+def scratch_dir(tmp_path, monkeypatch):
+    """Run every test in its own directory, so outputs, journals and caches never touch the checkout"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(config, "SNAPSHOTS_ENABLED", False)
+    monkeypatch.setattr(config, "LISTING_ENDPOINTS_PATH", str(tmp_path / "listing_endpoints.json"))
+    return tmp_path
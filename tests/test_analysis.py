@@ -0,0 +1,194 @@
+import json
+import re
+import threading
+import time
+
+import pandas as pd
+import pytest
+
+import analysis
+from analysis import FAILURE_SUMMARIES, ArticleAnalyzer, RateLimiter
+from analysis_cache import AnalysisCache
+from fake_model import FakeGenerativeModel, FakeResponse
+
+class VirtualTime:
+    """Replaces the analysis module's `time`: sleeping advances a shared clock instead of waiting"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.lock = threading.Lock()
+
+    def monotonic(self):
+        with self.lock:
+            return self.now
+
+    def sleep(self, seconds):
+        with self.lock:
+            self.now += seconds
+
+    def time(self):
+        return time.time()
+
+class RecordingModel(FakeGenerativeModel):
+    """
+    FakeGenerativeModel that records call times and the most calls in flight at once
+
+    Answers name the article's `markerN` word, so results can be matched to their rows.
+    """
+
+    def __init__(self, clock=None, **kwargs):
+        super().__init__(**kwargs)
+        self.clock = clock
+        self.call_times = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    def generate_content(self, prompt, generation_config=None):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            if self.clock is not None:
+                self.call_times.append(self.clock.monotonic())
+        try:
+            response = super().generate_content(prompt, generation_config)
+            marker = re.search(r"marker\d+", str(prompt)).group(0)
+            return FakeResponse(json.dumps({"summary": f"An article about {marker}.", "topics": [marker]}))
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+
+@pytest.fixture
+def clock(monkeypatch):
+    virtual = VirtualTime()
+    monkeypatch.setattr(analysis, "time", virtual)
+    return virtual
+
+def write_articles(count: int, short: int = 0) -> str:
+    rows = [
+        {
+            "URL": f"https://example.com/article-{number}/",
+            "Title": f"Article {number}",
+            "FullArticleText": f"Article {number} covers produce logistics marker{number} in depth. " * 6,
+        }
+        for number in range(1, count + 1)
+    ]
+    rows += [{"URL": f"https://example.com/short-{n}/", "Title": "Short", "FullArticleText": "Too short"}
+             for n in range(short)]
+    pd.DataFrame(rows).to_csv("articles.csv", index=False)
+    return "articles.csv"
+
+def analyze(model, input_path: str, **kwargs) -> pd.DataFrame:
+    options = dict(concurrency=4, requests_per_minute=10 ** 6, tokens_per_minute=10 ** 9,
+                   incremental=False, batch_token_budget=0, dedup=False)
+    options.update(kwargs)
+    ArticleAnalyzer(model=model).process_csv(input_path, "analysis.csv", **options)
+    return pd.read_csv("analysis.csv", keep_default_na=False)
+
+def test_concurrent_run_analyzes_every_row():
+    model = RecordingModel(latency=0.05)
+    result = analyze(model, write_articles(16, short=1), concurrency=8)
+
+    assert len(result) == 17
+    assert (result["ProcessingStatus"] == "success").sum() == 16
+    assert result.loc[result["URL"].str.contains("short"), "ProcessingStatus"].tolist() == ["skipped_short_text"]
+    assert model.calls == 16
+    assert 1 < model.max_in_flight <= 8
+    # Each row keeps its own analysis, whatever order the workers finished in
+    for _, row in result[result["ProcessingStatus"] == "success"].iterrows():
+        number = row["URL"].rstrip("/").rsplit("-", 1)[1]
+        assert json.loads(row["Topics"]) == [f"marker{number}"]
+
+def test_requests_per_minute_budget_is_respected(clock):
+    model = RecordingModel(clock=clock)
+    result = analyze(model, write_articles(12), concurrency=4, requests_per_minute=5)
+
+    assert (result["ProcessingStatus"] == "success").all()
+    times = sorted(model.call_times)
+    assert len(times) == 12
+    # No sliding one-minute window holds more than 5 calls
+    for first, sixth in zip(times, times[5:]):
+        assert sixth - first >= 60
+
+def test_tokens_per_minute_budget_blocks_until_the_window_frees(clock):
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=1000)
+    limiter.acquire(400)
+    limiter.acquire(400)
+    assert clock.now == 0
+    limiter.acquire(400)
+    assert clock.now >= 60
+
+def test_failed_calls_are_retried_and_reported(clock):
+    model = RecordingModel(clock=clock, failure_rate=0.5, seed=7)
+    result = analyze(model, write_articles(20), concurrency=4)
+
+    # Three attempts per article at most, and at least one retry happened
+    assert 20 < model.calls <= 60
+    failed = result["Summary"].isin(FAILURE_SUMMARIES)
+    assert failed.any() and not failed.all()
+    assert (result.loc[failed, "Topics"] == "[]").all()
+    assert (result.loc[failed, "ProcessingStatus"] == "error").all()
+    assert (result.loc[~failed, "Topics"].map(json.loads).map(len) > 0).all()
+
+class FailingChunkModel(FakeGenerativeModel):
+    """FakeGenerativeModel whose calls for one chunk of a long article always fail"""
+
+    def generate_content(self, prompt, generation_config=None):
+        if "part 2 of" in str(prompt):
+            with self.lock:
+                self.calls += 1
+            raise RuntimeError("chunk call failed")
+        return super().generate_content(prompt, generation_config)
+
+def test_long_article_with_a_failed_chunk_fails_and_is_not_cached(clock, monkeypatch):
+    monkeypatch.setattr(analysis.config, "LONG_ARTICLE_TOKEN_THRESHOLD", 200)
+    monkeypatch.setattr(analysis.config, "CHUNK_TOKENS", 100)
+    article = "Growers report steady demand for fresh produce across the region this season. " * 40
+    cache = AnalysisCache("cache.sqlite")
+    try:
+        analyzer = ArticleAnalyzer(model=FailingChunkModel(), cache=cache)
+        summary, topics, status = analyzer.analyze_row(0, article)
+
+        assert summary in FAILURE_SUMMARIES
+        assert (topics, status) == ("[]", "error")
+        assert cache.stats()["entries"] == 0
+    finally:
+        cache.close()
+
+def test_a_run_keeps_the_metrics_recorded_before_it():
+    # e.g. the warm worker's own counters, recorded before it runs an analysis job
+    analysis.metrics.increment("worker_jobs_seen_total")
+    analyze(RecordingModel(), write_articles(2))
+
+    counters = {counter["name"] for counter in analysis.metrics.REGISTRY.report()["counters"]}
+    assert {"worker_jobs_seen_total", "analysis_articles_total"} <= counters
+
+def test_serial_run_is_paced_by_the_rate_limiter_only(clock):
+    model = RecordingModel(clock=clock)
+    result = analyze(model, write_articles(8), concurrency=1, requests_per_minute=10 ** 6)
+
+    assert (result["ProcessingStatus"] == "success").all()
+    assert clock.now == 0
+
+def write_articles_with_repost(count: int) -> str:
+    df = pd.read_csv(write_articles(count))
+    repost = df.iloc[0].copy()
+    repost["URL"] = "https://example.com/repost-of-article-1/"
+    repost["FullArticleText"] += " Reposted."
+    pd.concat([df, repost.to_frame().T], ignore_index=True).to_csv("articles.csv", index=False)
+    return "articles.csv"
+
+def test_near_duplicates_share_one_analysis_across_incremental_runs():
+    model = RecordingModel()
+    input_path = write_articles_with_repost(4)
+    first = analyze(model, input_path, dedup=True, incremental=True)
+
+    assert model.calls == 4
+    repost = first["URL"].str.contains("repost")
+    assert first.loc[repost, "DuplicateOf"].tolist() == ["https://example.com/article-1/"]
+    assert first.loc[repost, "Topics"].tolist() == [first.loc[0, "Topics"]]
+    assert (first.loc[~repost, "DuplicateOf"] == "").all()
+
+    # Every row is reused on the next run, and the duplicate keeps its link
+    second = analyze(model, input_path, dedup=True, incremental=True)
+    assert model.calls == 4
+    assert second["DuplicateOf"].tolist() == first["DuplicateOf"].tolist()
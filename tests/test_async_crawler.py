@@ -0,0 +1,47 @@
+import asyncio
+
+import pytest
+
+import listing_api
+from async_crawler import AsyncCrawler, IncompleteListingError
+from benchmarks.fixture_site import FixtureSite
+
+def crawl(site: FixtureSite) -> list:
+    crawler = AsyncCrawler(base_url=site.base_url, requests_per_second=1000, burst=50)
+    return asyncio.run(crawler.crawl())
+
+def save_fixture_endpoint(site: FixtureSite):
+    api_url = site.base_url.replace("/resources", "/api/search")
+    for category in site.categories:
+        listing_api.save_endpoint(category, listing_api.ListingEndpoint.from_request_url(
+            f"{api_url}?category={category}&offset={site.page_size}&limit={site.page_size}"
+        ))
+
+def test_crawls_single_page_listings_and_articles():
+    with FixtureSite(articles_per_category=10, page_size=12) as site:
+        articles = crawl(site)
+
+    assert len(articles) == 10 * len(site.categories)
+    assert all(len(article['FullArticleText']) > 100 for article in articles)
+    first_category = [article['URL'] for article in articles[:10]]
+    assert first_category == [
+        f"{site.base_url}/{site.categories[0]}/article-{number}/" for number in range(1, 11)
+    ]
+
+def test_pages_through_the_saved_search_endpoint():
+    with FixtureSite(articles_per_category=30, page_size=12) as site:
+        save_fixture_endpoint(site)
+        articles = crawl(site)
+
+    assert len(articles) == 30 * len(site.categories)
+    assert len({article['URL'] for article in articles}) == len(articles)
+    assert all(len(article['FullArticleText']) > 100 for article in articles)
+    first_category = [article['URL'] for article in articles[:30]]
+    assert first_category == [
+        f"{site.base_url}/{site.categories[0]}/article-{number}/" for number in range(1, 31)
+    ]
+
+def test_fails_loudly_when_load_more_results_are_unreachable():
+    with FixtureSite(articles_per_category=30, page_size=12) as site:
+        with pytest.raises(IncompleteListingError, match="reports 30 results"):
+            crawl(site)
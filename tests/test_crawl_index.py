@@ -0,0 +1,66 @@
+import scrapper
+from crawl_index import CrawlIndex
+
+ARTICLE_HTML = "<html><body><main><article>{}</article></main></body></html>"
+
+class StubResponse:
+    def __init__(self, text, status_code=200, headers=None):
+        self.text = text
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        pass
+
+class StubSession:
+    """Serves one page, optionally with validators, and records the request headers"""
+
+    def __init__(self, body, headers=None):
+        self.body = body
+        self.headers = headers or {}
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None):
+        self.requests.append(headers or {})
+        if self.headers.get("ETag") and (headers or {}).get("If-None-Match") == self.headers["ETag"]:
+            return StubResponse("", 304)
+        return StubResponse(ARTICLE_HTML.format(self.body), headers=self.headers)
+
+def no_browser():
+    raise AssertionError("the browser should not be needed")
+
+def test_page_without_validators_is_refetched_and_changes_are_picked_up():
+    index = CrawlIndex("index.sqlite", refresh_hours=1000)
+    url = "https://example.com/article/"
+    old_text = "The original article text. " * 10
+    new_text = "The corrected article text. " * 10
+    index.record(url, old_text)
+
+    session = StubSession(new_text)
+    content = scrapper._fetch_article_body(url, no_browser, session, index)
+
+    assert len(session.requests) == 1
+    assert content == new_text.strip()
+    assert index.get(url)["text"] == new_text.strip()
+    index.close()
+
+def test_page_with_validators_is_revalidated_conditionally():
+    index = CrawlIndex("index.sqlite")
+    url = "https://example.com/article/"
+    text = "Article text that has not changed. " * 10
+    session = StubSession(text, headers={"ETag": '"v1"'})
+
+    assert scrapper._fetch_article_body(url, no_browser, session, index) == text.strip()
+    assert scrapper._fetch_article_body(url, no_browser, session, index) == text.strip()
+    assert session.requests[1] == {"If-None-Match": '"v1"'}
+    index.close()
+
+def test_browser_only_pages_are_reused_until_they_expire():
+    index = CrawlIndex("index.sqlite", refresh_hours=1)
+    url = "https://example.com/article/"
+    index.record(url, "Rendered by script. " * 10)
+
+    # The static HTML has no usable content, so only a browser could refresh it
+    session = StubSession("")
+    assert scrapper._fetch_article_body(url, no_browser, session, index) == ("Rendered by script. " * 10)
+    index.close()
@@ -0,0 +1,27 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+import pipeline
+import scrapper
+from analysis import ArticleAnalyzer
+from fake_model import FakeGenerativeModel
+
+def test_browser_start_failure_stops_the_pipeline(monkeypatch):
+    def broken_driver(*args, **kwargs):
+        raise RuntimeError("Chrome failed to start")
+
+    monkeypatch.setattr(scrapper, "setup_driver", broken_driver)
+    analyzer = ArticleAnalyzer(model=FakeGenerativeModel())
+
+    # Run aside, so a hang fails the test instead of blocking it
+    executor = ThreadPoolExecutor(max_workers=1)
+    future = executor.submit(
+        pipeline.run_pipeline, categories=["technology"], analysis_workers=2, analyzer=analyzer,
+        scraped_output="scraped.csv", analysis_output="analysis.csv"
+    )
+    try:
+        with pytest.raises(RuntimeError, match="Chrome failed to start"):
+            future.result(timeout=20)
+    finally:
+        executor.shutdown(wait=False)
@@ -0,0 +1,48 @@
+import json
+
+import snapshots
+from snapshots import LISTING_API, SnapshotStore, reextract
+
+API_URL = "https://www.freshproduce.com/api/search?category=technology&offset={offset}"
+
+def save_page(store: SnapshotStore, run_id: str, position: int, numbers: list, title: str = "Article {}"):
+    payload = {"results": [
+        {"title": title.format(number), "url": f"/resources/technology/article-{number}/"} for number in numbers
+    ]}
+    store.save(LISTING_API, API_URL.format(offset=position * 2), json.dumps(payload), "technology",
+               run_id=run_id, position=position)
+
+def test_reextract_uses_only_the_newest_run_in_page_order(tmp_path):
+    store = SnapshotStore(str(tmp_path / "snapshots"))
+    # An older crawl reached a page the newer one did not
+    save_page(store, "old", 0, [1, 2])
+    save_page(store, "old", 1, [3, 4])
+    save_page(store, "old", 2, [5])
+
+    # The newer crawl's pages are captured out of order, and article 2 shifts onto page 1
+    save_page(store, "new", 1, [2, 3], title="Renamed {}")
+    save_page(store, "new", 0, [1, 2])
+
+    articles = reextract(store, categories=["technology"], workers=1)
+    store.close()
+
+    assert [article['URL'].rsplit("/", 2)[1] for article in articles] == ["article-1", "article-2", "article-3"]
+    # A duplicate keeps its first place and takes the fields of its newest capture
+    assert [article['Title'] for article in articles] == ["Article 1", "Article 2", "Renamed 3"]
+
+def test_record_groups_captures_by_run(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshots.config, "SNAPSHOTS_ENABLED", True)
+    monkeypatch.setattr(snapshots.config, "SNAPSHOT_DIR", str(tmp_path / "snapshots"))
+    monkeypatch.setattr(snapshots, "_default_store", None)
+
+    snapshots.new_run()
+    snapshots.record(LISTING_API, API_URL.format(offset=0), '{"results": []}', "technology", position=0)
+    snapshots.new_run()
+    snapshots.record(LISTING_API, API_URL.format(offset=2), '{"results": [1]}', "technology", position=1)
+    snapshots.record(LISTING_API, API_URL.format(offset=0), '{"results": [0]}', "technology", position=0)
+
+    store = snapshots._default_store
+    assert [capture['url'] for capture in store.newest_run("technology")] == [
+        API_URL.format(offset=0), API_URL.format(offset=2)
+    ]
+    store.close()
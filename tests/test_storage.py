@@ -0,0 +1,31 @@
+import pandas as pd
+
+from storage import read_table, write_table
+
+def test_parquet_and_csv_read_the_same_strings(tmp_path):
+    df = pd.DataFrame({
+        "URL": ["https://example.com/a/", "https://example.com/b/"],
+        "Views": [12, None],
+        "Summary": ["Fine", None],
+        "Topics": [["produce"], []],
+    })
+    tables = {}
+    for extension in ("parquet", "csv"):
+        path = str(tmp_path / f"table.{extension}")
+        write_table(df, path, export_csv=False)
+        tables[extension] = read_table(path, dtype=str, keep_default_na=False)
+
+    parquet, csv = tables["parquet"], tables["csv"]
+    assert parquet["Summary"].tolist() == csv["Summary"].tolist() == ["Fine", ""]
+    assert parquet["Views"].tolist() == csv["Views"].tolist() == ["12.0", ""]
+    assert parquet["Topics"].tolist() == csv["Topics"].tolist() == [["produce"], []]
+
+def test_csv_round_trip_keeps_backslashes_and_quotes(tmp_path):
+    text = 'C:\\path\\ end\\ and "quoted", \\"escaped\\"'
+    path = str(tmp_path / "table.csv")
+    write_table(pd.DataFrame({"URL": ["https://example.com/a/"], "FullArticleText": [text]}), path)
+
+    for _ in range(2):
+        df = read_table(path, dtype=str, keep_default_na=False)
+        write_table(df, path)
+    assert read_table(path, dtype=str, keep_default_na=False)["FullArticleText"].tolist() == [text]
@@ -0,0 +1,63 @@
+import pytest
+
+import config
+import main
+from scrapper import save_scraped_articles
+from storage import read_table
+from text_cleaning import BoilerplateRemover, add_clean_text
+
+def make_articles(footer: str, count: int = 6) -> list:
+    return [
+        {"Title": f"Article {n}", "Category": "technology",
+         "FullArticleText": f"Article {n}\nBody of article {n}.\n{footer}\nSign up for the newsletter"}
+        for n in range(count)
+    ]
+
+def test_saved_model_keeps_clean_text_stable_between_runs(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "BOILERPLATE_MODEL_PATH", str(tmp_path / "boilerplate.json"))
+
+    first = make_articles("Old footer")
+    add_clean_text(first)
+    assert first[0]["CleanArticleText"] == "Body of article 0."
+
+    # A later run with other repeated lines reuses the saved model instead of relearning it
+    second = make_articles("New footer")
+    add_clean_text(second)
+    assert second[0]["CleanArticleText"] == "Body of article 0.\nNew footer"
+    assert "old footer" in BoilerplateRemover.load().boilerplate
+
+def test_refit_relearns_and_recleans_every_article(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "BOILERPLATE_MODEL_PATH", str(tmp_path / "boilerplate.json"))
+    add_clean_text(make_articles("Old footer"))
+
+    articles = make_articles("New footer")
+    for article in articles:
+        article["CleanArticleText"] = "stale"
+    add_clean_text(articles, refit=True)
+
+    assert articles[0]["CleanArticleText"] == "Body of article 0."
+    assert "new footer" in BoilerplateRemover.load().boilerplate
+
+@pytest.mark.parametrize("extension", ["csv", "parquet"])
+def test_refit_from_the_saved_table_strips_boilerplate(monkeypatch, tmp_path, extension):
+    monkeypatch.setattr(config, "BOILERPLATE_MODEL_PATH", str(tmp_path / "boilerplate.json"))
+    path = str(tmp_path / f"scraped.{extension}")
+    articles = [{**article, "URL": f"https://example.com/{n}/"}
+                for n, article in enumerate(make_articles("Footer links"))]
+    save_scraped_articles(articles, path)
+
+    assert main.main(["clean-text", "--input", path, "--refit"]) == 0
+
+    assert "footer links" in BoilerplateRemover.load().boilerplate
+    table = read_table(path, dtype=str, keep_default_na=False)
+    assert table["CleanArticleText"].tolist()[0] == "Body of article 0."
+
+def test_refit_refuses_flattened_text(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "BOILERPLATE_MODEL_PATH", str(tmp_path / "boilerplate.json"))
+    add_clean_text(make_articles("Old footer"))
+    flattened = [{**article, "FullArticleText": article["FullArticleText"].replace("\n", " ")}
+                 for article in make_articles("New footer")]
+
+    with pytest.raises(ValueError, match="no line breaks"):
+        add_clean_text(flattened, refit=True)
+    assert "old footer" in BoilerplateRemover.load().boilerplate
@@ -0,0 +1,42 @@
+import pytest
+
+import config
+from benchmarks.fixture_site import FixtureSite
+from scrapper import setup_http_session
+from test_async_crawler import save_fixture_endpoint
+from worker import BrowserPool, LazyLease, WorkerDaemon
+
+def test_lazy_lease_borrows_a_browser_only_when_used():
+    lease = LazyLease(BrowserPool(0))
+    lease.quit()
+    with pytest.raises(RuntimeError, match="without browsers"):
+        lease.get("https://example.com/")
+
+@pytest.fixture
+def http_worker(monkeypatch):
+    monkeypatch.setattr(config, "LISTING_MODE", "api")
+    daemon = WorkerDaemon(browsers=0, load_model=False)
+    daemon.session = setup_http_session(4, delay=0)
+    yield daemon
+    daemon.session.close()
+
+def test_category_job_runs_without_browsers(http_worker):
+    with FixtureSite(articles_per_category=20, page_size=12) as site:
+        save_fixture_endpoint(site)
+        articles = http_worker._job_category({"category": site.categories[0], "base_url": site.base_url})
+
+    assert len(articles) == 20
+    assert all(len(article['FullArticleText']) > 100 for article in articles)
+
+def test_each_category_job_fetches_the_bodies_again(http_worker):
+    with FixtureSite(articles_per_category=5, page_size=12) as site:
+        save_fixture_endpoint(site)
+        job = {"category": site.categories[0], "base_url": site.base_url}
+        http_worker._job_category(job)
+        requests_before = site.requests
+        articles = http_worker._job_category(job)
+        second_job_requests = site.requests - requests_before
+
+    # One listing request plus every article page, not bodies resumed from the first job
+    assert len(articles) == 5
+    assert second_job_requests >= 1 + 5
@@ -0,0 +1,169 @@
+import json
+import os
+import re
+import unicodedata
+from collections import Counter
+
+import config
+
+# Zero-width and other invisible characters left over from page markup
+_INVISIBLE_CHARS = re.compile("[\u200b\u200c\u200d\u2060\ufeff\u00ad]")
+
+def normalize_line(line: str) -> str:
+    """
+    Normalize one line of text: NFKC, no invisible characters, single spaces
+    """
+    line = unicodedata.normalize("NFKC", line)
+    line = _INVISIBLE_CHARS.sub("", line)
+    return " ".join(line.split())
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize every line of a text and drop the empty ones
+    """
+    lines = (normalize_line(line) for line in str(text).splitlines())
+    return "\n".join(line for line in lines if line)
+
+def _line_key(line: str) -> str:
+    """Case-insensitive comparison key for a normalized line"""
+    return line.casefold()
+
+class BoilerplateRemover:
+    """
+    Strips site boilerplate learned from a set of scraped pages.
+
+    A line that appears on many different pages (navigation, footer links,
+    newsletter prompts, cookie notices) is boilerplate. Lines are counted
+    once per page, and any line found on at least `min_fraction` of the
+    pages, and on at least `min_pages` of them, is removed from every page.
+    The article's own title and category eyebrow are dropped as well, since
+    both are stored in their own columns.
+    """
+
+    def __init__(self, min_fraction: float = None, min_pages: int = None):
+        """
+        Args:
+            min_fraction: Share of pages a line must appear on
+                (defaults to config.BOILERPLATE_MIN_FRACTION)
+            min_pages: Minimum number of pages a line must appear on
+                (defaults to config.BOILERPLATE_MIN_PAGES)
+        """
+        self.min_fraction = min_fraction if min_fraction is not None else config.BOILERPLATE_MIN_FRACTION
+        self.min_pages = min_pages if min_pages is not None else config.BOILERPLATE_MIN_PAGES
+        self.boilerplate = set()
+        self.pages_seen = 0
+
+    def fit(self, texts) -> "BoilerplateRemover":
+        """
+        Learn the boilerplate lines of a corpus
+
+        Args:
+            texts: Iterable of raw page texts, one line per block
+
+        Returns:
+            self
+        """
+        counts = Counter()
+        pages = 0
+        for text in texts:
+            if not isinstance(text, str) or not text.strip():
+                continue
+            pages += 1
+            counts.update({_line_key(line) for line in normalize_text(text).split("\n")})
+
+        threshold = max(self.min_pages, self.min_fraction * pages)
+        self.boilerplate = {line for line, count in counts.items() if count >= threshold}
+        self.pages_seen = pages
+        return self
+
+    def clean(self, text: str, title: str = None, category: str = None) -> str:
+        """
+        Normalize a page's text and remove boilerplate from it
+
+        Args:
+            text: Raw page text
+            title: Article title; matching lines are dropped
+            category: Category slug; matching eyebrow lines are dropped
+
+        Returns:
+            Cleaned text, one paragraph per line
+        """
+        if not isinstance(text, str):
+            return ""
+
+        drop = set(self.boilerplate)
+        if title:
+            drop.add(_line_key(normalize_line(title)))
+        if category:
+            drop.add(_line_key(category.replace("-", " ")))
+
+        lines = [line for line in normalize_text(text).split("\n") if _line_key(line) not in drop]
+        return "\n".join(lines)
+
+    def save(self, path: str = None):
+        """
+        Store the learned boilerplate so later runs (e.g. the streaming
+        pipeline, which never sees the whole corpus) can reuse it
+        """
+        path = path or config.BOILERPLATE_MODEL_PATH
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"pages_seen": self.pages_seen, "lines": sorted(self.boilerplate)},
+                      f, ensure_ascii=False, indent=2)
+
+    @classmethod
+    def load(cls, path: str = None) -> "BoilerplateRemover":
+        """
+        Load saved boilerplate; a missing file gives a remover that only
+        normalizes whitespace and drops titles
+        """
+        path = path or config.BOILERPLATE_MODEL_PATH
+        remover = cls()
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            remover.boilerplate = set(data.get("lines", []))
+            remover.pages_seen = data.get("pages_seen", 0)
+        return remover
+
+def add_clean_text(articles: list, remover: BoilerplateRemover = None, refit: bool = False) -> BoilerplateRemover:
+    """
+    Set 'CleanArticleText' on each article that does not have it yet.
+
+    Without a remover, the saved boilerplate is used, so an article's clean
+    text stays the same from run to run and the analysis cache and the
+    incremental checks keep matching it. Boilerplate is learned from the
+    articles only when nothing has been saved yet, or when `refit` asks for
+    it; a refit recleans every article and saves the new model.
+
+    Args:
+        articles: Article dictionaries with 'FullArticleText'
+        remover: BoilerplateRemover to use
+        refit: Learn the boilerplate again from these articles
+
+    Returns:
+        The remover that was used
+
+    Raises:
+        ValueError if refit is set and the texts have no line breaks
+    """
+    if remover is None:
+        if refit or not os.path.exists(config.BOILERPLATE_MODEL_PATH):
+            texts = [article.get('FullArticleText') for article in articles]
+            # Text flattened onto one line (e.g. by an older scraper version) has no lines to learn from
+            if not any(isinstance(text, str) and "\n" in text for text in texts):
+                if refit:
+                    raise ValueError("Cannot learn boilerplate: the article texts have no line breaks")
+            elif len(texts) >= config.BOILERPLATE_MIN_PAGES:
+                remover = BoilerplateRemover().fit(texts)
+                remover.save()
+        if remover is None:
+            remover = BoilerplateRemover.load()
+
+    # Articles carried forward from an earlier run are already cleaned, unless the model was refit
+    pending = articles if refit else [article for article in articles if not article.get('CleanArticleText')]
+    for article in pending:
+        article['CleanArticleText'] = remover.clean(
+            article.get('FullArticleText'), article.get('Title'), article.get('Category')
+        )
+    return remover
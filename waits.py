@@ -0,0 +1,197 @@
+"""
+Event-driven waits for the Selenium listing crawler.
+
+Instead of sleeping for a fixed time after every navigation, click and
+scroll, the crawler waits for the thing it actually needs: tiles to appear,
+the tile count to grow after a "Load More" click, in-flight XHR/fetch
+requests to finish, or the DOM to stop changing.
+"""
+import re
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.common.by import By
+from selenium.webdriver.support.ui import WebDriverWait
+
+# How often the Python-side conditions are re-evaluated, in seconds
+POLL_FREQUENCY = 0.1
+
+# Counts in-flight fetch/XHR requests in window.__pendingRequests, the time of
+# the last network activity in window.__lastNetworkActivity and the requested
+# URLs in window.__requestUrls
+NETWORK_TRACKER_SCRIPT = """
+if (window.__pendingRequests === undefined) {
+  window.__pendingRequests = 0;
+  window.__lastNetworkActivity = performance.now();
+  window.__requestUrls = [];
+  var started = function (url) {
+    window.__pendingRequests += 1;
+    window.__lastNetworkActivity = performance.now();
+    if (url) { window.__requestUrls.push(new URL(String(url), location.href).href); }
+  };
+  var finished = function () {
+    window.__pendingRequests = Math.max(0, window.__pendingRequests - 1);
+    window.__lastNetworkActivity = performance.now();
+  };
+  if (window.fetch) {
+    var originalFetch = window.fetch;
+    window.fetch = function (resource) {
+      started(resource && resource.url ? resource.url : resource);
+      return originalFetch.apply(this, arguments).then(
+        function (response) { finished(); return response; },
+        function (error) { finished(); throw error; }
+      );
+    };
+  }
+  var originalOpen = XMLHttpRequest.prototype.open;
+  XMLHttpRequest.prototype.open = function (method, url) {
+    this.__trackedUrl = url;
+    return originalOpen.apply(this, arguments);
+  };
+  var originalSend = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    started(this.__trackedUrl);
+    this.addEventListener("loadend", finished);
+    return originalSend.apply(this, arguments);
+  };
+}
+"""
+
+NETWORK_IDLE_SCRIPT = """
+return window.__pendingRequests === 0
+  && performance.now() - window.__lastNetworkActivity >= arguments[0];
+"""
+
+# Resolves once the subtree under arguments[0] (or <body>) has had no mutation
+# for arguments[1] ms, or after arguments[2] ms at the latest; returns the
+# number of mutations seen
+DOM_QUIET_SCRIPT = """
+var target = document.querySelector(arguments[0]) || document.body;
+var quietMs = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var mutations = 0, finished = false, quietTimer, deadline;
+var observer = new MutationObserver(function (records) {
+  mutations += records.length;
+  clearTimeout(quietTimer);
+  quietTimer = setTimeout(finish, quietMs);
+});
+function finish() {
+  if (finished) { return; }
+  finished = true;
+  observer.disconnect();
+  clearTimeout(quietTimer);
+  clearTimeout(deadline);
+  done(mutations);
+}
+observer.observe(target, {childList: true, subtree: true, attributes: true, characterData: true});
+quietTimer = setTimeout(finish, quietMs);
+deadline = setTimeout(finish, timeoutMs);
+"""
+
+_STATS_PATTERN = re.compile(r"(\d[\d,]*)\s*(?:-\s*(\d[\d,]*))?\s+of\s+(\d[\d,]*)", re.IGNORECASE)
+
+def parse_search_stats(text: str):
+    """
+    Parse a listing's "Showing 1-12 of 87 results" line
+
+    Args:
+        text: Text of the `div.search-stats p` element
+
+    Returns:
+        Tuple of (last result shown, total results), or None if the text does not match
+    """
+    match = _STATS_PATTERN.search(text or "")
+    if match is None:
+        return None
+    first, last, total = (int(group.replace(",", "")) if group else None for group in match.groups())
+    return (last if last is not None else first), total
+
+def count_elements(driver, css_selector: str) -> int:
+    return len(driver.find_elements(By.CSS_SELECTOR, css_selector))
+
+def wait_for_elements(driver, css_selector: str, timeout: float) -> int:
+    """
+    Wait until at least one element matches the selector
+
+    Returns:
+        Number of matching elements; 0 if none appeared before the timeout
+    """
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(
+            lambda d: count_elements(d, css_selector)
+        )
+    except TimeoutException:
+        return 0
+
+def install_network_tracker(driver):
+    """
+    Start counting the page's fetch/XHR requests; needed by network-idle waits
+    """
+    driver.execute_script(NETWORK_TRACKER_SCRIPT)
+
+def tracked_request_urls(driver) -> list:
+    """URLs of the fetch/XHR requests seen since install_network_tracker()"""
+    try:
+        return driver.execute_script("return window.__requestUrls || [];") or []
+    except WebDriverException:
+        return []
+
+def network_idle(driver, idle_ms: int) -> bool:
+    """True when no tracked request is in flight and none ended in the last idle_ms"""
+    try:
+        return bool(driver.execute_script(NETWORK_IDLE_SCRIPT, idle_ms))
+    except WebDriverException:
+        return False
+
+def wait_for_count_change(driver, css_selector: str, previous: int, timeout: float,
+                          idle_ms: int) -> int:
+    """
+    Wait for the number of matching elements to change after an action
+
+    Gives up early when the network has gone idle and the count is still the
+    same, e.g. after a click that loaded nothing.
+
+    Args:
+        driver: Selenium WebDriver instance
+        css_selector: Elements to count, e.g. the listing tiles
+        previous: Count before the action
+        timeout: Upper bound in seconds
+        idle_ms: Quiet network period after which an unchanged count is final
+
+    Returns:
+        New element count (equal to `previous` if nothing changed)
+    """
+    start = time.monotonic()
+
+    def settled(d):
+        # Wrapped in a tuple because a count of 0 would make until() keep waiting
+        count = count_elements(d, css_selector)
+        if count != previous:
+            return (count,)
+        # The action may start its request a little late; give it idle_ms first
+        if time.monotonic() - start >= idle_ms / 1000 and network_idle(d, idle_ms):
+            return (count,)
+        return False
+
+    try:
+        return WebDriverWait(driver, timeout, poll_frequency=POLL_FREQUENCY).until(settled)[0]
+    except TimeoutException:
+        return count_elements(driver, css_selector)
+
+def wait_for_dom_quiet(driver, css_selector: str, quiet_ms: int, timeout: float) -> int:
+    """
+    Wait until the DOM under the selector stops changing, using a MutationObserver
+
+    Args:
+        driver: Selenium WebDriver instance
+        css_selector: Subtree to observe; the whole body if nothing matches
+        quiet_ms: Milliseconds without a mutation that count as settled
+        timeout: Upper bound in seconds
+
+    Returns:
+        Number of mutations observed while waiting (0 if the script failed)
+    """
+    try:
+        return driver.execute_async_script(DOM_QUIET_SCRIPT, css_selector, quiet_ms, int(timeout * 1000)) or 0
+    except WebDriverException:
+        return 0
@@ -0,0 +1,462 @@
+"""
+Warm worker daemon for repeated small scrape and analysis jobs.
+
+Starting Chrome and initializing Vertex AI take longer than scraping one
+category or summarizing a handful of articles. The daemon pays for that
+once: it keeps a pool of browser sessions, a pooled HTTP session and an
+ArticleAnalyzer alive, and accepts jobs from local clients over a
+`multiprocessing.connection` socket authenticated with a shared key.
+
+Start it and send jobs with:
+
+    python worker.py serve [--browsers 3] [--no-browser] [--fake-model]
+    python worker.py health
+    python worker.py stop
+
+or from Python:
+
+    with WorkerClient() as client:
+        articles = client.submit({"type": "category", "category": "technology"})
+
+Jobs are dictionaries with a "type":
+
+- "health": uptime, jobs done, browser page counts; answered even while a job runs
+- "category": scrape one category ("category", optional "base_url", "output")
+- "urls": fetch article bodies ("urls")
+- "analyze": summarize a table ("input", optional "output", "concurrency", ...)
+  or a list of texts ("texts")
+- "shutdown": stop the daemon
+
+Browsers are restarted after config.WORKER_RECYCLE_PAGES page loads, and
+whenever one stops responding, so long-lived sessions do not grow without
+bound.
+"""
+import argparse
+import json
+import os
+import queue
+import secrets
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing.connection import Client, Listener
+
+import config
+import metrics
+
+class WarmBrowser:
+    """
+    One Chrome session that is restarted after a number of page loads
+    """
+
+    def __init__(self, recycle_pages: int):
+        self.recycle_pages = recycle_pages
+        self.driver = None
+        self.pages = 0
+        self.recycles = 0
+
+    def alive(self) -> bool:
+        try:
+            self.driver.execute_script("return 1")
+            return True
+        except Exception:
+            return False
+
+    def ensure_ready(self):
+        """Start the browser, or restart it if it is worn out or unresponsive"""
+        if self.driver is not None and (self.pages >= self.recycle_pages or not self.alive()):
+            self.quit()
+            self.recycles += 1
+            metrics.increment("worker_browser_recycles_total")
+
+        if self.driver is None:
+            from scrapper import setup_driver
+            with metrics.span("worker_browser_start"):
+                self.driver = setup_driver()
+            self.pages = 0
+
+    def quit(self):
+        if self.driver is not None:
+            try:
+                self.driver.quit()
+            except Exception:
+                pass
+            self.driver = None
+
+class LeasedDriver:
+    """
+    A pooled browser lent to scraper code.
+
+    Behaves like the WebDriver it wraps, counts page loads, and hands the
+    browser back to the pool on quit() instead of closing it.
+    """
+
+    def __init__(self, pool: "BrowserPool", browser: WarmBrowser):
+        self._pool = pool
+        self._browser = browser
+
+    def get(self, url: str):
+        self._browser.pages += 1
+        return self._browser.driver.get(url)
+
+    def quit(self):
+        if self._browser is not None:
+            self._pool.release(self._browser)
+            self._browser = None
+
+    def __getattr__(self, name):
+        return getattr(self._browser.driver, name)
+
+class LazyLease:
+    """
+    A driver that borrows a pooled browser on first use.
+
+    Category jobs with a saved listing endpoint and static article pages
+    never touch the browser, so they also run on a worker without one.
+    """
+
+    def __init__(self, pool: "BrowserPool"):
+        self._pool = pool
+        self._leased = None
+
+    def quit(self):
+        if self._leased is not None:
+            self._leased.quit()
+            self._leased = None
+
+    def __getattr__(self, name):
+        if self._leased is None:
+            self._leased = self._pool.lease()
+        return getattr(self._leased, name)
+
+class BrowserPool:
+    """
+    Fixed set of warm browsers, leased to one job thread at a time
+    """
+
+    def __init__(self, size: int, recycle_pages: int = None):
+        self.size = size
+        self.browsers = [WarmBrowser(recycle_pages or config.WORKER_RECYCLE_PAGES) for _ in range(size)]
+        self.idle = queue.Queue()
+        for browser in self.browsers:
+            self.idle.put(browser)
+
+    def warm(self):
+        """Start every browser now rather than on first use"""
+        for browser in self.browsers:
+            browser.ensure_ready()
+
+    def lease(self, timeout: float = None) -> LeasedDriver:
+        """
+        Borrow a ready browser; call quit() on the result to give it back
+
+        Raises:
+            RuntimeError if the pool is empty or no browser frees up in time
+        """
+        if not self.size:
+            raise RuntimeError("The worker was started without browsers")
+        try:
+            browser = self.idle.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError("No browser available")
+
+        try:
+            browser.ensure_ready()
+        except Exception:
+            self.idle.put(browser)
+            raise
+        return LeasedDriver(self, browser)
+
+    def release(self, browser: WarmBrowser):
+        self.idle.put(browser)
+
+    def stats(self) -> list:
+        return [
+            {"running": browser.driver is not None, "pages": browser.pages, "recycles": browser.recycles}
+            for browser in self.browsers
+        ]
+
+    def close(self):
+        for browser in self.browsers:
+            browser.quit()
+
+def load_authkey() -> bytes:
+    """
+    Shared secret from $WORKER_AUTHKEY, or from config.WORKER_KEY_PATH (created on first use)
+    """
+    key = os.getenv("WORKER_AUTHKEY")
+    if key:
+        return key.encode()
+
+    if not os.path.exists(config.WORKER_KEY_PATH):
+        os.makedirs(os.path.dirname(config.WORKER_KEY_PATH) or '.', exist_ok=True)
+        descriptor = os.open(config.WORKER_KEY_PATH, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(descriptor, "w") as f:
+            f.write(secrets.token_hex(32))
+    with open(config.WORKER_KEY_PATH, encoding="utf-8") as f:
+        return f.read().strip().encode()
+
+class WorkerDaemon:
+    """
+    Serves jobs on a local socket with warm browsers and a warm model client
+    """
+
+    def __init__(self, address: tuple = None, browsers: int = None, model=None, load_model: bool = True):
+        """
+        Args:
+            address: (host, port) to listen on (defaults to config.WORKER_HOST/WORKER_PORT)
+            browsers: Warm browser sessions; 0 serves HTTP-only and analysis jobs
+                (defaults to config.WORKER_BROWSERS)
+            model: Optional model client for the analyzer, e.g. a FakeGenerativeModel
+            load_model: Create the analyzer (and its Vertex AI client) at startup
+        """
+        self.address = address or (config.WORKER_HOST, config.WORKER_PORT)
+        self.pool = BrowserPool(config.WORKER_BROWSERS if browsers is None else browsers)
+        self.model = model
+        self.load_model = load_model
+        self.analyzer = None
+        self.cache = None
+        self.session = None
+        self.listener = None
+
+        self.started_at = time.time()
+        self.jobs_completed = 0
+        self.jobs_failed = 0
+        # One scrape or analysis job at a time; health checks never wait
+        self.job_lock = threading.Lock()
+        self.stopping = threading.Event()
+
+    def start(self):
+        """Warm every client; slow, but only once per daemon"""
+        from scrapper import setup_http_session
+
+        self.session = setup_http_session(max(1, self.pool.size))
+        self.pool.warm()
+        if self.load_model:
+            self._ensure_analyzer()
+
+    def _ensure_analyzer(self):
+        if self.analyzer is None:
+            from analysis import ArticleAnalyzer
+            from analysis_cache import AnalysisCache
+
+            with metrics.span("worker_model_start"):
+                self.cache = AnalysisCache(config.ANALYSIS_CACHE_PATH)
+                self.analyzer = ArticleAnalyzer(model=self.model, cache=self.cache)
+        return self.analyzer
+
+    def serve(self):
+        """
+        Accept connections until a shutdown job arrives; each connection gets its own thread
+        """
+        self.start()
+        self.listener = Listener(self.address, authkey=load_authkey())
+        print(f"Worker listening on {self.address[0]}:{self.address[1]} "
+              f"({self.pool.size} browsers, model {'ready' if self.analyzer else 'not loaded'})")
+
+        try:
+            while True:
+                try:
+                    conn = self.listener.accept()
+                except Exception as e:
+                    if self.stopping.is_set():
+                        break
+                    # e.g. a client with the wrong key
+                    print(f"Rejected connection: {e}")
+                    continue
+                if self.stopping.is_set():
+                    conn.close()
+                    break
+                threading.Thread(target=self._handle, args=(conn,), daemon=True).start()
+        finally:
+            self.listener.close()
+            self.close()
+
+    def _handle(self, conn):
+        with conn:
+            while True:
+                try:
+                    job = conn.recv()
+                except (EOFError, OSError):
+                    return
+                conn.send(self.run_job(job))
+                if job.get("type") == "shutdown":
+                    # accept() is not interrupted by closing the listener, so wake it up
+                    socket.create_connection(self.address).close()
+                    return
+
+    def run_job(self, job: dict) -> dict:
+        """
+        Run one job
+
+        Returns:
+            {"ok": True, "result": ...} or {"ok": False, "error": message}
+        """
+        job_type = job.get("type")
+        handlers = {
+            "category": self._job_category,
+            "urls": self._job_urls,
+            "analyze": self._job_analyze,
+        }
+
+        if job_type == "health":
+            return {"ok": True, "result": self.health()}
+        if job_type == "shutdown":
+            self.stopping.set()
+            return {"ok": True, "result": "stopping"}
+        if job_type not in handlers:
+            return {"ok": False, "error": f"Unknown job type: {job_type!r}"}
+
+        with self.job_lock:
+            try:
+                with metrics.span("worker_job", type=job_type):
+                    result = handlers[job_type](job)
+                self.jobs_completed += 1
+                return {"ok": True, "result": result}
+            except Exception as e:
+                self.jobs_failed += 1
+                print(f"Job {job_type} failed: {e}")
+                return {"ok": False, "error": f"{type(e).__name__}: {e}"}
+            finally:
+                metrics.REGISTRY.export("worker")
+
+    def health(self) -> dict:
+        return {
+            "uptime_seconds": round(time.time() - self.started_at, 1),
+            "busy": self.job_lock.locked(),
+            "jobs_completed": self.jobs_completed,
+            "jobs_failed": self.jobs_failed,
+            "browsers": self.pool.stats(),
+            "model": getattr(self.analyzer, "model_name", None),
+        }
+
+    def _job_category(self, job: dict) -> list:
+        from scrapper import progress_journal, save_scraped_articles, scrape_category_with_selenium
+
+        # Leased only if the listing or an article page needs a browser
+        driver = LazyLease(self.pool)
+        try:
+            articles = scrape_category_with_selenium(
+                driver, job["category"], pool_size=max(1, self.pool.size), session=self.session,
+                base_url=job.get("base_url"),
+                # Pool workers borrow the other warm browsers instead of starting new ones
+                driver_factory=self.pool.lease
+            )
+        finally:
+            driver.quit()
+
+        if job.get("output") and articles:
+            save_scraped_articles(articles, job["output"])
+        # The job completed, so the next one for this category fetches fresh bodies
+        progress_journal(job["category"]).clear()
+        return articles
+
+    def _job_urls(self, job: dict) -> list:
+        from scrapper import _fetch_article_body
+
+        def fetch(url):
+            leased = []
+
+            def get_driver():
+                # Only pages without usable static HTML need a browser
+                if not leased:
+                    leased.append(self.pool.lease())
+                return leased[0]
+
+            try:
+                return {"URL": url, "FullArticleText": _fetch_article_body(url, get_driver, self.session)}
+            except Exception as e:
+                return {"URL": url, "FullArticleText": "", "Error": str(e)}
+            finally:
+                if leased:
+                    leased[0].quit()
+
+        with ThreadPoolExecutor(max_workers=max(1, self.pool.size)) as executor:
+            return list(executor.map(fetch, job["urls"]))
+
+    def _job_analyze(self, job: dict):
+        analyzer = self._ensure_analyzer()
+
+        if "texts" in job:
+            return [analyzer.analyze_article(text) for text in job["texts"]]
+
+        options = {
+            key: job[key] for key in ("concurrency", "incremental", "batch_token_budget", "dedup")
+            if key in job
+        }
+        analyzer.process_csv(job["input"], job.get("output"), **options)
+        return {"input": job["input"], "output": job.get("output")}
+
+    def close(self):
+        self.pool.close()
+        if self.session is not None:
+            self.session.close()
+        if self.cache is not None:
+            self.cache.close()
+
+class WorkerClient:
+    """
+    Connection to a running WorkerDaemon
+    """
+
+    def __init__(self, address: tuple = None):
+        self.conn = Client(address or (config.WORKER_HOST, config.WORKER_PORT), authkey=load_authkey())
+
+    def submit(self, job: dict):
+        """
+        Send a job and wait for its result
+
+        Raises:
+            RuntimeError with the daemon's message if the job failed
+        """
+        self.conn.send(job)
+        reply = self.conn.recv()
+        if not reply["ok"]:
+            raise RuntimeError(reply["error"])
+        return reply["result"]
+
+    def health(self) -> dict:
+        return self.submit({"type": "health"})
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+def main(argv: list = None) -> int:
+    parser = argparse.ArgumentParser(prog="worker.py", description="Warm scrape and analysis worker")
+    parser.add_argument("action", choices=["serve", "health", "stop"])
+    parser.add_argument("--port", type=int, default=config.WORKER_PORT)
+    parser.add_argument("--browsers", type=int, help="Warm browser sessions (0 for HTTP-only scraping)")
+    parser.add_argument("--no-browser", action="store_true", help="Same as --browsers 0")
+    parser.add_argument("--fake-model", action="store_true", help="Analyze with the offline fake model")
+    parser.add_argument("--no-model", action="store_true", help="Create the analyzer on the first analysis job")
+    args = parser.parse_args(argv)
+    address = (config.WORKER_HOST, args.port)
+
+    if args.action == "serve":
+        model = None
+        if args.fake_model:
+            from fake_model import FakeGenerativeModel
+            model = FakeGenerativeModel()
+        WorkerDaemon(
+            address, browsers=0 if args.no_browser else args.browsers, model=model, load_model=not args.no_model
+        ).serve()
+        return 0
+
+    try:
+        with WorkerClient(address) as client:
+            result = client.health() if args.action == "health" else client.submit({"type": "shutdown"})
+    except (ConnectionError, OSError) as e:
+        print(f"Worker not reachable on {address[0]}:{address[1]}: {e}")
+        return 1
+    print(json.dumps(result, indent=2))
+    return 0
+
+if __name__ == "__main__":
+    raise SystemExit(main())